@@ -0,0 +1,168 @@
+"""
+Rubik's Cube Turn Animation - queued, interpolated face turns
+
+The controller no longer turns the model on keypress. Turns go into a
+TurnAnimator, which plays them one at a time as an angle the renderer
+applies to the turning layer, and hands each turn back for the model to
+commit only once its animation has finished. The model therefore only ever
+sees whole quarter turns.
+
+To keep frames cheap when input outruns the animation (fast typing, long
+replays), consecutive turns of the same face are merged (R R -> R2,
+R R' -> nothing), animations speed up with the backlog, and beyond a
+backlog limit the oldest turns are committed without animating at all.
+No GUI dependencies.
+"""
+
+from collections import deque
+from typing import Deque, List, Optional, Tuple
+
+from cube_model import FACE_NAMES
+
+
+def _normalize(quarters: int) -> int:
+    """Reduce a quarter-turn count to -1, 0, 1 or 2"""
+    return (quarters + 1) % 4 - 1
+
+
+def _ease(t: float) -> float:
+    """Smoothstep: gentle start and stop"""
+    return t * t * (3.0 - 2.0 * t)
+
+
+class TurnAnimator:
+    """
+    Move queue that interpolates one face turn at a time
+
+    Quarter counts are clockwise (as rotate_face turns): 1 = X, -1 = X',
+    2 = X2. Committed turns are returned as (face, n) with n in 1..3 so the
+    caller can apply them as n calls to rotate_face.
+    """
+
+    def __init__(self, turn_duration: float = 0.18, min_duration: float = 0.03,
+                 max_backlog: int = 8, max_instant_per_frame: int = 32):
+        """
+        Args:
+            turn_duration: Seconds for a quarter turn when nothing is queued
+            min_duration: Floor for the sped-up duration under load
+            max_backlog: Queued turns allowed before the oldest are skipped
+            max_instant_per_frame: Skipped turns committed per update at most
+        """
+        self.turn_duration = turn_duration
+        self.min_duration = min_duration
+        self.max_backlog = max_backlog
+        self.max_instant_per_frame = max_instant_per_frame
+
+        self._queue: Deque[List] = deque()  # [face, quarters]
+        self._active_face: Optional[str] = None
+        self._start_angle = 0.0
+        self._target_angle = 0.0
+        self._progress = 0.0
+        self._duration = turn_duration
+
+    @property
+    def busy(self) -> bool:
+        """True while a turn is animating or waiting"""
+        return self._active_face is not None or bool(self._queue)
+
+    @property
+    def backlog(self) -> int:
+        """Turns waiting behind the active one"""
+        return len(self._queue)
+
+    def enqueue(self, face: str, quarters: int = 1):
+        """Queue a turn, merging it with an immediately preceding same-face turn"""
+        if face not in FACE_NAMES:
+            raise ValueError(f"Invalid face name: {face}")
+        quarters = _normalize(quarters)
+        if quarters == 0:
+            return
+
+        if self._queue and self._queue[-1][0] == face:
+            merged = _normalize(self._queue[-1][1] + quarters)
+            if merged:
+                self._queue[-1][1] = merged
+            else:
+                self._queue.pop()
+        elif not self._queue and self._active_face == face:
+            # Extend the turn in flight, continuing from its current angle
+            self._start_angle = self.current_angle()
+            self._target_angle += 90.0 * quarters
+            self._progress = 0.0
+        else:
+            self._queue.append([face, quarters])
+
+    def current_angle(self) -> float:
+        """Clockwise angle of the active layer in degrees"""
+        if self._active_face is None:
+            return 0.0
+        span = self._target_angle - self._start_angle
+        return self._start_angle + span * _ease(self._progress)
+
+    def current_turn(self) -> Optional[Tuple[str, float]]:
+        """(face, clockwise degrees) for the renderer, or None when idle"""
+        if self._active_face is None:
+            return None
+        return self._active_face, self.current_angle()
+
+    def update(self, dt: float) -> List[Tuple[str, int]]:
+        """Advance the animation by ``dt`` seconds.
+
+        Returns the turns that finished (or were skipped) during this step,
+        in order, for the caller to commit to the model.
+        """
+        committed: List[Tuple[str, int]] = []
+
+        # Under heavy backlog, commit the oldest queued turns outright
+        instant = 0
+        while len(self._queue) > self.max_backlog and instant < self.max_instant_per_frame:
+            if self._active_face is not None:
+                committed.extend(self._finish_active())
+            else:
+                face, quarters = self._queue.popleft()
+                committed.append((face, quarters % 4))
+            instant += 1
+
+        remaining = dt
+        while remaining > 0 or (self._active_face is None and self._queue):
+            if self._active_face is None:
+                if not self._queue:
+                    break
+                self._start_next()
+            step = remaining / self._duration
+            if self._progress + step < 1.0:
+                self._progress += step
+                break
+            remaining -= (1.0 - self._progress) * self._duration
+            committed.extend(self._finish_active())
+        return committed
+
+    def flush(self) -> List[Tuple[str, int]]:
+        """Finish everything immediately and return all turns to commit"""
+        committed = self._finish_active() if self._active_face is not None else []
+        while self._queue:
+            face, quarters = self._queue.popleft()
+            committed.append((face, quarters % 4))
+        return committed
+
+    def clear(self):
+        """Drop the active and queued turns without committing them"""
+        self._queue.clear()
+        self._active_face = None
+
+    def _start_next(self):
+        face, quarters = self._queue.popleft()
+        self._active_face = face
+        self._start_angle = 0.0
+        self._target_angle = 90.0 * quarters
+        self._progress = 0.0
+        # Speed up as the queue grows so the backlog drains quickly
+        self._duration = max(self.min_duration,
+                             self.turn_duration * max(1, abs(quarters)) / (1 + len(self._queue)))
+
+    def _finish_active(self) -> List[Tuple[str, int]]:
+        face = self._active_face
+        quarters = int(round(self._target_angle / 90.0)) % 4
+        self._active_face = None
+        self._progress = 0.0
+        return [(face, quarters)] if quarters else []
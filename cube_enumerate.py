@@ -0,0 +1,321 @@
+#!/usr/bin/env python3
+"""
+Rubik's Cube Enumeration - move-distance distributions by breadth-first search
+
+Counts how many states lie at each distance from solved, either in the full
+cube group or in a subgroup such as <R,U> or <U,D,F2,B2,R2,L2>. Frontiers
+are kept as sorted arrays of packed 24-byte states (cube_state.pack_states)
+rather than Python sets, so a state costs 24 bytes instead of several
+hundred. When a level outgrows the memory budget, sorted runs are written
+to disk and merged back with a streaming k-way merge that also removes the
+states already seen at the two previous depths.
+
+The optional distance table keeps every level on disk (or in memory when
+small) and answers exact distance lookups by binary search.
+
+Usage:
+    python cube_enumerate.py --depth 6
+    python cube_enumerate.py --depth 12 --generators "R,U"
+    python cube_enumerate.py --depth 10 --generators "U,D,F2,B2,R2,L2"
+"""
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from typing import Callable, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from cube_model import FACE_NAMES
+from cube_state import (
+    MOVE_INDEX,
+    MOVE_PERMUTATIONS,
+    PACKED_DTYPE,
+    SOLVED_STATE,
+    invert_moves,
+    pack_states,
+    unpack_states,
+)
+
+DEFAULT_MEMORY_STATES = 20_000_000  # ~480 MB of packed states
+_MERGE_BLOCK = 1 << 18
+
+
+def parse_generators(text: Optional[str] = None, metric: str = 'htm') -> List[str]:
+    """Turn a generator list such as "<R,U>" or "U,D,F2" into BFS moves.
+
+    A bare face letter contributes all of its turns (quarter turns only in
+    the 'qtm' metric); an explicit move such as "F2" or "R'" contributes
+    itself and its inverse. None means every face.
+    """
+    if metric not in ('htm', 'qtm'):
+        raise ValueError(f"Invalid metric: {metric}")
+    suffixes = ('', "'", '2') if metric == 'htm' else ('', "'")
+    tokens = (text or ','.join(FACE_NAMES)).strip().strip('<>').replace(' ', '').split(',')
+
+    moves: List[str] = []
+    for token in filter(None, tokens):
+        if token in FACE_NAMES:
+            candidates = [token + suffix for suffix in suffixes]
+        elif token in MOVE_INDEX:
+            candidates = [token] + invert_moves([token])
+        else:
+            raise ValueError(f"Invalid generator: {token}")
+        moves.extend(move for move in candidates if move not in moves)
+    return moves
+
+
+def _load(path: str) -> np.ndarray:
+    """Memory-map a file of packed states (an empty file maps to an empty array)"""
+    if os.path.getsize(path) == 0:
+        return np.empty(0, dtype=PACKED_DTYPE)
+    return np.memmap(path, dtype=PACKED_DTYPE, mode='r')
+
+
+def contains(sorted_states: np.ndarray, queries: np.ndarray) -> np.ndarray:
+    """Boolean mask of which queries occur in a sorted packed array"""
+    if len(sorted_states) == 0:
+        return np.zeros(len(queries), dtype=bool)
+    index = np.searchsorted(sorted_states, queries)
+    found = np.minimum(index, len(sorted_states) - 1)
+    return (index < len(sorted_states)) & (sorted_states[found] == queries)
+
+
+def _merge_unique(runs: Sequence[np.ndarray], block: int = _MERGE_BLOCK) -> Iterator[np.ndarray]:
+    """Stream the sorted union of sorted runs, one deduplicated block at a time.
+
+    Each round reads up to ``block`` records from every run and emits all
+    records up to the smallest of the block tails, so every value is
+    complete (no duplicate can appear in a later block) when it is emitted.
+    """
+    positions = [0] * len(runs)
+    while True:
+        heads = [(i, run[positions[i]:positions[i] + block])
+                 for i, run in enumerate(runs) if positions[i] < len(run)]
+        if not heads:
+            return
+        tails = np.array([head[-1] for _, head in heads], dtype=PACKED_DTYPE)
+        bound = np.sort(tails)[:1]
+
+        parts = []
+        for i, head in heads:
+            taken = int(np.searchsorted(head, bound, side='right')[0])
+            parts.append(np.asarray(head[:taken]))
+            positions[i] += taken
+        yield np.unique(np.concatenate(parts))
+
+
+class _LevelWriter:
+    """Collects sorted blocks of one level, spilling to a file past the budget"""
+
+    def __init__(self, path: str, limit: int):
+        self.path = path
+        self.limit = limit
+        self.count = 0
+        self._blocks: List[np.ndarray] = []
+        self._file = None
+
+    def write(self, block: np.ndarray):
+        self.count += len(block)
+        if self._file is None and self.count <= self.limit:
+            self._blocks.append(block)
+            return
+        if self._file is None:
+            self._file = open(self.path, 'wb')
+            for pending in self._blocks:
+                pending.tofile(self._file)
+            self._blocks = []
+        block.tofile(self._file)
+
+    def finish(self) -> np.ndarray:
+        """The whole level as one sorted array (in memory or memory-mapped)"""
+        if self._file is None:
+            if not self._blocks:
+                return np.empty(0, dtype=PACKED_DTYPE)
+            return np.concatenate(self._blocks)
+        self._file.close()
+        return _load(self.path)
+
+
+class DistanceTable:
+    """Exact distance from solved for every enumerated state"""
+
+    def __init__(self, levels: List[np.ndarray], generators: List[str],
+                 directory: Optional[str] = None):
+        self.levels = levels
+        self.generators = generators
+        self.directory = directory
+
+    def __len__(self) -> int:
+        return sum(len(level) for level in self.levels)
+
+    def lookup(self, states: np.ndarray) -> np.ndarray:
+        """Distance of each state (54,) or (N, 54), or -1 beyond the table"""
+        packed = pack_states(states)
+        distances = np.full(len(packed), -1, dtype=np.int16)
+        for depth, level in enumerate(self.levels):
+            unknown = distances < 0
+            hit = contains(level, packed[unknown])
+            distances[np.nonzero(unknown)[0][hit]] = depth
+        return distances
+
+    def close(self):
+        """Delete the on-disk levels"""
+        self.levels = []
+        if self.directory:
+            shutil.rmtree(self.directory, ignore_errors=True)
+            self.directory = None
+
+
+class EnumerationResult:
+    """Per-depth state counts plus the optional distance table"""
+
+    def __init__(self, counts: List[int], generators: List[str],
+                 table: Optional[DistanceTable] = None, complete: bool = False):
+        self.counts = counts
+        self.generators = generators
+        self.table = table
+        self.complete = complete  # True if the whole group was exhausted
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts)
+
+
+def enumerate_distances(max_depth: int, generators: Optional[Sequence[str]] = None,
+                        max_states_in_memory: int = DEFAULT_MEMORY_STATES,
+                        work_dir: Optional[str] = None, keep_table: bool = False,
+                        progress: Optional[Callable[[int, int], None]] = None
+                        ) -> EnumerationResult:
+    """
+    Breadth-first search from solved, counting new states at each depth
+
+    Args:
+        max_depth: Deepest level to enumerate
+        generators: Moves to search with (see parse_generators); all 18 by default
+        max_states_in_memory: Packed states held in RAM before spilling to disk
+        work_dir: Directory for spill files (a temporary directory by default)
+        keep_table: Keep every level and return a DistanceTable
+        progress: Called as progress(depth, count) after each level
+
+    Returns:
+        EnumerationResult with counts[d] = number of states at distance d
+    """
+    generators = list(generators) if generators else parse_generators()
+    perms = [MOVE_PERMUTATIONS[MOVE_INDEX[move]] for move in generators]
+    directory = tempfile.mkdtemp(prefix='cube_bfs_', dir=work_dir)
+    chunk = max(1, max_states_in_memory // (2 * len(perms)))
+
+    previous = np.empty(0, dtype=PACKED_DTYPE)
+    current = pack_states(SOLVED_STATE)
+    levels = [current]
+    counts = [1]
+    complete = False
+
+    try:
+        for depth in range(1, max_depth + 1):
+            runs = _expand(current, perms, chunk, max_states_in_memory,
+                           os.path.join(directory, f'runs_{depth}'))
+            writer = _LevelWriter(os.path.join(directory, f'level_{depth}.bin'),
+                                  max_states_in_memory)
+            for block in _merge_unique(runs):
+                block = block[~contains(current, block) & ~contains(previous, block)]
+                if len(block):
+                    writer.write(block)
+            shutil.rmtree(os.path.join(directory, f'runs_{depth}'), ignore_errors=True)
+
+            previous, current = current, writer.finish()
+            if len(current) == 0:
+                complete = True
+                break
+            counts.append(len(current))
+            if keep_table:
+                levels.append(current)
+            elif depth >= 3:
+                _remove(os.path.join(directory, f'level_{depth - 2}.bin'))
+            if progress:
+                progress(depth, len(current))
+    except BaseException:
+        shutil.rmtree(directory, ignore_errors=True)
+        raise
+
+    if keep_table:
+        table = DistanceTable(levels, generators, directory)
+        return EnumerationResult(counts, generators, table, complete)
+    del previous, current
+    shutil.rmtree(directory, ignore_errors=True)
+    return EnumerationResult(counts, generators, None, complete)
+
+
+def _expand(frontier: np.ndarray, perms: List[np.ndarray], chunk: int,
+            limit: int, run_dir: str) -> List[np.ndarray]:
+    """All neighbors of a frontier as sorted, deduplicated runs.
+
+    Runs stay in memory while their total fits the budget; after that each
+    run is written to ``run_dir`` and memory-mapped back for the merge.
+    """
+    runs: List[np.ndarray] = []
+    buffered: List[np.ndarray] = []
+    buffered_count = 0
+    in_memory = 0
+
+    def flush():
+        nonlocal buffered, buffered_count, in_memory
+        if not buffered:
+            return
+        run = np.unique(np.concatenate(buffered))
+        buffered, buffered_count = [], 0
+        if in_memory + len(run) <= limit:
+            runs.append(run)
+            in_memory += len(run)
+        else:
+            os.makedirs(run_dir, exist_ok=True)
+            path = os.path.join(run_dir, f'run_{len(runs)}.bin')
+            run.tofile(path)
+            runs.append(_load(path))
+
+    for start in range(0, len(frontier), chunk):
+        states = unpack_states(frontier[start:start + chunk])
+        for perm in perms:
+            buffered.append(pack_states(states[:, perm]))
+            buffered_count += len(states)
+        if buffered_count >= limit:
+            flush()
+    flush()
+    return runs
+
+
+def _remove(path: str):
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def main():
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Count cube states by distance from solved")
+    parser.add_argument('--depth', type=int, required=True, help="deepest level to enumerate")
+    parser.add_argument('--generators', help='e.g. "R,U" or "U,D,F2,B2,R2,L2" (default: all faces)')
+    parser.add_argument('--metric', choices=('htm', 'qtm'), default='htm')
+    parser.add_argument('--memory', type=int, default=DEFAULT_MEMORY_STATES,
+                        help="packed states kept in RAM before spilling to disk")
+    parser.add_argument('--work-dir', help="directory for spill files")
+    args = parser.parse_args()
+
+    generators = parse_generators(args.generators, args.metric)
+    print(f"Generators: {' '.join(generators)}")
+    started = time.perf_counter()
+
+    def report(depth: int, count: int):
+        print(f"  depth {depth:2d}: {count:>14,d}   ({time.perf_counter() - started:.1f}s)")
+
+    print(f"  depth  0: {1:>14,d}")
+    result = enumerate_distances(args.depth, generators, args.memory, args.work_dir,
+                                 progress=report)
+    print(f"Total: {result.total:,d} states"
+          + (" (entire group)" if result.complete else ""))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,283 @@
+#!/usr/bin/env python3
+"""
+Rubik's Cube Differential Fuzzing - the compact engine against the 3D model
+
+RubiksCubeModel turns piece arrays with orientation indices and is the
+reference; cube_state turns flat facelet arrays with index permutations and
+is what the search, the solver service and the wall use. This harness plays
+the same seeded random move sequences on both and compares the facelets
+(get_facelets() against facelets_from_state()) and the solved flag at
+regular checkpoints.
+
+The compact tables are derived from the model, so a bug in
+RubiksCubeModel.rotate_face would show up in both engines alike and the
+comparison would still pass. REFERENCE_CYCLES therefore writes the U and R
+quarter turns out by hand, as sticker cycles in the facelet layout of
+cube_state, and every run first checks both engines against them.
+
+The compact engine plays a whole batch of sequences at once as an (N, 54)
+array, the way it is used; the model plays them one by one. A mismatch is
+reduced to a short failing sequence: first the shortest failing prefix,
+then single moves are dropped while the mismatch persists. The report also
+gives the turn throughput of both engines and their ratio.
+
+Usage:
+    python cube_fuzz.py --seconds 60
+    python cube_fuzz.py --sequences 1000000 --length 30 --seed 7
+"""
+
+import argparse
+import time
+from typing import Callable, List, Optional, Sequence
+
+import numpy as np
+
+from cube_model import RubiksCubeModel
+from cube_state import (
+    MOVE_INDEX,
+    MOVE_NAMES,
+    MOVE_PERMUTATIONS,
+    SOLVED_STATE,
+    facelets_from_state,
+    state_from_model,
+)
+
+DEFAULT_LENGTH = 25
+DEFAULT_CHECKPOINT = 5   # moves between comparisons
+_BATCH = 256             # sequences played per round
+
+# Clockwise quarter turns of a move suffix (R, R2, R')
+_QUARTERS = {'': 1, '2': 2, "'": 3}
+
+# Clockwise quarter turns written out by hand, independent of both engines.
+# Facelet face * 9 + row * 3 + col with faces F=0, B=9, R=18, L=27, U=36,
+# D=45; a cycle (a, b, c, d) moves the sticker on a to b, b to c, and so on.
+REFERENCE_CYCLES = {
+    'U': [(36, 38, 44, 42), (37, 41, 43, 39),       # U face
+          (0, 27, 9, 18), (1, 28, 10, 19), (2, 29, 11, 20)],  # F -> L -> B -> R
+    'R': [(18, 20, 26, 24), (19, 23, 25, 21),       # R face
+          (2, 38, 15, 47), (5, 41, 12, 50), (8, 44, 9, 53)],  # F -> U -> B -> D
+}
+
+
+def turn_states(states: np.ndarray, moves: np.ndarray) -> np.ndarray:
+    """Turn each state of a batch (N, 54) by its own move (N,) of MOVE_NAMES"""
+    return np.take_along_axis(states, MOVE_PERMUTATIONS[moves], axis=1)
+
+
+def states_solved(states: np.ndarray) -> np.ndarray:
+    """Solved flag per state of a batch (N, 54): every face one color"""
+    faces = np.asarray(states).reshape(len(states), -1, 9)
+    return (faces == faces[:, :, 4:5]).all(axis=(1, 2))
+
+
+def reference_permutation(move: str) -> np.ndarray:
+    """Index permutation (54,) of a REFERENCE_CYCLES move, like MOVE_PERMUTATIONS"""
+    permutation = np.arange(len(SOLVED_STATE))
+    for cycle in REFERENCE_CYCLES[move]:
+        for source, target in zip(cycle, cycle[1:] + cycle[:1]):
+            permutation[target] = source
+    return permutation
+
+
+def reference_mismatches(samples: int = 16, seed: int = 0,
+                         fast_turn: Callable = turn_states) -> List[str]:
+    """
+    Check both engines against the hand-written REFERENCE_CYCLES
+
+    Each reference move is played on random scrambles, so that stickers of
+    the same color rarely hide a wrong cycle.
+
+    Returns:
+        'engine move' for each disagreement ('model U', 'compact R'), or []
+    """
+    rng = np.random.default_rng(seed)
+    models = []
+    for scramble in rng.integers(len(MOVE_NAMES), size=(samples, 20)):
+        model = RubiksCubeModel()
+        for index in scramble:
+            move = MOVE_NAMES[index]
+            for _ in range(_QUARTERS[move[1:]]):
+                model.rotate_face(move[0])
+        models.append(model)
+    states = np.stack([state_from_model(model) for model in models])
+
+    mismatches = []
+    for move in REFERENCE_CYCLES:
+        expected = states[:, reference_permutation(move)]
+        for model in models:
+            model.rotate_face(move)
+        if not np.array_equal(np.stack([state_from_model(model) for model in models]), expected):
+            mismatches.append(f"model {move}")
+        if not np.array_equal(fast_turn(states, np.full(samples, MOVE_INDEX[move])), expected):
+            mismatches.append(f"compact {move}")
+        states = expected
+    return mismatches
+
+
+class FuzzReport:
+    """Outcome of a fuzzing run"""
+
+    def __init__(self, sequences: int, turns: int, failure: Optional[List[str]],
+                 reference_seconds: float, fast_seconds: float,
+                 reference_failures: Sequence[str] = ()):
+        self.sequences = sequences
+        self.turns = turns  # played on each engine
+        self.failure = failure  # reduced failing sequence, or None
+        self.reference_seconds = reference_seconds
+        self.fast_seconds = fast_seconds
+        self.reference_failures = list(reference_failures)  # see reference_mismatches
+
+    @property
+    def passed(self) -> bool:
+        return self.failure is None and not self.reference_failures
+
+    @property
+    def reference_rate(self) -> float:
+        """Model turns per second"""
+        return self.turns / self.reference_seconds if self.reference_seconds else 0.0
+
+    @property
+    def fast_rate(self) -> float:
+        """Compact-engine turns per second"""
+        return self.turns / self.fast_seconds if self.fast_seconds else 0.0
+
+    @property
+    def speedup(self) -> float:
+        """How many times faster the compact engine turned"""
+        return self.fast_rate / self.reference_rate if self.reference_rate else 0.0
+
+
+def _matches(model: RubiksCubeModel, state: np.ndarray, solved: bool) -> bool:
+    return model.get_facelets() == facelets_from_state(state) and model.is_solved() == solved
+
+
+def first_mismatch(moves: Sequence[str], fast_turn: Callable = turn_states,
+                   fast_solved: Callable = states_solved) -> Optional[int]:
+    """Number of moves after which the engines first disagree, or None
+
+    Compares after every move (and before the first).
+    """
+    model, states = RubiksCubeModel(), SOLVED_STATE[None].copy()
+    for played in range(len(moves) + 1):
+        if played:
+            move = moves[played - 1]
+            for _ in range(_QUARTERS[move[1:]]):
+                model.rotate_face(move[0])
+            states = fast_turn(states, np.array([MOVE_INDEX[move]]))
+        if not _matches(model, states[0], bool(fast_solved(states)[0])):
+            return played
+    return None
+
+
+def reduce_failure(moves: Sequence[str], fast_turn: Callable = turn_states,
+                   fast_solved: Callable = states_solved) -> List[str]:
+    """Shorten a failing sequence while it still fails"""
+    failing = first_mismatch(moves, fast_turn, fast_solved)
+    if failing is None:
+        raise ValueError("Invalid failure: the engines agree on this sequence")
+    moves = list(moves[:failing])
+    index = 0
+    while index < len(moves):
+        candidate = moves[:index] + moves[index + 1:]
+        shortest = first_mismatch(candidate, fast_turn, fast_solved)
+        if shortest is not None:
+            moves = candidate[:shortest]
+        else:
+            index += 1
+    return moves
+
+
+def fuzz(sequences: int = 1000, length: int = DEFAULT_LENGTH, seed: int = 0,
+         checkpoint: int = DEFAULT_CHECKPOINT, seconds: Optional[float] = None,
+         fast_turn: Callable = turn_states, fast_solved: Callable = states_solved
+         ) -> FuzzReport:
+    """
+    Play random sequences on both engines and compare them at checkpoints
+
+    Args:
+        sequences: Most sequences to play
+        length: Moves per sequence
+        seed: Seed of the move generator; the same seed plays the same moves
+        checkpoint: Moves between comparisons (the end is always compared)
+        seconds: Time budget; stops after the batch that exceeds it
+        fast_turn, fast_solved: Engine under test, with the batch
+            interface of turn_states and states_solved
+
+    Returns:
+        FuzzReport; stops at the first mismatch, reduced, and plays nothing
+        when an engine disagrees with REFERENCE_CYCLES
+    """
+    reference_failures = reference_mismatches(seed=seed, fast_turn=fast_turn)
+    if reference_failures:
+        return FuzzReport(0, 0, None, 0.0, 0.0, reference_failures)
+
+    rng = np.random.default_rng(seed)
+    checks = sorted(set(range(checkpoint, length, checkpoint)) | {length})
+    started = time.perf_counter()
+    played = turns = 0
+    reference_seconds = fast_seconds = 0.0
+
+    while played < sequences and (seconds is None or time.perf_counter() - started < seconds):
+        count = min(_BATCH, sequences - played)
+        batch = rng.integers(len(MOVE_NAMES), size=(count, length))
+
+        # Compact engine: the whole batch, a move column at a time
+        tick = time.perf_counter()
+        states = np.tile(SOLVED_STATE, (count, 1))
+        snapshots, flags = {}, {}
+        for step in range(1, length + 1):
+            states = fast_turn(states, batch[:, step - 1])
+            if step in checks:
+                snapshots[step], flags[step] = states, fast_solved(states)
+        fast_seconds += time.perf_counter() - tick
+
+        # Reference: one model per sequence
+        for row, indices in enumerate(batch):
+            moves = [MOVE_NAMES[index] for index in indices]
+            model = RubiksCubeModel()
+            for step, move in enumerate(moves, 1):
+                tick = time.perf_counter()
+                for _ in range(_QUARTERS[move[1:]]):
+                    model.rotate_face(move[0])
+                reference_seconds += time.perf_counter() - tick
+                if step in checks and not _matches(model, snapshots[step][row],
+                                                   bool(flags[step][row])):
+                    failure = reduce_failure(moves, fast_turn, fast_solved)
+                    return FuzzReport(played + row + 1, turns + step, failure,
+                                      reference_seconds, fast_seconds)
+            turns += length
+        played += count
+
+    return FuzzReport(played, turns, None, reference_seconds, fast_seconds)
+
+
+def main():
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Compare the compact engine with the 3D model")
+    parser.add_argument('--sequences', type=int, default=1_000_000,
+                        help="most random sequences to play")
+    parser.add_argument('--length', type=int, default=DEFAULT_LENGTH, help="moves per sequence")
+    parser.add_argument('--checkpoint', type=int, default=DEFAULT_CHECKPOINT,
+                        help="moves between comparisons")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--seconds', type=float, default=60.0, help="time budget (0: none)")
+    args = parser.parse_args()
+
+    report = fuzz(args.sequences, args.length, args.seed, args.checkpoint,
+                  args.seconds or None)
+    print(f"{report.sequences:,d} sequences, {report.turns:,d} turns per engine")
+    print(f"Model: {report.reference_rate:,.0f} turns/s, compact: {report.fast_rate:,.0f} "
+          f"turns/s ({report.speedup:.0f}x)")
+    if report.passed:
+        print("Engines agree with each other and with the hand-written turns")
+    elif report.reference_failures:
+        print(f"MISMATCH with the hand-written turns: {', '.join(report.reference_failures)}")
+        raise SystemExit(1)
+    else:
+        print(f"MISMATCH after: {' '.join(report.failure)}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,444 @@
+"""
+Rubik's Cube Geometry - cubie meshes and appearance constants
+
+The look of a piece (black plastic body, raised inset stickers, black
+outlines) is defined here once, as plain numpy arrays in the piece's local
+frame, so every drawing path builds the same cube. No OpenGL or pygame:
+the renderer uploads these arrays, other consumers can rasterize them.
+"""
+
+import numpy as np
+from typing import Dict, List, Tuple
+
+from cube_model import (
+    COLORS, CUBE_GAP, CUBE_SIZE, FACE_COLORS, FACE_NAMES, GRID_SIZE, LOCAL_FACE_NORMALS,
+    NET_FACE_BASIS, CubePiece,
+)
+
+# Sticker appearance
+STICKER_INSET = 0.92    # sticker is 92% of the face, leaving a black border
+STICKER_RAISE = 0.025   # sticker sits this far above the plastic
+
+# Plastic shades (grey levels)
+BASE_SHADE = 0.12          # plastic under a sticker
+PLASTIC_SHADE = 0.15       # bare plastic faces
+PLASTIC_EDGE_SHADE = 0.05  # subtle edges of bare faces
+OUTLINE_SHADE = 0.0        # outline around each sticker
+
+STICKER_LINE_WIDTH = 2.0
+PLASTIC_LINE_WIDTH = 1.0
+
+# Levels of detail, picked from the projected size of one cubie in pixels:
+#   full   raised stickers on a plastic base, outlined
+#   plain  no outlines: below LOD_PLAIN_PX a sticker's border is thinner
+#          than the 2 px outline, which would only thicken it
+#   flat   one flat quad per sticker: below LOD_FLAT_PX the border and
+#          the plastic around a sticker are under a pixel wide
+LOD_TIERS = ('full', 'plain', 'flat')
+LOD_PLAIN_PX = 64.0
+LOD_FLAT_PX = 28.0
+
+# Corners of a piece in its local frame (same order as CubePiece.get_vertices)
+_HALF = CUBE_SIZE / 2
+CUBIE_CORNERS = np.array([
+    [-_HALF, -_HALF, -_HALF],
+    [_HALF, -_HALF, -_HALF],
+    [_HALF, _HALF, -_HALF],
+    [-_HALF, _HALF, -_HALF],
+    [-_HALF, -_HALF, _HALF],
+    [_HALF, -_HALF, _HALF],
+    [_HALF, _HALF, _HALF],
+    [-_HALF, _HALF, _HALF],
+])
+
+# Corner indices of each local face, in CubePiece.colors order. The winding
+# makes the geometric normal point inward, so front faces are GL_CW.
+FACE_VERTEX_INDICES = [
+    [1, 5, 6, 2],  # right (x+)
+    [4, 0, 3, 7],  # left (x-)
+    [3, 2, 6, 7],  # up (y+)
+    [0, 4, 5, 1],  # down (y-)
+    [5, 4, 7, 6],  # front (z+)
+    [0, 1, 2, 3],  # back (z-)
+]
+
+# Mesh layout: per local face, four vertex groups of four corners each
+VERTS_PER_FACE = 16
+_BASE, _STICKER, _OUTLINE, _EDGE = 0, 4, 8, 12
+_LOOP = [0, 1, 1, 2, 2, 3, 3, 0]  # a quad outline as GL_LINES pairs
+_SPLIT = [0, 1, 2, 0, 2, 3]          # a quad as two triangles, same winding
+
+# Sticker palette for shaders: the six face colors, then bare plastic
+PALETTE = FACE_COLORS + [COLORS['BLACK']]
+PLASTIC_INDEX = len(FACE_COLORS)
+HIDDEN_INDEX = len(PALETTE)  # face not drawn at all (occluded)
+_PALETTE_INDEX = {color: index for index, color in enumerate(PALETTE)}
+
+# Local face colors of the core (see core_matrices): bare plastic all round
+CORE_COLORS = [COLORS['BLACK']] * len(LOCAL_FACE_NORMALS)
+
+
+def hex_to_rgb(hex_color: str) -> Tuple[float, float, float]:
+    """Convert hex color to RGB float values (0-1)"""
+    hex_color = hex_color.lstrip('#')
+    r = int(hex_color[0:2], 16) / 255.0
+    g = int(hex_color[2:4], 16) / 255.0
+    b = int(hex_color[4:6], 16) / 255.0
+    return (r, g, b)
+
+
+def is_sticker(color: str) -> bool:
+    """True for colored faces, False for bare black plastic"""
+    return color != COLORS['BLACK']
+
+
+def sticker_vertices(face_vertices: np.ndarray, normal: np.ndarray) -> np.ndarray:
+    """Inset a face toward its center and raise it along the outward normal"""
+    center = np.mean(face_vertices, axis=0)
+    return center + (face_vertices - center) * STICKER_INSET + normal * STICKER_RAISE
+
+
+def piece_matrix(piece: CubePiece) -> np.ndarray:
+    """4x4 local-to-world transform of a piece (row-major, column vectors)"""
+    matrix = np.eye(4)
+    matrix[:3, :3] = piece.rotation_matrix
+    matrix[:3, 3] = piece.position.to_array()
+    return matrix
+
+
+def rotation_matrix(axis, degrees: float) -> np.ndarray:
+    """4x4 rotation about an axis through the origin, as glRotatef builds it"""
+    x, y, z = np.asarray(axis, dtype=float) / np.linalg.norm(axis)
+    c, s = np.cos(np.radians(degrees)), np.sin(np.radians(degrees))
+    matrix = np.eye(4)
+    matrix[:3, :3] = [
+        [x * x * (1 - c) + c, x * y * (1 - c) - z * s, x * z * (1 - c) + y * s],
+        [y * x * (1 - c) + z * s, y * y * (1 - c) + c, y * z * (1 - c) - x * s],
+        [z * x * (1 - c) - y * s, z * y * (1 - c) + x * s, z * z * (1 - c) + c],
+    ]
+    return matrix
+
+
+def palette_indices(colors: List[str], faces=None) -> List[int]:
+    """PALETTE index of each local face color (unknown colors read as plastic).
+
+    Faces left out of ``faces`` (all included by default) get HIDDEN_INDEX.
+    """
+    return [_PALETTE_INDEX.get(color, PLASTIC_INDEX) if faces is None or faces[face]
+            else HIDDEN_INDEX for face, color in enumerate(colors)]
+
+
+def visible_faces(pieces: List[CubePiece], turn_axis=None) -> np.ndarray:
+    """Which local faces of each piece can be seen from outside, (N, 6) bool.
+
+    A face is hidden when the grid cell it points at holds another piece,
+    which is the case for two thirds of all faces. While a layer turns
+    (``turn_axis`` is the turning face's normal) the faces on both sides of
+    the cut become exposed as well.
+    """
+    grid = np.array([[p.grid_position.x, p.grid_position.y, p.grid_position.z]
+                     for p in pieces])
+    rotations = np.array([p.rotation_matrix for p in pieces])
+    # World normal of every local face, (N, 6, 3); exact, rotations are integer
+    normals = np.einsum('nij,fj->nfi', rotations, LOCAL_FACE_NORMALS).astype(int)
+    neighbors = grid[:, None, :] + normals
+    visible = ((neighbors < 0) | (neighbors >= GRID_SIZE)).any(axis=2)
+
+    if turn_axis is not None:
+        axis = np.asarray(turn_axis, dtype=int)
+        k = int(np.argmax(np.abs(axis)))
+        layer = GRID_SIZE - 1 if axis[k] > 0 else 0
+        facing_in = (normals == -axis).all(axis=2)
+        facing_out = (normals == axis).all(axis=2)
+        visible |= (grid[:, k] == layer)[:, None] & facing_in
+        visible |= (grid[:, k] == layer - axis[k])[:, None] & facing_out
+    return visible
+
+
+def core_boxes(turn_axis=None) -> List[Tuple[np.ndarray, bool]]:
+    """Dark boxes that stand in for the culled interior faces.
+
+    With interior faces skipped, the gaps between pieces would show the
+    background; a box whose faces run through the centers of the outer
+    pieces closes them at half a piece deep, as the neighbours' plastic
+    did. During a turn (``turn_axis`` as in visible_faces) it is split into
+    a static part and a part that turns with the layer.
+
+    Returns (corners, turning) per box, corners (8, 3) in CUBIE_CORNERS order.
+    """
+    extent = CUBE_SIZE + CUBE_GAP  # center of an outer layer
+    lo, hi = np.full(3, -extent), np.full(3, extent)
+    if turn_axis is None:
+        return [(_box_corners(lo, hi), False)]
+
+    axis = np.asarray(turn_axis, dtype=float)
+    k = int(np.argmax(np.abs(axis)))
+    sign = np.sign(axis[k])
+    # The static part ends mid-layer, the turning part starts in the cut
+    static_lo, static_hi = lo.copy(), hi.copy()
+    turning_lo, turning_hi = lo.copy(), hi.copy()
+    if sign > 0:
+        static_hi[k] = 0.0
+        turning_lo[k] = extent / 2
+    else:
+        static_lo[k] = 0.0
+        turning_hi[k] = -extent / 2
+    return [(_box_corners(static_lo, static_hi), False),
+            (_box_corners(turning_lo, turning_hi), True)]
+
+
+def core_matrices(turn_axis=None) -> List[Tuple[np.ndarray, bool]]:
+    """Model matrices that scale the cubie mesh onto the core boxes.
+
+    The core is drawn as the shared mesh with bare plastic faces
+    (CORE_COLORS), like any piece, so every draw path draws it the way it
+    draws pieces.
+
+    Returns (matrix (4, 4), turning) per box of core_boxes(turn_axis).
+    """
+    matrices = []
+    for corners, turning in core_boxes(turn_axis):
+        lo, hi = corners.min(axis=0), corners.max(axis=0)
+        matrix = np.eye(4)
+        matrix[:3, :3] = np.diag((hi - lo) / CUBE_SIZE)
+        matrix[:3, 3] = (lo + hi) / 2
+        matrices.append((matrix, turning))
+    return matrices
+
+
+def _box_corners(lo: np.ndarray, hi: np.ndarray) -> np.ndarray:
+    """Corners of an axis-aligned box in CUBIE_CORNERS order"""
+    return np.where(CUBIE_CORNERS > 0, hi, lo)
+
+
+def camera_ray(pos: Tuple[int, int], viewport: Tuple[int, int, int, int], window_height: int,
+               rotation_x: float, rotation_y: float, distance: float,
+               fov: float = 45.0) -> Tuple[np.ndarray, np.ndarray]:
+    """Mouse ray in cube coordinates, for the renderer's camera.
+
+    The renderer looks from (0, 0, distance) at the origin and turns the
+    cube by glRotatef(rotation_x, 1, 0, 0) then glRotatef(rotation_y, 0, 1, 0).
+
+    Args:
+        pos: Mouse position (top-left origin)
+        viewport: (x, y, w, h) the cube was drawn in (GL, bottom-left origin)
+        window_height: Window height, to flip the mouse y
+        fov: Vertical field of view in degrees
+
+    Returns:
+        (origin, unit direction), both (3,) arrays in the cube's frame
+    """
+    vx, vy, vw, vh = viewport
+    ndc_x = 2.0 * (pos[0] - vx) / vw - 1.0
+    ndc_y = 2.0 * (window_height - pos[1] - vy) / vh - 1.0
+    tan_half = np.tan(np.radians(fov) / 2)
+    direction = np.array([ndc_x * tan_half * vw / vh, ndc_y * tan_half, -1.0])
+
+    # Cube to eye: rotate about x, then y (innermost first), then step back
+    rotation = (rotation_matrix((1, 0, 0), rotation_x)
+                @ rotation_matrix((0, 1, 0), rotation_y))[:3, :3]
+    origin = rotation.T @ np.array([0.0, 0.0, distance])
+    direction = rotation.T @ direction
+    return origin, direction / np.linalg.norm(direction)
+
+
+# Half the cube's edge, and the facelet pitch on a face
+_OUTER = GRID_SIZE / 2 * CUBE_SIZE + (GRID_SIZE - 1) / 2 * CUBE_GAP
+_PITCH = CUBE_SIZE + CUBE_GAP
+
+
+def pick_facelet(origin: np.ndarray, direction: np.ndarray):
+    """Facelet (face, row, col) a ray hits first, or None if it misses.
+
+    Intersects the six outer face planes analytically, so picking costs the
+    same whatever is on screen. Rows and columns follow get_facelets().
+    """
+    best, best_t = None, np.inf
+    for face in FACE_NAMES:
+        normal, right, up = NET_FACE_BASIS[face]
+        facing = direction @ normal
+        if facing >= 0:  # only faces turned toward the ray
+            continue
+        t = (_OUTER - origin @ normal) / facing
+        if t <= 0 or t >= best_t:
+            continue
+        point = origin + t * direction
+        x, y = point @ right, point @ up
+        if abs(x) <= _OUTER and abs(y) <= _OUTER:
+            best, best_t = (face, x, y), t
+    if best is None:
+        return None
+
+    face, x, y = best
+    col = 1 + int(np.clip(np.rint(x / _PITCH), -1, 1))
+    row = 1 - int(np.clip(np.rint(y / _PITCH), -1, 1))
+    return face, row, col
+
+
+def cubie_mesh() -> Tuple[np.ndarray, np.ndarray]:
+    """Positions and normals of the shared cubie mesh, each (96, 3) float32.
+
+    Every piece uses this mesh; only colors and the model matrix differ.
+    """
+    positions, normals = [], []
+    for indices, normal in zip(FACE_VERTEX_INDICES, LOCAL_FACE_NORMALS):
+        base = CUBIE_CORNERS[indices]
+        sticker = sticker_vertices(base, normal)
+        positions.extend([base, sticker, sticker, base])
+        normals.append(np.tile(normal, (VERTS_PER_FACE, 1)))
+    return (np.concatenate(positions).astype(np.float32),
+            np.concatenate(normals).astype(np.float32))
+
+
+def cubie_colors(colors: List[str]) -> np.ndarray:
+    """Per-vertex RGB of the mesh for one piece's colors, (96, 3) float32"""
+    result = np.zeros((len(colors) * VERTS_PER_FACE, 3), dtype=np.float32)
+    for face, color in enumerate(colors):
+        start = face * VERTS_PER_FACE
+        if is_sticker(color):
+            result[start + _BASE:start + _BASE + 4] = BASE_SHADE
+            result[start + _STICKER:start + _STICKER + 4] = hex_to_rgb(color)
+            result[start + _OUTLINE:start + _OUTLINE + 4] = OUTLINE_SHADE
+        else:
+            result[start + _BASE:start + _BASE + 4] = PLASTIC_SHADE
+            result[start + _EDGE:start + _EDGE + 4] = PLASTIC_EDGE_SHADE
+    return result
+
+
+def projected_size(size: float, distance: float, viewport_height: int,
+                   fov: float = 45.0) -> float:
+    """Pixels spanned by an object ``size`` across at ``distance`` from the camera"""
+    return size * viewport_height / (2.0 * distance * np.tan(np.radians(fov) / 2))
+
+
+def lod_tier(pixels: float) -> str:
+    """Level of detail (one of LOD_TIERS) for a cubie this many pixels wide"""
+    if pixels < LOD_FLAT_PX:
+        return 'flat'
+    if pixels < LOD_PLAIN_PX:
+        return 'plain'
+    return 'full'
+
+
+def cubie_indices(colors: List[str], faces=None,
+                  tier: str = 'full') -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Index lists into the mesh for one piece.
+
+    Returns (quads, sticker_lines, plastic_lines) as uint16 arrays for
+    GL_QUADS, and GL_LINES at the sticker and plastic line widths. Only the
+    local faces flagged in ``faces`` are included (all by default), with
+    the parts the LOD tier keeps.
+    """
+    if tier not in LOD_TIERS:
+        raise ValueError(f"Invalid LOD tier: {tier}")
+    quads, sticker_lines, plastic_lines = [], [], []
+    for face, color in enumerate(colors):
+        if faces is not None and not faces[face]:
+            continue
+        start = face * VERTS_PER_FACE
+        if tier != 'flat':
+            quads.extend(start + _BASE + i for i in range(4))
+        if is_sticker(color):
+            quads.extend(start + _STICKER + i for i in range(4))
+            if tier == 'full':
+                sticker_lines.extend(start + _OUTLINE + i for i in _LOOP)
+        elif tier == 'full':
+            plastic_lines.extend(start + _EDGE + i for i in _LOOP)
+    return (np.array(quads, dtype=np.uint16),
+            np.array(sticker_lines, dtype=np.uint16),
+            np.array(plastic_lines, dtype=np.uint16))
+
+
+def cubie_vertex_info() -> np.ndarray:
+    """(local face, vertex group) of every mesh vertex, (96, 2) float32.
+
+    Groups are 0 base, 1 sticker, 2 sticker outline, 3 plastic edge; a
+    shader uses them to color vertices per instance.
+    """
+    vertex = np.arange(6 * VERTS_PER_FACE)
+    return np.stack([vertex // VERTS_PER_FACE, vertex % VERTS_PER_FACE // 4],
+                    axis=1).astype(np.float32)
+
+
+# Local-frame mesh shared by every PieceGeometry
+_MESH = cubie_mesh()
+
+
+class PieceGeometry:
+    """World-space render arrays of one piece, in the form the GL takes.
+
+    ``positions``, ``normals`` and ``colors`` are contiguous (96, 3) float32
+    arrays for client-side vertex arrays, the index lists are uint16 as in
+    cubie_indices (``flat_quads`` for the flat tier), ``gl_matrix`` is the
+    column-major float32 model matrix for glMultMatrixf or an instance row,
+    and ``palette`` the shader's palette indices. Build one per piece
+    appearance and reuse it until the piece moves.
+    """
+
+    def __init__(self, piece: CubePiece, faces=None):
+        """
+        Args:
+            piece: Piece to build for
+            faces: Visible flag per local face (default: all six)
+        """
+        local_positions, local_normals = _MESH
+        self.matrix = piece_matrix(piece)
+        rotation = self.matrix[:3, :3]
+        self.positions = np.ascontiguousarray(
+            local_positions @ rotation.T + self.matrix[:3, 3], dtype=np.float32)
+        self.normals = np.ascontiguousarray(local_normals @ rotation.T, dtype=np.float32)
+        self.colors = cubie_colors(piece.colors)
+        self.quads, self.sticker_lines, self.plastic_lines = cubie_indices(piece.colors, faces)
+        self.flat_quads = cubie_indices(piece.colors, faces, 'flat')[0]
+        self.gl_matrix = np.ascontiguousarray(self.matrix.T, dtype=np.float32)
+        self.palette = palette_indices(piece.colors, faces)
+
+
+def instance_indices(tier: str = 'full'
+                     ) -> Dict[Tuple[int, bool], Tuple[np.ndarray, np.ndarray]]:
+    """Index lists of each instance group (see instance_groups) into the mesh.
+
+    Returns (local face, sticker) -> (triangles, lines) as uint16 arrays
+    with the parts the LOD tier keeps: a stickered face has its base,
+    sticker and sticker outline, a bare face its base and plastic edge.
+    Each list covers one face, so a group draws nothing its pieces lack.
+    """
+    if tier not in LOD_TIERS:
+        raise ValueError(f"Invalid LOD tier: {tier}")
+    groups = {}
+    for face in range(6):
+        start = face * VERTS_PER_FACE
+        for sticker in (True, False):
+            triangles = [start + _BASE + i for i in _SPLIT] if tier != 'flat' else []
+            lines = []
+            if sticker:
+                triangles += [start + _STICKER + i for i in _SPLIT]
+                if tier == 'full':
+                    lines = [start + _OUTLINE + i for i in _LOOP]
+            elif tier == 'full':
+                lines = [start + _EDGE + i for i in _LOOP]
+            groups[face, sticker] = (np.array(triangles, dtype=np.uint16),
+                                     np.array(lines, dtype=np.uint16))
+    return groups
+
+
+def instance_groups(palettes: np.ndarray) -> List[Tuple[Tuple[int, bool], np.ndarray]]:
+    """Split cubie instances by the local faces they show.
+
+    Args:
+        palettes: (N, 6) palette index of each instance's local faces
+            (PALETTE, PLASTIC_INDEX or HIDDEN_INDEX)
+
+    Returns:
+        ((local face, sticker), instance rows) for every non-empty group;
+        hidden faces are in none, so they are never sent to the GPU
+    """
+    palettes = np.asarray(palettes)
+    groups = []
+    for face in range(6):
+        for sticker, shown in ((True, palettes[:, face] < PLASTIC_INDEX),
+                               (False, palettes[:, face] == PLASTIC_INDEX)):
+            rows = np.flatnonzero(shown)
+            if len(rows):
+                groups.append(((face, sticker), rows))
+    return groups
\ No newline at end of file
@@ -0,0 +1,293 @@
+"""
+Rubik's Cube Background Jobs - long model computations off the render loop
+
+A solve, an optimal search or a bulk scramble can take from a fraction of a
+second to minutes; called from a key handler it would freeze rendering for
+all of that time. A JobRunner runs such computations in one worker process
+(or thread) instead, each on a snapshot of the model taken at submission,
+so the cube stays interactive. The render loop calls poll() once per frame:
+it drains the progress/partial-result queue without blocking and hands
+back the jobs that finished, for the controller to apply through the turn
+animator.
+
+A worker process is the default because a pure-Python search in a thread
+would hold the GIL against the render loop. Job functions therefore run
+in another interpreter: they must be module-level and are called as
+``function(snapshot, context, *args)``. Cancellation is cooperative: once
+cancelled, the job's next context.report() raises JobCancelled. The
+solvers are imported by the job that runs them, keeping them off the
+viewer's startup path.
+No GUI dependencies.
+"""
+
+import multiprocessing
+import os
+import queue
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from cube_state import (
+    MOVE_PERMUTATIONS,
+    SOLVED_STATE,
+    apply_moves,
+    invert_moves,
+    simplify_moves,
+    state_from_model,
+)
+
+JOB_STATES = ('running', 'done', 'failed', 'cancelled')
+SOLVE_SECONDS = 5.0  # two-phase search budget of a solve
+SCRAMBLE_CHUNK = 4096
+WORKER_NICENESS = 10  # worker process priority drop; the render loop comes first
+
+
+class JobCancelled(Exception):
+    """Raised inside a job function once its job has been cancelled"""
+
+
+class _Counter:
+    """In-thread stand-in for the shared multiprocessing.Value"""
+
+    def __init__(self):
+        self.value = 0
+
+
+class JobContext:
+    """What a job function gets to talk back to the UI"""
+
+    def __init__(self, job_id: int, updates, cancelled_through):
+        self.job_id = job_id
+        self._updates = updates
+        self._cancelled_through = cancelled_through  # highest cancelled job id
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled_through.value >= self.job_id
+
+    def report(self, progress: Optional[float] = None, message: Optional[str] = None,
+               partial=None):
+        """Publish progress (0..1), a status message and/or a partial result.
+
+        Raises JobCancelled if the job has been cancelled, so long loops
+        that report regularly stop there.
+        """
+        if self.cancelled:
+            raise JobCancelled()
+        self._updates.put((self.job_id, progress, message, partial))
+
+
+class Job:
+    """UI-side record of a submitted job, updated by JobRunner.poll()"""
+
+    def __init__(self, job_id: int, name: str, model_version: int):
+        self.id = job_id
+        self.name = name
+        self.model_version = model_version  # model.version of the snapshot
+        self.status = 'running'
+        self.progress = 0.0
+        self.message = ''
+        self.partial = None
+        self.result = None
+        self.error: Optional[str] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status != 'running'
+
+
+# Worker-process channels, installed by the pool initializer
+_channels = None
+
+
+def _init_worker(updates, cancelled_through):
+    global _channels
+    _channels = (updates, cancelled_through)
+    if hasattr(os, 'nice'):
+        os.nice(WORKER_NICENESS)
+
+
+def _run(job_id: int, function, snapshot, args: Tuple, channels=None):
+    """Executor entry point: call the job function with its context"""
+    updates, cancelled_through = channels or _channels
+    return function(snapshot, JobContext(job_id, updates, cancelled_through), *args)
+
+
+class JobRunner:
+    """
+    Runs one background job at a time on a model snapshot
+
+    Submitting a job cancels the one before it: the latest request is the
+    one the user is waiting for. The worker starts with the first job, so
+    an idle runner costs nothing at startup.
+    """
+
+    def __init__(self, processes: bool = True):
+        """
+        Args:
+            processes: Run jobs in a worker process (False: a worker thread,
+                cheaper to start but sharing the GIL with the caller)
+        """
+        self.processes = processes
+        self._executor = None  # started by the first submit()
+        self._updates = None
+        self._cancelled_through = _Counter()
+        self._channels = None
+        self._next_id = 0
+        self._jobs: Dict[int, Tuple[Job, Future]] = {}
+
+    def _start(self):
+        """Create the worker and its channels, on the first submit only"""
+        if self.processes:
+            context = multiprocessing.get_context('spawn')  # no fork of GL state
+            self._updates = context.Queue()
+            self._cancelled_through = context.Value('q', self._next_id)
+            self._executor = ProcessPoolExecutor(
+                1, mp_context=context, initializer=_init_worker,
+                initargs=(self._updates, self._cancelled_through))
+        else:
+            self._updates = queue.Queue()
+            self._executor = ThreadPoolExecutor(1, thread_name_prefix='cube-job')
+            self._channels = (self._updates, self._cancelled_through)
+
+    @property
+    def active(self) -> Optional[Job]:
+        """The most recent job still running, if any"""
+        running = [job for job, _ in self._jobs.values() if not job.finished]
+        return running[-1] if running else None
+
+    def submit(self, name: str, function, model, *args) -> Job:
+        """
+        Start ``function(snapshot, context, *args)`` on a copy of the model
+
+        Args:
+            name: Label shown in the HUD
+            function: Module-level job function (see module docstring)
+            model: RubiksCubeModel to snapshot; it may change afterwards
+
+        Returns:
+            Job whose fields poll() keeps up to date
+        """
+        self.cancel()
+        if self._executor is None:
+            self._start()
+        self._next_id += 1
+        job = Job(self._next_id, name, model.version)
+        future = self._executor.submit(_run, job.id, function, model.copy(),
+                                       args, self._channels)
+        self._jobs[job.id] = (job, future)
+        return job
+
+    def cancel(self):
+        """Cancel every submitted job; each stops at its next report"""
+        self._cancelled_through.value = self._next_id
+        for _, future in self._jobs.values():
+            future.cancel()
+
+    def poll(self) -> List[Job]:
+        """Apply queued progress updates and return the jobs that finished.
+
+        Never blocks; call it once per frame from the render loop.
+        """
+        while self._updates is not None:
+            try:
+                job_id, progress, message, partial = self._updates.get_nowait()
+            except queue.Empty:
+                break
+            entry = self._jobs.get(job_id)
+            if entry is None:
+                continue
+            job = entry[0]
+            if progress is not None:
+                job.progress = progress
+            if message is not None:
+                job.message = message
+            if partial is not None:
+                job.partial = partial
+
+        finished = []
+        for job_id, (job, future) in list(self._jobs.items()):
+            if not future.done():
+                continue
+            del self._jobs[job_id]
+            error = None if future.cancelled() else future.exception()
+            if future.cancelled() or isinstance(error, JobCancelled):
+                job.status = 'cancelled'
+            elif error is not None:
+                job.status = 'failed'
+                job.error = str(error) or type(error).__name__
+            else:
+                job.status = 'done'
+                job.result = future.result()
+                job.progress = 1.0
+            finished.append(job)
+        return finished
+
+    def shutdown(self):
+        """Cancel outstanding work and stop the worker without waiting"""
+        self.cancel()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# --- Job functions ----------------------------------------------------------
+
+def solve_job(model, context: JobContext, max_depth: Optional[int] = None,
+              seconds: float = SOLVE_SECONDS) -> List[str]:
+    """Solve the snapshot, ever shorter solutions first.
+
+    Undoing the move history is reported at once as a partial result,
+    then every shorter solution of the two-phase search within
+    ``seconds``. If that search did not prove its best solution optimal,
+    the optimal search looks for anything shorter up to ``max_depth``
+    moves (default: cube_search.DEFAULT_MAX_DEPTH). Returns the best
+    solution found; raises RuntimeError, failing the job, if neither
+    search found one.
+    """
+    from cube_search import DEFAULT_MAX_DEPTH, solve_optimal
+    from cube_twophase import TwoPhaseSearch
+
+    state = state_from_model(model)
+    best = simplify_moves(invert_moves(model.move_history))
+    if not np.array_equal(apply_moves(state, best), SOLVED_STATE):
+        best = None  # history does not describe this state
+    else:
+        context.report(0.0, f"{len(best)}-move solution, searching for shorter", best)
+
+    def progress(fraction: float, message: str):
+        context.report(fraction, message)
+
+    search = TwoPhaseSearch(state, seconds, max_length=len(best) if best else None,
+                            progress=progress)
+    for best in search:
+        context.report(search.elapsed / seconds,
+                       f"{len(best)}-move solution, searching for shorter", best)
+    if best is not None and (search.optimal or not best):
+        return best
+
+    if max_depth is None:
+        max_depth = DEFAULT_MAX_DEPTH
+    limit = max_depth if best is None else min(max_depth, len(best) - 1)
+    moves = solve_optimal(state, limit, progress)
+    if moves is not None:
+        return moves
+    if best is None:
+        raise RuntimeError(f"no solution found in {seconds:g} s or {max_depth} moves")
+    return best
+
+
+def scramble_job(model, context: JobContext, count: int, depth: int = 20,
+                 seed: Optional[int] = None) -> np.ndarray:
+    """``count`` random states, each ``depth`` random turns from the snapshot"""
+    rng = np.random.default_rng(seed)
+    start = state_from_model(model)
+    chunks = []
+    for done in range(0, count, SCRAMBLE_CHUNK):
+        size = min(SCRAMBLE_CHUNK, count - done)
+        states = np.tile(start, (size, 1))
+        for move in rng.integers(len(MOVE_PERMUTATIONS), size=(depth, size)):
+            states = np.take_along_axis(states, MOVE_PERMUTATIONS[move], axis=1)
+        chunks.append(states)
+        context.report((done + size) / count, f"{done + size} of {count} states")
+    return np.concatenate(chunks) if chunks else np.empty((0, len(start)), dtype=np.uint8)
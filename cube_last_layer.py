@@ -0,0 +1,291 @@
+"""
+Rubik's Cube Last Layer - OLL/PLL case recognition by table lookup
+
+Once the first two layers (F2L: the D face and the middle layer) are
+solved, the last layer (U) is finished in two steps with memorized
+algorithms: OLL orients it (57 cases), PLL then permutes it (21 cases).
+This module knows the standard algorithm of every case and recognizes the
+case of a state with one dictionary lookup.
+
+The index is built once from the algorithms themselves: undoing a case's
+algorithm on a solved cube gives that case, and each of its four U-layer
+offsets (AUF, "adjust U face") before the algorithm and, for PLL, after it
+is entered under its raw sticker pattern:
+
+    OLL  which of the 21 last-layer stickers show the U color
+    PLL  the colors of the 12 side stickers of the last layer
+
+so recognition reads those stickers off the state and looks them up, and
+the entry already says which U turn to make first. Symmetric cases
+(several AUFs showing the same pattern) keep the shortest.
+
+Algorithms are stored in the usual notation (wide turns, slices, cube
+rotations); expand_algorithm() rewrites them as the 18 face turns the
+rest of the code uses. No GUI dependencies.
+"""
+
+import re
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from cube_model import FACE_NAMES
+from cube_state import (
+    SOLVED_STATE,
+    apply_moves,
+    invert_moves,
+    relabel_by_centers,
+    simplify_moves,
+    state_from_cube,
+)
+
+# Standard numbering; one common algorithm per case
+OLL_ALGORITHMS = {
+    1: "R U2 R2 F R F' U2 R' F R F'",
+    2: "F R U R' U' F' f R U R' U' f'",
+    3: "f R U R' U' f' U' F R U R' U' F'",
+    4: "f R U R' U' f' U F R U R' U' F'",
+    5: "r' U2 R U R' U r",
+    6: "r U2 R' U' R U' r'",
+    7: "r U R' U R U2 r'",
+    8: "l' U' L U' L' U2 l",
+    9: "R U R' U' R' F R2 U R' U' F'",
+    10: "R U R' U R' F R F' R U2 R'",
+    11: "r U R' U R' F R F' R U2 r'",
+    12: "M' R' U' R U' R' U2 R U' M",
+    13: "F U R U' R2 F' R U R U' R'",
+    14: "R' F R U R' F' R F U' F'",
+    15: "l' U' l L' U' L U l' U l",
+    16: "r U r' R U R' U' r U' r'",
+    17: "R U R' U R' F R F' U2 R' F R F'",
+    18: "r U R' U R U2 r2 U' R U' R' U2 r",
+    19: "M U R U R' U' M' R' F R F'",
+    20: "r U R' U' M2 U R U' R' U' M'",
+    21: "R U2 R' U' R U R' U' R U' R'",
+    22: "R U2 R2 U' R2 U' R2 U2 R",
+    23: "R2 D' R U2 R' D R U2 R",
+    24: "r U R' U' r' F R F'",
+    25: "F' r U R' U' r' F R",
+    26: "R U2 R' U' R U' R'",
+    27: "R U R' U R U2 R'",
+    28: "r U R' U' r' R U R U' R'",
+    29: "R U R' U' R U' R' F' U' F R U R'",
+    30: "F R' F R2 U' R' U' R U R' F2",
+    31: "R' U' F U R U' R' F' R",
+    32: "L U F' U' L' U L F L'",
+    33: "R U R' U' R' F R F'",
+    34: "R U R2 U' R' F R U R U' F'",
+    35: "R U2 R2 F R F' R U2 R'",
+    36: "L' U' L U' L' U L U L F' L' F",
+    37: "F R' F' R U R U' R'",
+    38: "R U R' U R U' R' U' R' F R F'",
+    39: "L F' L' U' L U F U' L'",
+    40: "R' F R U R' U' F' U R",
+    41: "R U R' U R U2 R' F R U R' U' F'",
+    42: "R' U' R U' R' U2 R F R U R' U' F'",
+    43: "F' U' L' U L F",
+    44: "F U R U' R' F'",
+    45: "F R U R' U' F'",
+    46: "R' U' R' F R F' U R",
+    47: "R' U' R' F R F' R' F R F' U R",
+    48: "F R U R' U' R U R' U' F'",
+    49: "r U' r2 U r2 U r2 U' r",
+    50: "r' U r2 U' r2 U' r2 U r'",
+    51: "F U R U' R' U R U' R' F'",
+    52: "R U R' U R U' B U' B' R'",
+    53: "l' U2 L U L' U' L U L' U l",
+    54: "r U2 R' U' R U R' U' R U' r'",
+    55: "R' F R U R U' R2 F' R2 U' R' U R U R'",
+    56: "r' U' r U' R' U R U' R' U R r' U r",
+    57: "R U R' U' M' U R U' r'",
+}
+
+PLL_ALGORITHMS = {
+    'Aa': "x R' U R' D2 R U' R' D2 R2 x'",
+    'Ab': "x R2 D2 R U R' D2 R U' R x'",
+    'E': "x' L' U L D' L' U' L D L' U' L D' L' U L D x",
+    'F': "R' U' F' R U R' U' R' F R2 U' R' U' R U R' U R",
+    'Ga': "R2 U R' U R' U' R U' R2 U' D R' U R D'",
+    'Gb': "R' U' R U D' R2 U R' U R U' R U' R2 D",
+    'Gc': "R2 U' R U' R U R' U R2 U D' R U' R' D",
+    'Gd': "R U R' U' D R2 U' R U' R' U R' U R2 D'",
+    'H': "M2 U M2 U2 M2 U M2",
+    'Ja': "x R2 F R F' R U2 r' U r U2 x'",
+    'Jb': "R U R' F' R U R' U' R' F R2 U' R'",
+    'Na': "R U R' U R U R' F' R U R' U' R' F R2 U' R' U2 R U' R'",
+    'Nb': "R' U R U' R' F' U' F R U R' F R' F' R U' R",
+    'Ra': "R U' R' U' R U R D R' U' R D' R' U2 R'",
+    'Rb': "R2 F R U R U' R' F' R U2 R' U2 R",
+    'T': "R U R' U' R' F R2 U' R' U' R U R' F'",
+    'Ua': "M2 U M U2 M' U M2",
+    'Ub': "M2 U' M U2 M' U' M2",
+    'V': "R' U R' U' y R' F' R2 U' R' U R' F R F",
+    'Y': "F R U' R' U' R U R' F' R U R' U' R' F R F'",
+    'Z': "M' U M2 U M2 U M' U2 M2",
+}
+
+# U-layer facelets: the U face, then the top rows of F, R, B, L
+_U = FACE_NAMES.index('U')
+LL_SIDES = np.array([FACE_NAMES.index(face) * 9 + col for face in 'FRBL' for col in range(3)])
+U_FACELETS = _U * 9 + np.arange(9)
+LL_FACELETS = np.concatenate([U_FACELETS, LL_SIDES])
+# The rest of the cube, solved when F2L is
+F2L_FACELETS = np.setdiff1d(np.arange(len(SOLVED_STATE)), LL_FACELETS)
+
+_AUF = ['', 'U', 'U2', "U'"]  # index: clockwise quarter turns
+_AUF_ORDER = (0, 1, 3, 2)     # fewest quarter turns first
+
+# Cube rotations as a relabelling of the face positions: after the
+# rotation, the face named by the key sits where the value's face was
+_ROTATIONS = {
+    'x': {'U': 'F', 'F': 'D', 'D': 'B', 'B': 'U'},
+    'y': {'F': 'R', 'R': 'B', 'B': 'L', 'L': 'F'},
+    'z': {'U': 'L', 'R': 'U', 'D': 'R', 'L': 'D'},
+}
+# Wide turns and slices as (face turns, cube rotation) with the same suffix
+_COMPOUND = {
+    'r': ("L", 'x'), 'l': ("R", "x'"), 'u': ("D", 'y'),
+    'd': ("U", "y'"), 'f': ("B", 'z'), 'b': ("F", "z'"),
+    'M': ("R L'", "x'"), 'E': ("U D'", "y'"), 'S': ("F' B", 'z'),
+}
+_TOKEN = re.compile(r"^([UDFBLRudfblrMESxyz])(w?)(2'?|'?)$")
+_QUARTERS = {'': 1, '2': 2, "2'": 2, "'": 3}
+_SUFFIXES = {1: '', 2: '2', 3: "'"}
+
+
+def expand_algorithm(text: str) -> List[str]:
+    """
+    Rewrite an algorithm in full notation as face turns of the fixed cube
+
+    Cube rotations are not turns but change which face each later move
+    names, so they are folded into the face names that follow; wide turns
+    and slices become their outer face turns plus such a rotation.
+    Parentheses are ignored.
+
+    Raises:
+        ValueError: On a move outside the notation
+    """
+    moves: List[str] = []
+    where = {face: face for face in 'UDFBLR'}  # face named -> face turned
+
+    def rotate(axis: str, quarters: int):
+        for _ in range(quarters % 4):
+            cycle = _ROTATIONS[axis]
+            where.update({face: where[source] for face, source in cycle.items()})
+
+    for token in text.replace('(', ' ').replace(')', ' ').split():
+        match = _TOKEN.match(token)
+        if match is None:
+            raise ValueError(f"Invalid move: {token}")
+        letter, wide, suffix = match.groups()
+        if wide:
+            letter = letter.lower()
+        quarters = _QUARTERS[suffix]
+        if letter in _ROTATIONS:
+            rotate(letter, quarters)
+            continue
+        turns, rotation = _COMPOUND.get(letter, (letter, None))
+        for turn in turns.split():
+            count = quarters * _QUARTERS[turn[1:]] % 4
+            moves.append(where[turn[0]] + _SUFFIXES[count])
+        if rotation is not None:
+            rotate(rotation[0], quarters * _QUARTERS[rotation[1:]])
+    return moves
+
+
+class LastLayerCase:
+    """A recognized last-layer case and how to solve it from this state"""
+
+    def __init__(self, step: str, name: str, algorithm: str, pre: str = '', post: str = ''):
+        self.step = step            # 'OLL', 'PLL' or 'AUF' (only a U turn left)
+        self.name = name            # OLL number as text, PLL name, or 'AUF'
+        self.algorithm = algorithm  # usual notation, '' for AUF
+        self.pre = pre              # U turn before the algorithm ('' if none)
+        self.post = post            # U turn after it (PLL and AUF)
+
+    @property
+    def moves(self) -> List[str]:
+        """Face turns that finish this step: pre, algorithm, post"""
+        moves = [self.pre] + expand_algorithm(self.algorithm) + [self.post]
+        return simplify_moves([move for move in moves if move])
+
+    def __repr__(self):
+        return f"LastLayerCase({self.step} {self.name}, pre={self.pre!r}, post={self.post!r})"
+
+
+def f2l_solved(state: np.ndarray) -> bool:
+    """True when the D face and the middle layer of a relabelled state are solved"""
+    return bool(np.array_equal(state[F2L_FACELETS], SOLVED_STATE[F2L_FACELETS]))
+
+
+def _oll_key(state: np.ndarray) -> bytes:
+    return (state[LL_FACELETS] == _U).tobytes()
+
+
+def _pll_key(state: np.ndarray) -> bytes:
+    return state[LL_SIDES].tobytes()
+
+
+class LastLayerIndex:
+    """Raw last-layer patterns of every OLL/PLL case and AUF, for lookup"""
+
+    def __init__(self):
+        self.oll: Dict[bytes, Tuple[int, int]] = {}          # key -> (case, pre)
+        self.pll: Dict[bytes, Tuple[str, int, int]] = {}     # key -> (case, pre, post)
+        for number, algorithm in OLL_ALGORITHMS.items():
+            case = apply_moves(SOLVED_STATE, invert_moves(expand_algorithm(algorithm)))
+            for pre in _AUF_ORDER:
+                seen = apply_moves(case, [_AUF[-pre]] if pre else [])
+                self.oll.setdefault(_oll_key(seen), (number, pre))
+        cases = [('AUF', [])] + [(name, expand_algorithm(algorithm))
+                                 for name, algorithm in PLL_ALGORITHMS.items()]
+        for name, moves in cases:
+            undo = invert_moves(moves)
+            for post in _AUF_ORDER:
+                for pre in _AUF_ORDER if moves else (0,):
+                    before = [_AUF[-post]] if post else []
+                    after = [_AUF[-pre]] if pre else []
+                    seen = apply_moves(SOLVED_STATE, before + undo + after)
+                    self.pll.setdefault(_pll_key(seen), (name, pre, post))
+        del self.pll[_pll_key(SOLVED_STATE)]
+
+    def recognize(self, state: np.ndarray) -> Optional[LastLayerCase]:
+        """
+        Case of a compact state whose first two layers are solved
+
+        Returns:
+            The OLL case while the last layer is not oriented, then the PLL
+            case (or AUF); None once solved, or if F2L is not solved or the
+            pattern is not a legal last layer
+        """
+        state = relabel_by_centers(np.asarray(state, dtype=np.uint8))
+        if not f2l_solved(state):
+            return None
+        if not (state[U_FACELETS] == _U).all():
+            entry = self.oll.get(_oll_key(state))
+            if entry is None:
+                return None
+            number, pre = entry
+            return LastLayerCase('OLL', str(number), OLL_ALGORITHMS[number], _AUF[pre])
+        entry = self.pll.get(_pll_key(state))
+        if entry is None:
+            return None
+        name, pre, post = entry
+        return LastLayerCase('AUF' if name == 'AUF' else 'PLL', name,
+                             PLL_ALGORITHMS.get(name, ''), _AUF[pre], _AUF[post])
+
+
+_index: Optional[LastLayerIndex] = None
+
+
+def last_layer_index() -> LastLayerIndex:
+    """The process-wide index, built on first use (a few milliseconds)"""
+    global _index
+    if _index is None:
+        _index = LastLayerIndex()
+    return _index
+
+
+def recognize(cube) -> Optional[LastLayerCase]:
+    """Last-layer case of a RubiksCubeModel, FaceletState, facelet dict or state"""
+    return last_layer_index().recognize(state_from_cube(cube))
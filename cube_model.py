@@ -3,6 +3,7 @@ Rubik's Cube Model - Pure logic, no GUI dependencies
 """
 
 import numpy as np
+from collections.abc import Sequence
 from typing import List, Dict
 import random
 
@@ -10,7 +11,6 @@ import random
 CUBE_SIZE = 0.95  # Slightly larger pieces
 CUBE_GAP = 0.05   # Smaller gap for realistic appearance
 GRID_SIZE = 3
-ROTATION_ANGLE = np.pi / 2
 
 # Colors
 COLORS = {
@@ -34,6 +34,17 @@ FACE_COLORS = [
 
 FACE_NAMES = ['F', 'B', 'R', 'L', 'U', 'D']
 
+# Rotation axis of each face turn: the face's outward normal. A turn is
+# clockwise when looking at the face from outside, i.e. -90 degrees about it.
+FACE_AXES = {
+    'F': (0, 0, 1),
+    'B': (0, 0, -1),
+    'R': (1, 0, 0),
+    'L': (-1, 0, 0),
+    'U': (0, 1, 0),
+    'D': (0, -1, 0),
+}
+
 # Outward normal of each local face, in the order used by CubePiece.colors:
 # right(+X), left(-X), up(+Y), down(-Y), front(+Z), back(-Z)
 LOCAL_FACE_NORMALS = [
@@ -45,6 +56,74 @@ LOCAL_FACE_NORMALS = [
     np.array([0.0, 0.0, -1.0]),
 ]
 
+# Sticker colors as stored per piece face: the face colors, then plastic
+STICKER_COLORS = FACE_COLORS + [COLORS['BLACK']]
+NO_STICKER = len(FACE_COLORS)
+
+# Sticker of each local face on a solved cube: (grid axis, layer, color)
+# of the pieces that carry it, e.g. right faces are blue on x == 2
+_HOME_STICKERS = [(0, 2, 2), (0, 0, 3), (1, 2, 4), (1, 0, 5), (2, 2, 0), (2, 0, 1)]
+
+
+def _rotation_group() -> np.ndarray:
+    """The 24 rotations of the cube as integer matrices, identity first"""
+    quarter_x = np.array([[1, 0, 0], [0, 0, -1], [0, 1, 0]])
+    quarter_y = np.array([[0, 0, 1], [0, 1, 0], [-1, 0, 0]])
+    group = [np.eye(3, dtype=int)]
+    for matrix in group:  # grows while iterating, until closed
+        for generator in (quarter_x, quarter_y):
+            product = generator @ matrix
+            if not any((product == known).all() for known in group):
+                group.append(product)
+    return np.array(group, dtype=np.int8)
+
+
+# Orientations of a piece: indices into the 24 exact rotation matrices
+ROTATIONS = _rotation_group()
+ROTATIONS.flags.writeable = False
+
+
+def rotation_index(matrix) -> int:
+    """ROTATIONS index of a rotation matrix, which must match exactly"""
+    matches = np.nonzero((ROTATIONS == np.asarray(matrix)).all(axis=(1, 2)))[0]
+    if len(matches) == 0:
+        raise ValueError("Invalid rotation matrix: not a rotation of the cube")
+    return int(matches[0])
+
+
+# ROTATION_PRODUCTS[a, b]: index of ROTATIONS[a] @ ROTATIONS[b], i.e. b then a
+ROTATION_PRODUCTS = np.array([[rotation_index(a @ b) for b in ROTATIONS] for a in ROTATIONS],
+                             dtype=np.uint8)
+
+
+def _face_turns() -> Dict[str, np.ndarray]:
+    """ROTATIONS index of 0..3 clockwise quarter turns of each face"""
+    turns = {}
+    for face, (x, y, z) in FACE_AXES.items():
+        # -90 degrees about the outward normal n: n n^T - [n]x
+        quarter = np.outer((x, y, z), (x, y, z)) - np.array([[0, -z, y], [z, 0, -x], [-y, x, 0]])
+        index = rotation_index(quarter)
+        powers = [0]
+        for _ in range(3):
+            powers.append(ROTATION_PRODUCTS[index, powers[-1]])
+        turns[face] = np.array(powers, dtype=np.uint8)
+    return turns
+
+
+FACE_TURNS = _face_turns()
+
+# ORIENTED_FACES[o, f]: local face (LOCAL_FACE_NORMALS index) whose direction
+# local face f points along in the world after rotation o
+ORIENTED_FACES = np.array(
+    [[next(index for index, normal in enumerate(LOCAL_FACE_NORMALS)
+           if (rotation @ local == normal).all()) for local in LOCAL_FACE_NORMALS]
+     for rotation in ROTATIONS], dtype=np.uint8)
+
+# Local face index that points along each face's outward normal
+_FACE_DIRECTION = {face: next(index for index, normal in enumerate(LOCAL_FACE_NORMALS)
+                              if (normal == axis).all())
+                   for face, axis in FACE_AXES.items()}
+
 # Basis for projecting the 3D state onto each face of the unfolded 2D net:
 # (outward normal, screen-right vector, screen-up vector) in world space.
 NET_FACE_BASIS = {
@@ -97,61 +176,242 @@ class GridPosition:
         return f"GridPos({self.x},{self.y},{self.z})"
 
 
+class PieceArrays:
+    """
+    Struct-of-arrays storage of cube pieces, one row per piece
+
+    A turn updates every piece of a layer with a few masked array
+    operations, and a snapshot is a copy of four small arrays instead of
+    27 object graphs. Grid positions and orientations are exact integers,
+    so no number of turns can make them drift.
+
+    Attributes:
+        grid: (N, 3) int8 grid position (0..2 on x, y, z)
+        orientations: (N,) uint8 ROTATIONS index of each piece
+        colors: (N, 6) uint8 STICKER_COLORS index of each local face, in
+            CubePiece.colors order (NO_STICKER on the plastic faces)
+        versions: (N,) bumped whenever the piece moves or changes
+    """
+
+    def __init__(self, grid_positions):
+        """
+        Args:
+            grid_positions: (x, y, z) grid position of each piece, solved
+        """
+        self.grid = np.array(grid_positions, dtype=np.int8).reshape(-1, 3)
+        self.orientations = np.zeros(len(self.grid), dtype=np.uint8)
+        self.colors = np.full((len(self.grid), len(LOCAL_FACE_NORMALS)), NO_STICKER,
+                              dtype=np.uint8)
+        for face, (axis, layer, color) in enumerate(_HOME_STICKERS):
+            self.colors[self.grid[:, axis] == layer, face] = color
+        self.versions = np.zeros(len(self.grid), dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.grid)
+
+    @property
+    def positions(self) -> np.ndarray:
+        """(N, 3) world position of each piece center"""
+        return (self.grid - 1) * (CUBE_SIZE + CUBE_GAP)
+
+    @property
+    def rotations(self) -> np.ndarray:
+        """(N, 3, 3) integer rotation matrix of each piece"""
+        return ROTATIONS[self.orientations]
+
+    def copy(self) -> 'PieceArrays':
+        """Independent copy of every array"""
+        arrays = PieceArrays.__new__(PieceArrays)
+        for name in ('grid', 'orientations', 'colors', 'versions'):
+            setattr(arrays, name, getattr(self, name).copy())
+        return arrays
+
+    def turn(self, axis: int, layer: int, rotation: int):
+        """Rotate the pieces whose grid coordinate ``axis`` equals ``layer``
+
+        Args:
+            axis, layer: Grid axis (0..2) and layer (0..2) that turns
+            rotation: ROTATIONS index of the turn
+        """
+        moving = self.grid[:, axis] == layer
+        # Stickers are indexed by the piece's local face, so rotating the
+        # piece carries the colors with it. Re-deriving colors from position
+        # here would be wrong: it would "re-solve" the cube on every turn and
+        # paint stickers onto faces that now point inward.
+        self.grid[moving] = (self.grid[moving] - 1) @ ROTATIONS[rotation].T + 1
+        self.orientations[moving] = ROTATION_PRODUCTS[rotation, self.orientations[moving]]
+        self.versions[moving] += 1
+
+
+class _GridPositionSnapshot(GridPosition):
+    """GridPosition read from a piece: a copy, so writes to it raise
+    instead of being lost. Assign piece.grid_position to move the piece."""
+
+    def __init__(self, x: int, y: int, z: int):
+        object.__setattr__(self, 'x', x)
+        object.__setattr__(self, 'y', y)
+        object.__setattr__(self, 'z', z)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Invalid write to {name}: a piece's grid position "
+                             "is read-only; assign piece.grid_position instead")
+
+
+def _sticker_index(color: str) -> int:
+    """STICKER_COLORS index of a color"""
+    if color not in STICKER_COLORS:
+        raise ValueError(f"Invalid sticker color: {color!r}")
+    return STICKER_COLORS.index(color)
+
+
+class PieceColors(Sequence):
+    """
+    Sticker colors of one piece, read and written through its PieceArrays row
+
+    ``piece.colors[i] = color`` paints the piece and bumps its version. The
+    view compares equal to a list or tuple of the same colors.
+    """
+
+    __slots__ = ('_arrays', '_row')
+
+    def __init__(self, arrays: PieceArrays, row: int):
+        self._arrays = arrays
+        self._row = row
+
+    def __len__(self) -> int:
+        return self._arrays.colors.shape[1]
+
+    def __getitem__(self, index):
+        indices = self._arrays.colors[self._row][index]
+        if isinstance(index, slice):
+            return [STICKER_COLORS[i] for i in indices]
+        return STICKER_COLORS[indices]
+
+    def __iter__(self):
+        return iter([STICKER_COLORS[i] for i in self._arrays.colors[self._row]])
+
+    def __setitem__(self, index, color):
+        if isinstance(index, slice):
+            self._arrays.colors[self._row, index] = [_sticker_index(c) for c in color]
+        else:
+            self._arrays.colors[self._row, index] = _sticker_index(color)
+        self._arrays.versions[self._row] += 1
+
+    def __eq__(self, other):
+        if isinstance(other, (list, tuple, PieceColors)):
+            return list(self) == list(other)
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(list(self))
+
+
 class CubePiece:
-    """Individual piece of the Rubik's cube"""
+    """Individual piece of the Rubik's cube
 
-    def __init__(self, grid_position: GridPosition):
-        self.grid_position = grid_position.copy()
-        self.position = self._calculate_world_position()
-        self.rotation_matrix = np.eye(3)
-        self.id = f"{grid_position.x}-{grid_position.y}-{grid_position.z}"
-        self.colors = self._initialize_colors()
-
-    def _calculate_world_position(self) -> Vector3:
-        """Calculate 3D world position from grid position"""
-        offset = CUBE_SIZE + CUBE_GAP
-        return Vector3(
-            (self.grid_position.x - 1) * offset,
-            (self.grid_position.y - 1) * offset,
-            (self.grid_position.z - 1) * offset
-        )
-
-    def _initialize_colors(self) -> List[str]:
+    A view of one row of a PieceArrays: the attributes read and write the
+    arrays. A piece created on its own gets a one-row store of its own.
+    """
+
+    __slots__ = ('_arrays', '_row', 'id', '_vertices', '_vertices_version')
+
+    def __init__(self, grid_position: GridPosition, arrays: PieceArrays = None, row: int = 0):
         """
-        Initialize face colors based on position in the cube.
-        ONLY outer boundary faces get colored stickers.
-        Returns colors in order: right, left, up, down, front, back
-
-        Grid coordinates:
-        - x: 0 (left), 1 (middle), 2 (right)
-        - y: 0 (down), 1 (middle), 2 (up)
-        - z: 0 (back), 1 (middle), 2 (front)
+        Args:
+            grid_position: Solved grid position, which names the piece
+            arrays: Store holding the piece (a new one-row store if None)
+            row: Row of the piece in ``arrays``
         """
-        colors = []
-        x, y, z = self.grid_position.x, self.grid_position.y, self.grid_position.z
+        if arrays is None:
+            arrays = PieceArrays([(grid_position.x, grid_position.y, grid_position.z)])
+            row = 0
+        self._arrays = arrays
+        self._row = row
+        self.id = f"{grid_position.x}-{grid_position.y}-{grid_position.z}"
+        self._vertices = None
+        self._vertices_version = -1
+
+    @property
+    def grid_position(self) -> GridPosition:
+        """Grid position (read-only copy; assign to move the piece)"""
+        return _GridPositionSnapshot(*(int(v) for v in self._arrays.grid[self._row]))
+
+    @grid_position.setter
+    def grid_position(self, grid_position: GridPosition):
+        self._arrays.grid[self._row] = (grid_position.x, grid_position.y, grid_position.z)
+        self._arrays.versions[self._row] += 1
+
+    @property
+    def position(self) -> Vector3:
+        """World position of the piece center, from its grid position"""
+        return Vector3(*((int(v) - 1) * (CUBE_SIZE + CUBE_GAP)
+                         for v in self._arrays.grid[self._row]))
+
+    @position.setter
+    def position(self, position: Vector3):
+        """Move the piece to the grid cell centered at ``position``
+
+        Pieces only ever sit at cell centers, so any other position raises
+        ValueError rather than being rounded to the nearest cell.
+        """
+        grid = position.to_array() / (CUBE_SIZE + CUBE_GAP) + 1
+        snapped = np.rint(grid)
+        if not (np.allclose(grid, snapped, atol=1e-6)
+                and ((snapped >= 0) & (snapped < GRID_SIZE)).all()):
+            raise ValueError(f"Invalid position: {tuple(position.to_array())} "
+                             "is not the center of a grid cell")
+        self.grid_position = GridPosition(*(int(v) for v in snapped))
+
+    @property
+    def orientation(self) -> int:
+        """ROTATIONS index of the piece"""
+        return int(self._arrays.orientations[self._row])
 
-        # RIGHT face (+X): Only pieces with x=2 get blue sticker on right face
-        colors.append(FACE_COLORS[2] if x == 2 else COLORS['BLACK'])
+    @orientation.setter
+    def orientation(self, orientation: int):
+        self._arrays.orientations[self._row] = orientation
+        self._arrays.versions[self._row] += 1
 
-        # LEFT face (-X): Only pieces with x=0 get green sticker on left face
-        colors.append(FACE_COLORS[3] if x == 0 else COLORS['BLACK'])
+    @property
+    def rotation_matrix(self) -> np.ndarray:
+        """Integer rotation matrix of the piece (read-only)"""
+        return ROTATIONS[self._arrays.orientations[self._row]]
 
-        # UP face (+Y): Only pieces with y=2 get white sticker on top face
-        colors.append(FACE_COLORS[4] if y == 2 else COLORS['BLACK'])
+    @rotation_matrix.setter
+    def rotation_matrix(self, matrix: np.ndarray):
+        self.orientation = rotation_index(matrix)
 
-        # DOWN face (-Y): Only pieces with y=0 get yellow sticker on bottom face
-        colors.append(FACE_COLORS[5] if y == 0 else COLORS['BLACK'])
+    @property
+    def colors(self) -> PieceColors:
+        """Sticker colors in order: right, left, up, down, front, back
+        (a view that writes through to the piece)"""
+        return PieceColors(self._arrays, self._row)
 
-        # FRONT face (+Z): Only pieces with z=2 get red sticker on front face
-        colors.append(FACE_COLORS[0] if z == 2 else COLORS['BLACK'])
+    @colors.setter
+    def colors(self, colors: List[str]):
+        self._arrays.colors[self._row] = [_sticker_index(color) for color in colors]
+        self._arrays.versions[self._row] += 1
 
-        # BACK face (-Z): Only pieces with z=0 get orange sticker on back face
-        colors.append(FACE_COLORS[1] if z == 0 else COLORS['BLACK'])
+    @property
+    def version(self) -> int:
+        """Bumped whenever the piece moves or is written through this view,
+        so derived geometry can be cached"""
+        return int(self._arrays.versions[self._row])
 
-        return colors
+    @version.setter
+    def version(self, version: int):
+        self._arrays.versions[self._row] = version
 
     def get_vertices(self) -> np.ndarray:
-        """Get 8 vertices of this cube piece in 3D space"""
+        """Get 8 vertices of this cube piece in 3D space.
+
+        The array is cached until the piece moves and is read-only.
+        """
+        if self._vertices_version == self.version:
+            return self._vertices
+
         size = CUBE_SIZE / 2
         vertices = np.array([
             [-size, -size, -size],  # 0
@@ -168,26 +428,13 @@ class CubePiece:
         rotated = vertices @ self.rotation_matrix.T
 
         # Apply position
-        pos = self.position.to_array()
-        final_vertices = rotated + pos
+        final_vertices = rotated + self.position.to_array()
+        final_vertices.flags.writeable = False
 
+        self._vertices = final_vertices
+        self._vertices_version = self.version
         return final_vertices
 
-    def update_position_from_world(self):
-        """Update grid position based on world position"""
-        offset = CUBE_SIZE + CUBE_GAP
-
-        grid_x = round((self.position.x / offset) + 1)
-        grid_y = round((self.position.y / offset) + 1)
-        grid_z = round((self.position.z / offset) + 1)
-
-        # Clamp to valid range
-        grid_x = max(0, min(2, grid_x))
-        grid_y = max(0, min(2, grid_y))
-        grid_z = max(0, min(2, grid_z))
-
-        self.grid_position = GridPosition(grid_x, grid_y, grid_z)
-
 
 class RubiksCubeModel:
     """
@@ -196,8 +443,10 @@ class RubiksCubeModel:
     """
 
     def __init__(self):
+        self.arrays: PieceArrays = None
         self.pieces: List[CubePiece] = []
         self.move_history: List[str] = []
+        self.version = 0  # bumped on every state change, for view caches
         self._initialize_cube()
 
     @property
@@ -214,107 +463,91 @@ class RubiksCubeModel:
         """True when every outer face shows a single color.
 
         Works in any orientation: each sticker is mapped to a world face via
-        its piece rotation matrix, then every face must be uniform.
+        its piece orientation, then every face must be uniform.
         """
-        faces: Dict[tuple, set] = {}
-        for piece in self.pieces:
-            for index, local_normal in enumerate(LOCAL_FACE_NORMALS):
-                color = piece.colors[index]
-                if color == COLORS['BLACK']:
-                    continue
-                world_normal = piece.rotation_matrix @ local_normal
-                axis = int(np.argmax(np.abs(world_normal)))
-                sign = 1 if world_normal[axis] > 0 else -1
-                faces.setdefault((axis, sign), set()).add(color)
-        return all(len(colors) == 1 for colors in faces.values())
+        world_face = ORIENTED_FACES[self.arrays.orientations]
+        stickered = self.arrays.colors != NO_STICKER
+        for face in range(len(LOCAL_FACE_NORMALS)):
+            colors = self.arrays.colors[stickered & (world_face == face)]
+            if (colors != colors[:1]).any():
+                return False
+        return True
 
     def _initialize_cube(self):
         """Create all 27 cube pieces in solved state"""
-        self.pieces = []
-        for x in range(GRID_SIZE):
-            for y in range(GRID_SIZE):
-                for z in range(GRID_SIZE):
-                    piece = CubePiece(GridPosition(x, y, z))
-                    self.pieces.append(piece)
+        grid = [(x, y, z) for x in range(GRID_SIZE)
+                for y in range(GRID_SIZE) for z in range(GRID_SIZE)]
+        self.arrays = PieceArrays(grid)
+        self._create_views()
+
+    def _create_views(self):
+        """One CubePiece view per row of the piece arrays"""
+        self.pieces = [CubePiece(GridPosition(x, y, z), self.arrays, row)
+                       for row, (x, y, z) in enumerate(self._home_grid())]
+
+    def _home_grid(self) -> List[tuple]:
+        """Solved grid position of each row, which names its piece"""
+        size = GRID_SIZE
+        return [(row // (size * size), row // size % size, row % size)
+                for row in range(len(self.arrays))]
+
+    def copy(self) -> 'RubiksCubeModel':
+        """Snapshot of the model: a copy of the piece arrays and history"""
+        model = RubiksCubeModel.__new__(RubiksCubeModel)
+        model.arrays = self.arrays.copy()
+        model.move_history = list(self.move_history)
+        model.version = self.version
+        model._create_views()
+        return model
+
+    def __getstate__(self) -> Dict:
+        # The views are rebuilt on unpickling; only the arrays travel
+        state = self.__dict__.copy()
+        del state['pieces']
+        return state
+
+    def __setstate__(self, state: Dict):
+        self.__dict__.update(state)
+        self._create_views()
 
     def get_face_pieces(self, face_name: str) -> List[CubePiece]:
         """Get all pieces that belong to a specific face"""
-        face_pieces = []
-
-        for piece in self.pieces:
-            pos = piece.grid_position
-            should_include = False
-
-            if face_name == 'F' and pos.z == 2:
-                should_include = True
-            elif face_name == 'B' and pos.z == 0:
-                should_include = True
-            elif face_name == 'R' and pos.x == 2:
-                should_include = True
-            elif face_name == 'L' and pos.x == 0:
-                should_include = True
-            elif face_name == 'U' and pos.y == 2:
-                should_include = True
-            elif face_name == 'D' and pos.y == 0:
-                should_include = True
-
-            if should_include:
-                face_pieces.append(piece)
-
-        return face_pieces
-
-    def _get_rotation_axis(self, face_name: str) -> np.ndarray:
-        """Get rotation axis for a face"""
-        axes = {
-            'F': np.array([0, 0, 1]),
-            'B': np.array([0, 0, -1]),
-            'R': np.array([1, 0, 0]),
-            'L': np.array([-1, 0, 0]),
-            'U': np.array([0, 1, 0]),
-            'D': np.array([0, -1, 0])
-        }
-        return axes.get(face_name, np.array([0, 1, 0]))
-
-    def _rotation_matrix_from_axis_angle(self, axis: np.ndarray, angle: float) -> np.ndarray:
-        """Create rotation matrix using Rodrigues' formula"""
-        axis = axis / np.linalg.norm(axis)
-        a = np.cos(angle / 2)
-        b, c, d = -axis * np.sin(angle / 2)
-
-        return np.array([
-            [a*a+b*b-c*c-d*d, 2*(b*c-a*d), 2*(b*d+a*c)],
-            [2*(b*c+a*d), a*a+c*c-b*b-d*d, 2*(c*d-a*b)],
-            [2*(b*d-a*c), 2*(c*d+a*b), a*a+d*d-b*b-c*c]
-        ])
+        if face_name not in FACE_AXES:
+            return []
+        axis, layer = self._face_layer(face_name)
+        rows = np.nonzero(self.arrays.grid[:, axis] == layer)[0]
+        return [self.pieces[row] for row in rows]
+
+    def _face_layer(self, face_name: str) -> tuple:
+        """(grid axis, layer) of the pieces a face turn moves"""
+        normal = FACE_AXES[face_name]
+        axis = int(np.argmax(np.abs(normal)))
+        return axis, GRID_SIZE - 1 if normal[axis] > 0 else 0
 
     def rotate_face(self, face_name: str):
         """Rotate a face 90 degrees clockwise"""
-        if face_name not in FACE_NAMES:
-            raise ValueError(f"Invalid face name: {face_name}")
-
-        face_pieces = self.get_face_pieces(face_name)
-        axis = self._get_rotation_axis(face_name)
-        angle = ROTATION_ANGLE
-
-        rotation_matrix = self._rotation_matrix_from_axis_angle(axis, angle)
+        self.apply_turns([(face_name, 1)])
 
-        for piece in face_pieces:
-            # Update rotation matrix. Stickers are indexed by the piece's
-            # local face, so rotating the geometry carries the colors with
-            # the piece automatically. Re-deriving colors from position here
-            # would be wrong: it would "re-solve" the cube on every turn and
-            # paint stickers onto faces that now point inward.
-            piece.rotation_matrix = rotation_matrix @ piece.rotation_matrix
+    def apply_turns(self, turns):
+        """Apply (face, clockwise quarter turns) pairs as one state change.
 
-            # Update position
-            old_pos = piece.position.to_array()
-            new_pos = rotation_matrix @ old_pos
-            piece.position = Vector3(new_pos[0], new_pos[1], new_pos[2])
-
-            # Update grid position so future face selection works
-            piece.update_position_from_world()
-
-        self.move_history.append(face_name)
+        Every quarter turn is recorded in the history as rotate_face would,
+        but the version is bumped once, so views refresh once per batch.
+        """
+        turns = [(face, quarters % 4) for face, quarters in turns]
+        for face, _ in turns:
+            if face not in FACE_NAMES:
+                raise ValueError(f"Invalid face name: {face}")
+        for face, quarters in turns:
+            if quarters:
+                self._turn_layer(face, quarters)
+                self.move_history.extend([face] * quarters)
+        if turns:
+            self.version += 1
+
+    def _turn_layer(self, face_name: str, quarters: int):
+        """Turn the pieces of a face ``quarters`` times 90 degrees clockwise"""
+        self.arrays.turn(*self._face_layer(face_name), FACE_TURNS[face_name][quarters])
 
     def scramble(self, moves: int = 20):
         """Scramble the cube with random moves.
@@ -322,14 +555,13 @@ class RubiksCubeModel:
         Clears the history first so move_count reflects the scramble length.
         """
         self.move_history = []
-        for _ in range(moves):
-            face = random.choice(FACE_NAMES)
-            self.rotate_face(face)
+        self.apply_turns([(random.choice(FACE_NAMES), 1) for _ in range(moves)])
 
     def reset(self):
         """Reset cube to solved state"""
         self._initialize_cube()
         self.move_history = []
+        self.version += 1
 
     def get_all_pieces(self) -> List[CubePiece]:
         """Get all cube pieces"""
@@ -343,21 +575,18 @@ class RubiksCubeModel:
         scrambles and turns. A solved cube yields six uniform grids.
         """
         result: Dict[str, List[List[str]]] = {}
-        for face, (normal, right, up) in NET_FACE_BASIS.items():
+        colors = self.arrays.colors
+        centers = self.arrays.grid.astype(int) - 1
+        world_face = ORIENTED_FACES[self.arrays.orientations]
+        stickered = colors != NO_STICKER
+        for face, (_, right, up) in NET_FACE_BASIS.items():
             grid = [[COLORS['BLACK']] * GRID_SIZE for _ in range(GRID_SIZE)]
-            for piece in self.pieces:
-                pos = piece.position.to_array()
-                if np.dot(pos, normal) < 0.5:
-                    continue  # not on this outer layer
-                col = int(round(np.dot(pos, right))) + 1
-                row = 1 - int(round(np.dot(pos, up)))
-                for index, local_normal in enumerate(LOCAL_FACE_NORMALS):
-                    color = piece.colors[index]
-                    if color == COLORS['BLACK']:
-                        continue
-                    if np.dot(piece.rotation_matrix @ local_normal, normal) > 0.9:
-                        grid[row][col] = color
-                        break
+            # A sticker pointing out of a face always sits on its outer layer
+            facing = stickered & (world_face == _FACE_DIRECTION[face])
+            for piece, index in zip(*np.nonzero(facing)):
+                col = int(centers[piece] @ right.astype(int)) + 1
+                row = 1 - int(centers[piece] @ up.astype(int))
+                grid[row][col] = STICKER_COLORS[colors[piece, index]]
             result[face] = grid
         return result
 
@@ -381,14 +610,10 @@ class RubiksCubeModel:
 
         Returns True if valid, False otherwise.
         """
-        counts: Dict[str, int] = {}
-        for piece in self.pieces:
-            for color in piece.colors:
-                if color != COLORS['BLACK']:
-                    counts[color] = counts.get(color, 0) + 1
+        counts = np.bincount(self.arrays.colors.ravel(), minlength=len(STICKER_COLORS))
 
-        for face_color in FACE_COLORS:
-            found = counts.get(face_color, 0)
+        for index, face_color in enumerate(FACE_COLORS):
+            found = counts[index]
             if found != 9:
                 print(f"ERROR: color {face_color} appears {found} times "
                       f"(expected 9)")
@@ -411,6 +636,7 @@ class FaceletState:
             face: [list(row) for row in grid]
             for face, grid in facelets.items()
         }
+        self.version = 0  # bumped on every edit, for view caches
 
     def paint(self, face: str, row: int, col: int, color: str) -> bool:
         """Set a single facelet, refusing to exceed nine of any color.
@@ -425,6 +651,7 @@ class FaceletState:
         if self.color_counts().get(color, 0) >= 9:
             return False
         self.faces[face][row][col] = color
+        self.version += 1
         return True
 
     def clear(self):
@@ -433,6 +660,7 @@ class FaceletState:
             for row in grid:
                 for index in range(len(row)):
                     row[index] = COLORS['BLACK']
+        self.version += 1
 
     def color_counts(self) -> Dict[str, int]:
         """Count occurrences of each color across all facelets."""
@@ -0,0 +1,151 @@
+"""
+Rubik's Cube Frame Pacing - frame-rate caps and frame-time statistics
+
+pygame's Clock.tick(60) sleeps in whole milliseconds, so frames land up to
+a millisecond or two late, it knows nothing about vsync, and it reports
+only an average FPS. FramePacer replaces it with three modes:
+
+    vsync     the buffer swap already waits for the display; only measure
+    fixed     wait for each deadline of a fixed rate: sleep for most of the
+              wait, then spin on the high-resolution clock for the last
+              stretch, sized from how late recent sleeps woke up
+    uncapped  never wait (benchmarking)
+
+Deadlines advance by one period per frame, so one slow frame is not
+followed by a burst; after a miss the schedule restarts from the current
+time. The frame times of the last few seconds are kept in a ring buffer
+for percentile queries. No GUI dependencies.
+"""
+
+import time
+from typing import Callable, Dict
+
+import numpy as np
+
+PACING_MODES = ('vsync', 'fixed', 'uncapped')
+DEFAULT_FPS = 60.0
+HISTORY_FRAMES = 600
+
+# Spin tail bounds (seconds): the part of each wait spent busy-waiting
+MIN_SPIN = 0.0002
+MAX_SPIN = 0.002
+
+
+class FramePacer:
+    """
+    Paces a render loop and records how long each frame took
+
+    Call tick() once per frame, after presenting it; it waits as the mode
+    requires and returns the seconds elapsed since the previous tick.
+    """
+
+    def __init__(self, mode: str = 'fixed', target_fps: float = DEFAULT_FPS,
+                 history: int = HISTORY_FRAMES,
+                 clock: Callable[[], float] = time.perf_counter,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Args:
+            mode: One of PACING_MODES
+            target_fps: Frame rate to hold in 'fixed' mode; in 'vsync' mode
+                the display refresh rate, used to count missed frames
+            history: Frame times kept for the statistics
+            clock: Monotonic time source in seconds (injectable for tests)
+            sleep: Sleep function in seconds (injectable for tests)
+        """
+        if mode not in PACING_MODES:
+            raise ValueError(f"Invalid pacing mode: {mode}")
+        if target_fps <= 0:
+            raise ValueError(f"Invalid target FPS: {target_fps}")
+        self.mode = mode
+        self.target_fps = target_fps
+        self.period = 1.0 / target_fps
+        self._clock = clock
+        self._sleep = sleep
+
+        self._times = np.zeros(history)
+        self._count = 0   # frames recorded so far (may exceed history)
+        self.missed = 0   # frames that overran their deadline
+        self._last = None
+        self._deadline = None
+        self._spin = MIN_SPIN
+
+    def restart(self):
+        """Start the frame now, e.g. after sleeping while idle.
+
+        The next tick then measures from here instead of recording the idle
+        gap as one very long (and missed) frame.
+        """
+        self._last = self._clock()
+        self._deadline = self._last + self.period
+
+    def tick(self) -> float:
+        """End a frame: wait as the mode requires, record it, return its duration"""
+        now = self._clock()
+        if self._last is None:
+            self._last = now
+            self._deadline = now + self.period
+            return 0.0
+
+        if self.mode == 'fixed':
+            if now > self._deadline:
+                self.missed += 1
+                self._deadline = now  # restart the schedule rather than catch up
+            else:
+                now = self._wait_until(self._deadline)
+            self._deadline += self.period
+        elif self.mode == 'vsync' and now - self._last > 1.5 * self.period:
+            self.missed += 1  # the swap skipped at least one refresh
+
+        elapsed = now - self._last
+        self._last = now
+        self._times[self._count % len(self._times)] = elapsed
+        self._count += 1
+        return elapsed
+
+    def _wait_until(self, deadline: float) -> float:
+        """Sleep most of the way to the deadline, then spin; returns the time"""
+        now = self._clock()
+        wake = deadline - self._spin
+        if wake > now:
+            self._sleep(wake - now)
+            now = self._clock()
+            # Widen the spin tail when sleeps wake late, let it shrink slowly
+            late = max(0.0, now - wake)
+            self._spin = min(MAX_SPIN, max(MIN_SPIN, 0.9 * self._spin, 1.5 * late))
+        while now < deadline:
+            now = self._clock()
+        return now
+
+    @property
+    def frames(self) -> int:
+        """Frames recorded since creation"""
+        return self._count
+
+    def frame_times(self) -> np.ndarray:
+        """Recorded frame times in seconds, oldest first (at most ``history``)"""
+        size = len(self._times)
+        if self._count <= size:
+            return self._times[:self._count].copy()
+        start = self._count % size
+        return np.concatenate([self._times[start:], self._times[:start]])
+
+    def get_fps(self) -> float:
+        """Average frame rate over the recorded history"""
+        total = float(self.frame_times().sum())
+        return min(self._count, len(self._times)) / total if total > 0 else 0.0
+
+    def stats(self) -> Dict[str, float]:
+        """Frame-time summary: FPS, p50/p95/p99/max in milliseconds, misses"""
+        times = self.frame_times() * 1000.0
+        p50, p95, p99 = np.percentile(times, [50, 95, 99]) if len(times) else (0.0,) * 3
+        return {
+            'mode': self.mode,
+            'target_fps': self.target_fps,
+            'frames': self._count,
+            'fps': self.get_fps(),
+            'p50_ms': float(p50),
+            'p95_ms': float(p95),
+            'p99_ms': float(p99),
+            'max_ms': float(times.max()) if len(times) else 0.0,
+            'missed': self.missed,
+        }
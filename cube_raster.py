@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+Rubik's Cube Software Raster - GPU-free PNG thumbnails of cube states
+
+Renders cube states to RGB images with NumPy alone, for batch export on
+servers without a GPU or display. Two views are available: an isometric
+view of the U, F and R faces built from the same cubie geometry as the
+OpenGL renderer (cube_geometry), and the unfolded net of the HUD.
+
+Only sticker colors differ between states; the geometry does not. Each view
+is therefore rasterized once, with a z-buffer over supersampled convex
+quads, into a table saying which facelet (or which fixed color) covers
+every sample and how brightly it is lit. Box-filtering the samples down to
+pixels is linear, so every output pixel is a fixed weighted sum of the 54
+facelet colors plus a constant. Rendering a batch of states is then a
+single matrix product, and most of the time per image goes into PNG
+compression. No GUI dependencies.
+
+Usage:
+    python cube_raster.py --random 1000 --out thumbs/
+    python cube_raster.py --moves-file scrambles.txt --view net --out nets/
+"""
+
+import argparse
+import os
+import struct
+import time
+import zlib
+from typing import List, Sequence, Tuple
+
+import numpy as np
+
+from cube_geometry import (
+    BASE_SHADE,
+    CUBIE_CORNERS,
+    FACE_VERTEX_INDICES,
+    PALETTE,
+    PLASTIC_SHADE,
+    STICKER_INSET,
+    STICKER_RAISE,
+    core_boxes,
+    hex_to_rgb,
+    sticker_vertices,
+    visible_faces,
+)
+from cube_model import (
+    CUBE_GAP,
+    CUBE_SIZE,
+    FACE_NAMES,
+    GRID_SIZE,
+    LOCAL_FACE_NORMALS,
+    RubiksCubeModel,
+)
+from cube_state import (
+    FACELET_COUNT,
+    FACELET_KEYS,
+    MOVE_PERMUTATIONS,
+    SOLVED_STATE,
+    apply_moves,
+    parse_moves,
+    state_from_facelets,
+    state_from_pieces,
+)
+
+VIEWS = ('iso', 'net')
+BACKGROUND = (0.18, 0.18, 0.20)  # the renderer's clear color
+DEFAULT_SIZE = 128
+DEFAULT_SUPERSAMPLE = 3
+BATCH_SIZE = 64  # states rendered per matrix product
+
+# Lighting of the isometric view, as _setup_lighting: directions in view
+# space (x right, y up, z toward the viewer)
+AMBIENT = 0.35
+LIGHTS = [((5.0, 5.0, 5.0), 0.65), ((-3.0, 2.0, -3.0), 0.2)]
+
+# (face column, face row) of each face in the net, as the HUD draws it
+NET_LAYOUT = {'U': (1, 0), 'L': (0, 1), 'F': (1, 1),
+              'R': (2, 1), 'B': (3, 1), 'D': (1, 2)}
+NET_FACE_GAP = 0.15  # gap between faces, in cells
+
+# Sticker colors by state value (FACE_COLORS order, then BLANK)
+PALETTE_RGB = np.array([hex_to_rgb(color) for color in PALETTE], dtype=np.float32)
+
+# Screen axes of the isometric view: looking at the U-F-R corner, y up
+_VIEW_RIGHT = np.array([1.0, 0.0, -1.0]) / np.sqrt(2)
+_VIEW_BACK = np.array([1.0, 1.0, 1.0]) / np.sqrt(3)
+_VIEW_UP = np.cross(_VIEW_BACK, _VIEW_RIGHT)
+_VIEW = np.stack([_VIEW_RIGHT, _VIEW_UP, _VIEW_BACK])
+
+
+class _Scene:
+    """Polygons to rasterize: screen-space quads and what covers each"""
+
+    def __init__(self):
+        self.quads: List[np.ndarray] = []   # (4, 3): x, y in pixels, depth
+        self.facelets: List[int] = []       # facelet index, or -1 for fixed color
+        self.colors: List[Tuple] = []       # RGB of fixed-color quads
+        self.shades: List[float] = []       # brightness factor
+
+    def add(self, quad: np.ndarray, facelet: int = -1, color=(0.0, 0.0, 0.0),
+            shade: float = 1.0):
+        self.quads.append(np.asarray(quad, dtype=float))
+        self.facelets.append(facelet)
+        self.colors.append(tuple(color))
+        self.shades.append(shade)
+
+
+def _lighting(view_normal: np.ndarray) -> float:
+    """Ambient plus diffuse brightness of a face with the given view-space normal"""
+    shade = AMBIENT
+    for direction, diffuse in LIGHTS:
+        light = np.asarray(direction) / np.linalg.norm(direction)
+        shade += diffuse * max(0.0, float(view_normal @ light))
+    return shade
+
+
+def _iso_scene(width: int, height: int) -> _Scene:
+    """The solved cube's outward faces and core, projected orthographically"""
+    model = RubiksCubeModel()
+    visible = visible_faces(model.pieces)
+    key_index = {tuple(key): index for index, key in enumerate(FACELET_KEYS)}
+
+    # Fit the cube's silhouette into the image with a small margin
+    half = 1.5 * CUBE_SIZE + CUBE_GAP + STICKER_RAISE
+    corners = np.array([[x, y, z] for x in (-half, half)
+                        for y in (-half, half) for z in (-half, half)]) @ _VIEW.T
+    scale = 0.94 * min(width / (2 * np.abs(corners[:, 0]).max()),
+                       height / (2 * np.abs(corners[:, 1]).max()))
+
+    def project(points: np.ndarray) -> np.ndarray:
+        view = points @ _VIEW.T
+        return np.stack([width / 2 + view[:, 0] * scale,
+                         height / 2 - view[:, 1] * scale,
+                         view[:, 2]], axis=1)
+
+    scene = _Scene()
+    plastic = (PLASTIC_SHADE,) * 3
+    for box, _ in core_boxes():
+        for indices, normal in zip(FACE_VERTEX_INDICES, LOCAL_FACE_NORMALS):
+            if normal @ _VIEW_BACK > 0:
+                scene.add(project(box[indices]), color=plastic,
+                          shade=_lighting(_VIEW @ normal))
+
+    for piece, faces in zip(model.pieces, visible):
+        center = piece.position.to_array()
+        grid = np.array([piece.grid_position.x, piece.grid_position.y,
+                         piece.grid_position.z]) - 1
+        for face, (indices, normal) in enumerate(zip(FACE_VERTEX_INDICES, LOCAL_FACE_NORMALS)):
+            if not faces[face] or normal @ _VIEW_BACK <= 0:
+                continue
+            shade = _lighting(_VIEW @ normal)
+            base = center + CUBIE_CORNERS[indices]
+            scene.add(project(base), color=(BASE_SHADE,) * 3, shade=shade)
+            facelet = key_index[tuple(int(v) for v in 2 * grid + normal)]
+            scene.add(project(sticker_vertices(base, normal)), facelet=facelet, shade=shade)
+    return scene
+
+
+def _net_scene(width: int, height: int) -> _Scene:
+    """The six faces unfolded into a cross, flat and unlit"""
+    cell = min(width / (4 * GRID_SIZE + 3 * NET_FACE_GAP + 1),
+               height / (3 * GRID_SIZE + 2 * NET_FACE_GAP + 1))
+    step = (GRID_SIZE + NET_FACE_GAP) * cell
+    left = (width - (4 * GRID_SIZE + 3 * NET_FACE_GAP) * cell) / 2
+    top = (height - (3 * GRID_SIZE + 2 * NET_FACE_GAP) * cell) / 2
+
+    def square(x: float, y: float, size: float, depth: float) -> np.ndarray:
+        return np.array([[x, y, depth], [x + size, y, depth],
+                         [x + size, y + size, depth], [x, y + size, depth]])
+
+    scene = _Scene()
+    inset = (1 - STICKER_INSET) / 2 * cell
+    for face_index, face in enumerate(FACE_NAMES):
+        column, row = NET_LAYOUT[face]
+        fx, fy = left + column * step, top + row * step
+        scene.add(square(fx, fy, GRID_SIZE * cell, 0.0), color=(BASE_SHADE,) * 3)
+        for r in range(GRID_SIZE):
+            for c in range(GRID_SIZE):
+                scene.add(square(fx + c * cell + inset, fy + r * cell + inset,
+                                 cell - 2 * inset, 1.0),
+                          facelet=face_index * 9 + r * 3 + c)
+    return scene
+
+
+def rasterize(quads: Sequence[np.ndarray], width: int, height: int) -> np.ndarray:
+    """Z-buffered coverage of convex planar quads on a pixel grid.
+
+    Args:
+        quads: (4, 3) arrays of screen x, y (pixels, y down) and depth;
+            larger depth is nearer
+        width, height: Grid size; samples are taken at pixel centers
+
+    Returns:
+        (height, width) int array: index of the nearest quad, or -1
+    """
+    ids = np.full((height, width), -1, dtype=np.int32)
+    depth = np.full((height, width), -np.inf)
+    for index, quad in enumerate(quads):
+        x, y, z = quad[:, 0], quad[:, 1], quad[:, 2]
+        x0, x1 = max(0, int(np.floor(x.min()))), min(width, int(np.ceil(x.max())) + 1)
+        y0, y1 = max(0, int(np.floor(y.min()))), min(height, int(np.ceil(y.max())) + 1)
+        if x0 >= x1 or y0 >= y1:
+            continue
+        px = np.arange(x0, x1) + 0.5
+        py = (np.arange(y0, y1) + 0.5)[:, None]
+
+        # Inside when every edge function has the winding's sign
+        area = np.sum(x * np.roll(y, -1) - np.roll(x, -1) * y)
+        if abs(area) < 1e-9:
+            continue
+        inside = np.ones((y1 - y0, x1 - x0), dtype=bool)
+        for i in range(4):
+            ax, ay, bx, by = x[i], y[i], x[(i + 1) % 4], y[(i + 1) % 4]
+            edge = (bx - ax) * (py - ay) - (by - ay) * (px - ax)
+            inside &= edge * area >= 0
+
+        # Depth is linear in screen space for a planar quad (orthographic)
+        a, b, c = np.linalg.lstsq(np.stack([x, y, np.ones(4)], axis=1), z, rcond=None)[0]
+        sample_depth = a * px + b * py + c
+        region = depth[y0:y1, x0:x1]
+        nearer = inside & (sample_depth > region)
+        region[nearer] = np.broadcast_to(sample_depth, nearer.shape)[nearer]
+        ids[y0:y1, x0:x1][nearer] = index
+    return ids
+
+
+class SoftwareRenderer:
+    """
+    Renders batches of cube states to RGB images on the CPU
+
+    The view is rasterized once in the constructor; render() then costs one
+    matrix product per batch.
+    """
+
+    def __init__(self, view: str = 'iso', size: int = DEFAULT_SIZE,
+                 supersample: int = DEFAULT_SUPERSAMPLE, background=BACKGROUND):
+        """
+        Args:
+            view: 'iso' (U, F and R faces in 3D) or 'net' (unfolded cross)
+            size: Image width in pixels (the net is 3/4 as tall as wide)
+            supersample: Samples per pixel along each axis, for antialiasing
+            background: RGB floats (0-1) behind the cube
+        """
+        if view not in VIEWS:
+            raise ValueError(f"Invalid view: {view}")
+        self.view = view
+        self.width = size
+        self.height = size if view == 'iso' else size * 3 // 4
+        self.supersample = supersample
+
+        sw, sh = self.width * supersample, self.height * supersample
+        scene = (_iso_scene if view == 'iso' else _net_scene)(sw, sh)
+        ids = rasterize(scene.quads, sw, sh)
+
+        # Per sample: the facelet it shows (or FACELET_COUNT for a fixed
+        # color), its brightness, and its fixed color
+        facelets = np.append(scene.facelets, -1)[ids]
+        shades = np.append(scene.shades, 1.0)[ids]
+        fixed = np.append(np.array(scene.colors, dtype=float).reshape(-1, 3),
+                          [background], axis=0)[ids] * shades[..., None]
+        fixed[facelets >= 0] = 0.0
+        facelets = np.where(facelets >= 0, facelets, FACELET_COUNT)
+
+        # Box filter: every sample adds shade / samples to its pixel's weight
+        pixel = ((np.arange(sh) // supersample)[:, None] * self.width
+                 + np.arange(sw)[None, :] // supersample).ravel()
+        samples = supersample * supersample
+        pixels = self.width * self.height
+        weights = np.bincount(pixel * (FACELET_COUNT + 1) + facelets.ravel(),
+                              weights=shades.ravel() / samples,
+                              minlength=pixels * (FACELET_COUNT + 1))
+        self._weights = weights.reshape(pixels, FACELET_COUNT + 1)[:, :FACELET_COUNT] \
+            .astype(np.float32)
+        self._constant = np.stack([
+            np.bincount(pixel, weights=fixed[..., channel].ravel() / samples,
+                        minlength=pixels)
+            for channel in range(3)], axis=1).astype(np.float32)
+
+    def render(self, cubes) -> np.ndarray:
+        """
+        Render one or many cubes
+
+        Args:
+            cubes: Compact state(s) (54,) or (N, 54), or a model, a list of
+                pieces, a get_facelets() grid, or a sequence of those
+
+        Returns:
+            (N, height, width, 3) uint8 RGB images
+        """
+        states = as_states(cubes)
+        images = np.empty((len(states), self.height, self.width, 3), dtype=np.uint8)
+        for start in range(0, len(states), BATCH_SIZE):
+            batch = states[start:start + BATCH_SIZE]
+            colors = PALETTE_RGB[batch]                               # (n, 54, 3)
+            columns = colors.transpose(1, 0, 2).reshape(FACELET_COUNT, -1)
+            pixels = (self._weights @ columns).reshape(-1, len(batch), 3)
+            pixels += self._constant[:, None, :]
+            images[start:start + len(batch)] = np.clip(
+                pixels * 255.0 + 0.5, 0, 255).astype(np.uint8) \
+                .transpose(1, 0, 2).reshape(len(batch), self.height, self.width, 3)
+        return images
+
+    def export(self, cubes, directory: str, prefix: str = 'cube',
+               compression: int = 6) -> List[str]:
+        """Render cubes and write them as numbered PNG files; returns the paths"""
+        os.makedirs(directory, exist_ok=True)
+        states = as_states(cubes)
+        paths = []
+        for start in range(0, len(states), BATCH_SIZE):
+            for offset, image in enumerate(self.render(states[start:start + BATCH_SIZE])):
+                path = os.path.join(directory, f'{prefix}_{start + offset:05d}.png')
+                write_png(path, image, compression)
+                paths.append(path)
+        return paths
+
+
+def as_states(cubes) -> np.ndarray:
+    """Normalize the inputs render() accepts to an (N, 54) uint8 array"""
+    if isinstance(cubes, np.ndarray):
+        return np.atleast_2d(cubes).astype(np.uint8, copy=False)
+    if _is_single(cubes):
+        cubes = [cubes]
+    return np.stack([_state_of(cube) for cube in cubes]) if len(cubes) else \
+        np.empty((0, FACELET_COUNT), dtype=np.uint8)
+
+
+def _is_single(cube) -> bool:
+    """True for one cube, as opposed to a sequence of them"""
+    if isinstance(cube, (RubiksCubeModel, dict)):
+        return True
+    # A list of pieces is one cube; pieces have a rotation matrix
+    return len(cube) > 0 and hasattr(cube[0], 'rotation_matrix')
+
+
+def _state_of(cube) -> np.ndarray:
+    if isinstance(cube, RubiksCubeModel):
+        return state_from_pieces(cube.pieces)
+    if isinstance(cube, dict):
+        return state_from_facelets(cube)
+    if isinstance(cube, np.ndarray):
+        return cube.astype(np.uint8, copy=False)
+    return state_from_pieces(cube)
+
+
+def encode_png(image: np.ndarray, compression: int = 6) -> bytes:
+    """Encode an (H, W, 3) uint8 image as an 8-bit RGB PNG"""
+    height, width, _ = image.shape
+    rows = np.zeros((height, 1 + width * 3), dtype=np.uint8)  # filter byte 0
+    rows[:, 1:] = image.reshape(height, -1)
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return (struct.pack('>I', len(data)) + kind + data
+                + struct.pack('>I', zlib.crc32(kind + data) & 0xFFFFFFFF))
+
+    header = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    return (b'\x89PNG\r\n\x1a\n' + chunk(b'IHDR', header)
+            + chunk(b'IDAT', zlib.compress(rows.tobytes(), compression))
+            + chunk(b'IEND', b''))
+
+
+def write_png(path: str, image: np.ndarray, compression: int = 6):
+    """Write an (H, W, 3) uint8 image to a PNG file"""
+    with open(path, 'wb') as file:
+        file.write(encode_png(image, compression))
+
+
+def random_states(count: int, depth: int = 20, seed: int = None) -> np.ndarray:
+    """``count`` states scrambled with ``depth`` random face turns each"""
+    rng = np.random.default_rng(seed)
+    states = np.tile(SOLVED_STATE, (count, 1))
+    for move in rng.integers(len(MOVE_PERMUTATIONS), size=(depth, count)):
+        states = np.take_along_axis(states, MOVE_PERMUTATIONS[move], axis=1)
+    return states
+
+
+def main():
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Render cube states to PNG without a GPU")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument('--random', type=int, metavar='N', help="render N random scrambles")
+    source.add_argument('--moves-file', help="file with one move sequence per line")
+    parser.add_argument('--out', required=True, help="output directory")
+    parser.add_argument('--view', choices=VIEWS, default='iso')
+    parser.add_argument('--size', type=int, default=DEFAULT_SIZE, help="image width in pixels")
+    parser.add_argument('--supersample', type=int, default=DEFAULT_SUPERSAMPLE)
+    parser.add_argument('--seed', type=int, help="random seed for --random")
+    args = parser.parse_args()
+
+    if args.random is not None:
+        states = random_states(args.random, seed=args.seed)
+    else:
+        with open(args.moves_file) as file:
+            states = np.stack([apply_moves(SOLVED_STATE, parse_moves(line))
+                               for line in file if line.strip()])
+
+    started = time.perf_counter()
+    renderer = SoftwareRenderer(args.view, args.size, args.supersample)
+    prepared = time.perf_counter()
+    paths = renderer.export(states, args.out)
+    elapsed = time.perf_counter() - prepared
+    print(f"Rasterized the {args.view} view in {prepared - started:.2f}s")
+    print(f"Wrote {len(paths)} images to {args.out} in {elapsed:.2f}s "
+          f"({len(paths) / max(elapsed, 1e-9):.0f} images/s)")
+
+
+if __name__ == "__main__":
+    main()
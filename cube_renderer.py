@@ -3,13 +3,159 @@ Rubik's Cube OpenGL Renderer - High-performance 3D rendering
 Uses hardware-accelerated OpenGL for smooth, efficient visualization
 """
 
+import ctypes
+
 import numpy as np
-from typing import List, Tuple
+from typing import List, Optional, Tuple
 from OpenGL.GL import *
 from OpenGL.GLU import *
+# Buffer-offset pointers need none of PyOpenGL's client-array bookkeeping,
+# which fails on contexts it cannot identify (EGL, offscreen)
+from OpenGL.raw.GL.VERSION import GL_1_1 as raw_gl
+from OpenGL.raw.GL.VERSION import GL_2_0 as raw_gl2
+from OpenGL.GL.shaders import compileShader
 import pygame
 from pygame.locals import *
-from cube_model import CubePiece, COLORS
+from cube_model import CUBE_SIZE, CubePiece, COLORS
+from cube_raster import as_states
+from cube_startup import FontCache, startup_profile
+from cube_text import TextCache
+from cube_wall import WallLayout, detail_instances, flat_quads
+from cube_geometry import (
+    BASE_SHADE,
+    CORE_COLORS,
+    LOD_TIERS,
+    OUTLINE_SHADE,
+    PALETTE,
+    PLASTIC_EDGE_SHADE,
+    PLASTIC_INDEX,
+    PLASTIC_LINE_WIDTH,
+    PLASTIC_SHADE,
+    STICKER_LINE_WIDTH,
+    PieceGeometry,
+    camera_ray,
+    core_matrices,
+    cubie_colors,
+    cubie_indices,
+    cubie_mesh,
+    cubie_vertex_info,
+    hex_to_rgb,
+    instance_groups,
+    instance_indices,
+    lod_tier,
+    pick_facelet,
+    projected_size,
+    rotation_matrix,
+    visible_faces,
+)
+
+# Instanced cubie shaders. GLSL 1.20 keeps the fixed-function built-ins, so
+# the shader reads the same matrices and _setup_lighting lights and
+# evaluates the fixed-function lighting equation per vertex; the result
+# matches the buffered and immediate-mode paths.
+CUBIE_VERTEX_SHADER = """
+#version 120
+attribute vec3 a_position;
+attribute vec3 a_normal;
+attribute vec2 a_info;          // local face, vertex group
+attribute vec4 a_model0;        // per instance: model matrix columns
+attribute vec4 a_model1;
+attribute vec4 a_model2;
+attribute vec4 a_model3;
+attribute vec3 a_colors_low;    // per instance: palette index of faces 0-2
+attribute vec3 a_colors_high;   // ... and of faces 3-5
+
+uniform vec3 u_palette[%(palette_size)d];
+uniform bool u_lit;
+
+varying vec4 v_color;
+
+vec4 light(vec3 normal, vec3 position, vec4 color)
+{
+    vec4 result = gl_FrontMaterial.emission + gl_LightModel.ambient * color;
+    for (int i = 0; i < 2; i++) {  // LIGHT0 and LIGHT1
+        vec3 to_light = normalize(gl_LightSource[i].position.xyz
+                                  - position * gl_LightSource[i].position.w);
+        float diffuse = dot(normal, to_light);
+        result += gl_LightSource[i].ambient * color;
+        if (diffuse > 0.0) {
+            vec3 half_vector = normalize(to_light + vec3(0.0, 0.0, 1.0));
+            float specular = pow(max(dot(normal, half_vector), 0.0),
+                                 gl_FrontMaterial.shininess);
+            result += diffuse * gl_LightSource[i].diffuse * color
+                      + specular * gl_LightSource[i].specular * gl_FrontMaterial.specular;
+        }
+    }
+    return clamp(vec4(result.rgb, color.a), 0.0, 1.0);
+}
+
+void main()
+{
+    // Instances are drawn per (local face, sticker) group, with index
+    // lists holding only the parts such a face has (see instance_groups)
+    int group = int(a_info.y + 0.5);
+    int index = int(dot(a_colors_low, vec3(equal(vec3(a_info.x), vec3(0.0, 1.0, 2.0))))
+                    + dot(a_colors_high, vec3(equal(vec3(a_info.x), vec3(3.0, 4.0, 5.0))))
+                    + 0.5);
+    bool sticker = index < %(plastic_index)d;
+
+    vec3 color;
+    if (group == 0) {
+        color = vec3(sticker ? %(base_shade)f : %(plastic_shade)f);
+    } else if (group == 1) {
+        color = u_palette[index];
+    } else if (group == 2) {
+        color = vec3(%(outline_shade)f);
+    } else {
+        color = vec3(%(plastic_edge_shade)f);
+    }
+
+    mat4 model = mat4(a_model0, a_model1, a_model2, a_model3);
+    vec4 position = gl_ModelViewMatrix * (model * vec4(a_position, 1.0));
+    vec3 normal = normalize(mat3(gl_ModelViewMatrix) * (mat3(model) * a_normal));
+    v_color = u_lit ? light(normal, position.xyz, vec4(color, 1.0)) : vec4(color, 1.0);
+    gl_Position = gl_ProjectionMatrix * position;
+}
+""" % {
+    'palette_size': len(PALETTE),
+    'plastic_index': PLASTIC_INDEX,
+    'base_shade': BASE_SHADE,
+    'plastic_shade': PLASTIC_SHADE,
+    'outline_shade': OUTLINE_SHADE,
+    'plastic_edge_shade': PLASTIC_EDGE_SHADE,
+}
+
+CUBIE_FRAGMENT_SHADER = """
+#version 120
+varying vec4 v_color;
+
+void main()
+{
+    gl_FragColor = v_color;
+}
+"""
+
+# Attribute locations; per-instance data is 16 matrix floats + 6 indices
+_MESH_ATTRIBUTES = {'a_position': 0, 'a_normal': 1, 'a_info': 2}
+_INSTANCE_ATTRIBUTES = {'a_model0': 3, 'a_model1': 4, 'a_model2': 5, 'a_model3': 6,
+                        'a_colors_low': 7, 'a_colors_high': 8}
+_INSTANCE_FLOATS = 22
+
+# The core is bare plastic inside the cube: never outlined, and the flat
+# tier (which leaves out bare plastic) would drop it altogether
+_CORE_TIER = 'plain'
+
+
+def _address(array: np.ndarray) -> ctypes.c_void_p:
+    """Pointer to a contiguous array, for the raw client-array calls"""
+    return array.ctypes.data_as(ctypes.c_void_p)
+
+
+def _is_cube_collection(cubes) -> bool:
+    """True for several cubes to tile, False for the pieces of one cube"""
+    if isinstance(cubes, np.ndarray):
+        return True
+    return len(cubes) > 0 and not isinstance(cubes[0], CubePiece)
 
 
 class OpenGLRenderer:
@@ -18,18 +164,26 @@ class OpenGLRenderer:
     Hardware-accelerated 3D rendering with proper lighting and shading
     """
 
-    def __init__(self, width: int = 1200, height: int = 800):
+    def __init__(self, width: int = 1200, height: int = 800, vsync: bool = False,
+                 font_cache: Optional[str] = None):
         """
         Initialize OpenGL renderer
 
         Args:
             width: Window width
             height: Window height
+            vsync: Ask for buffer swaps synced to the display refresh;
+                left False afterwards if the driver refuses
+            font_cache: Font lookup cache file (see cube_startup.FontCache)
         """
         self.width = width
         self.height = height
+        self.vsync = vsync
         self.screen = None
 
+        # HUD fonts are opened on first use (see the font properties)
+        self.fonts = FontCache(font_cache)
+
         # Camera control
         self.camera_distance = 8.0
 
@@ -41,37 +195,92 @@ class OpenGLRenderer:
         self.mouse_down = False
         self.last_mouse_pos = None
 
+        profile = startup_profile()
         self._initialize_pygame()
+        profile.mark('window')
         self._initialize_opengl()
         self._setup_lighting()
+        profile.mark('gl state')
+        self._initialize_buffers()
+        self._initialize_instancing()
+        profile.mark('buffers, shaders')
 
     def _initialize_pygame(self):
         """Initialize Pygame window"""
-        pygame.init()
-        self.screen = pygame.display.set_mode(
-            (self.width, self.height),
-            DOUBLEBUF | OPENGL | RESIZABLE
-        )
+        # Only the modules the viewer uses: pygame.init() would also open
+        # the audio device (mixer) and scan for joysticks
+        pygame.display.init()
+        pygame.font.init()
+        flags = DOUBLEBUF | OPENGL | RESIZABLE
+        try:
+            self.screen = pygame.display.set_mode((self.width, self.height), flags,
+                                                  vsync=int(self.vsync))
+        except pygame.error as error:
+            print(f"VSync unavailable, using a timer instead: {error}")
+            self.vsync = False
+            self.screen = pygame.display.set_mode((self.width, self.height), flags)
         pygame.display.set_caption("Rubik's Cube 3D - Hardware Accelerated | 60+ FPS")
 
-        # Initialize fonts for UI text
-        pygame.font.init()
-        self.title_font = pygame.font.SysFont('Arial', 20, bold=True)
-        self.font = pygame.font.SysFont('Arial', 16, bold=True)
-        self.small_font = pygame.font.SysFont('Arial', 14)
+    @property
+    def title_font(self):
+        return self.fonts.font('Arial', 20, bold=True)
+
+    @property
+    def font(self):
+        return self.fonts.font('Arial', 16, bold=True)
+
+    @property
+    def small_font(self):
+        return self.fonts.font('Arial', 14)
 
     def _initialize_opengl(self):
         """Initialize OpenGL settings"""
-        # Hit-test rectangles for the editable net and palette, refreshed
-        # every frame by the overlay draw and read by the controller.
-        self._net_cell_rects = {}
-        self._palette_rects = {}
+        # Where the editable net and palette were last drawn (top-left
+        # corners), so hit tests are grid arithmetic; and the viewport the
+        # cube was drawn in, for picking stickers by ray casting
+        self._net_origin = None
+        self._palette_origin = None
+        self._palette_colors = []
+        self._cube_viewport = (0, 0, self.width, self.height)
+
+        # Multi-cube wall: states and layout cached, scrolled vertically
+        self._wall_active = False
+        self._wall_key = None
+        self._wall_states = None
+        self._wall_layout = None
+        self._wall_layout_key = None
+        self.wall_scroll = 0.0
+        self.wall_tier = None
+
+        # Level of detail of the last frame, from the projected cubie size;
+        # lod_override pins one of LOD_TIERS instead
+        self.lod_tier = 'full'
+        self.lod_override = None
+
+        # Visible faces per piece id, cached per (model version, turn axis)
+        self._visible = {}
+        self._visible_key = None
+
+        # World-space render arrays per piece id, rebuilt only when the piece
+        # moves: id -> (piece, version, colors, faces, PieceGeometry)
+        self._geometry = {}
+
+        # HUD labels are rasterized once and kept as textures
+        self.text_cache = TextCache()
+
+        # The info panel is rendered into a texture and redrawn only when
+        # its inputs change (see _draw_cached_panel)
+        self._panel_key = None
+        self._panel_fbo = None
+        self._panel_texture = None
+        self._panel_size = (0, 0)
+        self.use_panel_cache = bool(glGenFramebuffers)
 
         # Enable depth testing
         glEnable(GL_DEPTH_TEST)
         glDepthFunc(GL_LESS)
 
-        # Enable face culling. The piece faces in _draw_cube_piece are wound
+        # Enable face culling. The piece faces (cube_geometry) are wound
         # so their geometric normal points inward, i.e. clockwise when viewed
         # from outside the cube. Front faces must therefore be GL_CW; with
         # GL_CCW the outer colored stickers are treated as back faces and
@@ -107,6 +316,8 @@ class OpenGLRenderer:
         glEnable(GL_LIGHT1)  # Add second light for better illumination
         glEnable(GL_COLOR_MATERIAL)
         glColorMaterial(GL_FRONT_AND_BACK, GL_AMBIENT_AND_DIFFUSE)
+        # The core's model matrices scale unevenly, which stretches normals
+        glEnable(GL_NORMALIZE)
 
         # Main light (above and to the right)
         light0_position = [5.0, 5.0, 5.0, 1.0]
@@ -141,141 +352,388 @@ class OpenGLRenderer:
 
     def _hex_to_rgb(self, hex_color: str) -> Tuple[float, float, float]:
         """Convert hex color to RGB float values (0-1)"""
-        hex_color = hex_color.lstrip('#')
-        r = int(hex_color[0:2], 16) / 255.0
-        g = int(hex_color[2:4], 16) / 255.0
-        b = int(hex_color[4:6], 16) / 255.0
-        return (r, g, b)
+        return hex_to_rgb(hex_color)
+
+    def _initialize_buffers(self):
+        """Upload the shared cubie mesh once; fall back to immediate mode on failure"""
+        # Per-color-scheme buffers: (color VBO, quad EBO, sticker line EBO,
+        # plastic line EBO, index counts), keyed by the piece colors and its
+        # visible faces. Neither changes while a piece turns, so these are
+        # built once per distinct piece appearance.
+        self._piece_buffers = {}
+        # The local mesh with core colors, for the core on client arrays
+        positions, normals = cubie_mesh()
+        self._core_arrays = (positions, normals, cubie_colors(CORE_COLORS))
+        try:
+            self._position_vbo, self._normal_vbo = glGenBuffers(2)
+            for vbo, data in ((self._position_vbo, positions), (self._normal_vbo, normals)):
+                glBindBuffer(GL_ARRAY_BUFFER, vbo)
+                glBufferData(GL_ARRAY_BUFFER, data.nbytes, data, GL_STATIC_DRAW)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+            self.use_buffers = True
+        except Exception as error:  # no buffer objects (GL < 1.5 or missing driver entry)
+            print(f"Vertex buffers unavailable, using immediate mode: {error}")
+            self.use_buffers = False
+
+    def _initialize_instancing(self):
+        """Build the instanced shader path; needs shaders and instanced arrays"""
+        self.use_instancing = False
+        if not self.use_buffers:
+            return
+        try:
+            if not (bool(glDrawElementsInstanced) and bool(glVertexAttribDivisor)):
+                raise RuntimeError("instanced drawing not supported")
+            program = glCreateProgram()
+            for source, kind in ((CUBIE_VERTEX_SHADER, GL_VERTEX_SHADER),
+                                 (CUBIE_FRAGMENT_SHADER, GL_FRAGMENT_SHADER)):
+                glAttachShader(program, compileShader(source, kind))
+            for name, location in {**_MESH_ATTRIBUTES, **_INSTANCE_ATTRIBUTES}.items():
+                glBindAttribLocation(program, location, name)
+            glLinkProgram(program)
+            if not glGetProgramiv(program, GL_LINK_STATUS):
+                raise RuntimeError(glGetProgramInfoLog(program))
+
+            glUseProgram(program)
+            palette = np.array([hex_to_rgb(color) for color in PALETTE], dtype=np.float32)
+            glUniform3fv(glGetUniformLocation(program, 'u_palette'), len(palette), palette)
+            self._lit_uniform = glGetUniformLocation(program, 'u_lit')
+            glUseProgram(0)
+
+            info = cubie_vertex_info()
+            self._info_vbo, self._instance_vbo = glGenBuffers(2)
+            glBindBuffer(GL_ARRAY_BUFFER, self._info_vbo)
+            glBufferData(GL_ARRAY_BUFFER, info.nbytes, info, GL_STATIC_DRAW)
+            glBindBuffer(GL_ARRAY_BUFFER, 0)
+
+            # Index buffers per level of detail and instance group:
+            # tier -> (face, sticker) -> (triangle EBO, count, line EBO, count)
+            self._instance_ebos = {}
+            for tier in LOD_TIERS:
+                groups = {}
+                for group, index_lists in instance_indices(tier).items():
+                    entry = []
+                    for indices in index_lists:
+                        ebo = 0
+                        if len(indices):
+                            ebo = glGenBuffers(1)
+                            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, ebo)
+                            glBufferData(GL_ELEMENT_ARRAY_BUFFER, indices.nbytes, indices,
+                                         GL_STATIC_DRAW)
+                        entry += [ebo, len(indices)]
+                    groups[group] = tuple(entry)
+                self._instance_ebos[tier] = groups
+            # The core's index list: the bare base of all six faces at once
+            core = np.concatenate([triangles for (face, sticker), (triangles, _)
+                                   in instance_indices(_CORE_TIER).items() if not sticker])
+            self._core_ebo = glGenBuffers(1)
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self._core_ebo)
+            glBufferData(GL_ELEMENT_ARRAY_BUFFER, core.nbytes, core, GL_STATIC_DRAW)
+            self._core_count = len(core)
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+
+            self._program = program
+            self.use_instancing = True
+        except Exception as error:  # no GLSL/instancing (old or software GL)
+            print(f"Instanced shaders unavailable, using vertex buffers: {error}")
+
+    def _instance_data(self, pieces: List[CubePiece], visible: dict,
+                       turn: dict = None) -> np.ndarray:
+        """Per-piece model matrix (column-major) and palette indices"""
+        turning = turn['pieces'] if turn else ()
+        spin = rotation_matrix(turn['axis'], -turn['angle']) if turn else None
+        data = np.empty((len(pieces), _INSTANCE_FLOATS), dtype=np.float32)
+        for row, piece in zip(data, pieces):
+            geometry = self._geometry_for(piece, visible[piece.id])
+            if piece.id in turning:
+                row[:16] = (spin @ geometry.matrix).T.ravel()  # clockwise about the normal
+            else:
+                row[:16] = geometry.gl_matrix.ravel()
+            row[16:] = geometry.palette
+        return data
+
+    def _core_instances(self, turn: dict = None) -> np.ndarray:
+        """Instance rows of the core boxes, laid out like _instance_data"""
+        cores = core_matrices(turn['axis'] if turn else None)
+        data = np.empty((len(cores), _INSTANCE_FLOATS), dtype=np.float32)
+        for row, (matrix, turning) in zip(data, cores):
+            if turning:
+                matrix = rotation_matrix(turn['axis'], -turn['angle']) @ matrix
+            row[:16] = matrix.T.ravel()
+            row[16:] = PLASTIC_INDEX
+        return data
+
+    def _draw_pieces_instanced(self, pieces: List[CubePiece], visible: dict,
+                               turn: dict = None, tier: str = 'full'):
+        """Draw every piece (including the turning layer) and the core
+        instanced, grouped by face"""
+        self._draw_instances(self._instance_data(pieces, visible, turn), tier,
+                             self._core_instances(turn))
+
+    def _draw_instances(self, data: np.ndarray, tier: str = 'full',
+                        core: Optional[np.ndarray] = None):
+        """Draw cubie instances, one row of _INSTANCE_FLOATS per instance.
+
+        Rows are regrouped by the local faces they show (instance_groups),
+        each group drawn with the index lists of that one face, so hidden
+        faces and parts a face lacks are never submitted. ``core`` rows
+        (see _core_instances) follow in the same buffer and are drawn in
+        one more call, as bare plastic without outlines.
+        """
+        groups = instance_groups(data[:, 16:])
+        if not groups and core is None:
+            return
+        glUseProgram(self._program)
+
+        for vbo, (name, location), size in zip(
+                (self._position_vbo, self._normal_vbo, self._info_vbo),
+                _MESH_ATTRIBUTES.items(), (3, 3, 2)):
+            glBindBuffer(GL_ARRAY_BUFFER, vbo)
+            glEnableVertexAttribArray(location)
+            raw_gl2.glVertexAttribPointer(location, size, GL_FLOAT, GL_FALSE, 0, None)
+
+        order = [rows for _, rows in groups]
+        grouped = data[np.concatenate(order)] if order else data[:0]
+        if core is not None:
+            grouped = np.concatenate([grouped, core])
+        grouped = np.ascontiguousarray(grouped)
+        glBindBuffer(GL_ARRAY_BUFFER, self._instance_vbo)
+        glBufferData(GL_ARRAY_BUFFER, grouped.nbytes, grouped, GL_STREAM_DRAW)
+        for location in _INSTANCE_ATTRIBUTES.values():
+            glEnableVertexAttribArray(location)
+            glVertexAttribDivisor(location, 1)
+
+        ebos = self._instance_ebos[tier]
+        # Triangles lit first, then the outlines unlit, like the
+        # immediate-mode line loops
+        for lit in (True, False):
+            glUniform1i(self._lit_uniform, int(lit))
+            first = 0
+            for (face, sticker), rows in groups:
+                triangles, triangle_count, lines, line_count = ebos[face, sticker]
+                ebo, count = (triangles, triangle_count) if lit else (lines, line_count)
+                if count:
+                    self._point_instances(first)
+                    if not lit:
+                        glLineWidth(STICKER_LINE_WIDTH if sticker else PLASTIC_LINE_WIDTH)
+                    glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, ebo)
+                    glDrawElementsInstanced(GL_TRIANGLES if lit else GL_LINES, count,
+                                            GL_UNSIGNED_SHORT, None, len(rows))
+                first += len(rows)
+            if lit and core is not None:
+                self._point_instances(first)
+                glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, self._core_ebo)
+                glDrawElementsInstanced(GL_TRIANGLES, self._core_count, GL_UNSIGNED_SHORT,
+                                        None, len(core))
+
+        for location in _INSTANCE_ATTRIBUTES.values():
+            glVertexAttribDivisor(location, 0)
+            glDisableVertexAttribArray(location)
+        for location in _MESH_ATTRIBUTES.values():
+            glDisableVertexAttribArray(location)
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glUseProgram(0)
+
+    def _point_instances(self, first: int):
+        """Point the instance attributes at rows ``first`` onward of the
+        bound instance buffer"""
+        stride = _INSTANCE_FLOATS * 4
+        for offset, location in zip((0, 4, 8, 12, 16, 19), _INSTANCE_ATTRIBUTES.values()):
+            raw_gl2.glVertexAttribPointer(location, 4 if offset < 16 else 3, GL_FLOAT, GL_FALSE,
+                                          stride, ctypes.c_void_p((first * _INSTANCE_FLOATS
+                                                                   + offset) * 4))
+
+    def _buffers_for(self, colors: List[str], faces: Tuple[bool, ...], tier: str = 'full'):
+        """Static color and index buffers for one piece color scheme and LOD tier"""
+        key = (tuple(colors), faces, tier)
+        buffers = self._piece_buffers.get(key)
+        if buffers is None:
+            color_vbo = glGenBuffers(1)
+            data = cubie_colors(colors)
+            glBindBuffer(GL_ARRAY_BUFFER, color_vbo)
+            glBufferData(GL_ARRAY_BUFFER, data.nbytes, data, GL_STATIC_DRAW)
+
+            index_buffers, counts = [], []
+            for indices in cubie_indices(colors, faces, tier):
+                ebo = glGenBuffers(1)
+                glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, ebo)
+                glBufferData(GL_ELEMENT_ARRAY_BUFFER, indices.nbytes, indices, GL_STATIC_DRAW)
+                index_buffers.append(ebo)
+                counts.append(len(indices))
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+            buffers = (color_vbo, *index_buffers, counts)
+            self._piece_buffers[key] = buffers
+        return buffers
+
+    def _geometry_for(self, piece: CubePiece, faces: Tuple[bool, ...]) -> PieceGeometry:
+        """Cached render arrays of a piece, rebuilt after it moves or is recolored"""
+        entry = self._geometry.get(piece.id)
+        if (entry is None or entry[0] is not piece or entry[1] != piece.version
+                or entry[2] != piece.colors or entry[3] != faces):
+            entry = (piece, piece.version, list(piece.colors), faces, PieceGeometry(piece, faces))
+            self._geometry[piece.id] = entry
+        return entry[4]
+
+    def _visibility(self, pieces: List[CubePiece], status: dict, turn: dict = None) -> dict:
+        """Visible local faces per piece id, recomputed only when a turn changes them"""
+        version = status.get('model_version')
+        key = (version, turn['axis'] if turn else None)
+        if version is None or key != self._visible_key:
+            mask = visible_faces(pieces, turn['axis'] if turn else None)
+            self._visible = {piece.id: tuple(row) for piece, row in zip(pieces, mask.tolist())}
+            self._visible_key = key
+        return self._visible
+
+    def _draw_pieces(self, pieces: List[CubePiece], visible: dict, tier: str = 'full'):
+        """Draw pieces through the vertex buffers, or from client arrays as a fallback"""
+        if not self.use_buffers:
+            for piece in pieces:
+                self._draw_cube_piece(piece, visible[piece.id], tier)
+            return
+
+        self._bind_mesh()
+        for piece in pieces:
+            faces = visible[piece.id]
+            self._draw_buffered(piece.colors, faces, self._geometry_for(piece, faces).gl_matrix,
+                                tier)
+        self._unbind_mesh()
+
+    def _bind_mesh(self):
+        """Point the vertex and normal arrays at the shared mesh buffers"""
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_NORMAL_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        glBindBuffer(GL_ARRAY_BUFFER, self._position_vbo)
+        raw_gl.glVertexPointer(3, GL_FLOAT, 0, None)
+        glBindBuffer(GL_ARRAY_BUFFER, self._normal_vbo)
+        raw_gl.glNormalPointer(GL_FLOAT, 0, None)
+
+    def _draw_buffered(self, colors: List[str], faces, gl_matrix: np.ndarray,
+                       tier: str = 'full'):
+        """Draw the bound mesh once with a color scheme and model matrix"""
+        color_vbo, quads, sticker_lines, plastic_lines, counts = self._buffers_for(
+            colors, faces, tier)
+        glBindBuffer(GL_ARRAY_BUFFER, color_vbo)
+        raw_gl.glColorPointer(3, GL_FLOAT, 0, None)
 
-    def _draw_cube_face(self, vertices: np.ndarray, color: str, is_sticker: bool = True):
+        glPushMatrix()
+        glMultMatrixf(gl_matrix)
+
+        if counts[0]:
+            glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, quads)
+            glDrawElements(GL_QUADS, counts[0], GL_UNSIGNED_SHORT, None)
+
+        # Outlines are unlit, like the immediate-mode line loops
+        glDisable(GL_LIGHTING)
+        for ebo, count, width in ((sticker_lines, counts[1], STICKER_LINE_WIDTH),
+                                  (plastic_lines, counts[2], PLASTIC_LINE_WIDTH)):
+            if count:
+                glLineWidth(width)
+                glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, ebo)
+                glDrawElements(GL_LINES, count, GL_UNSIGNED_SHORT, None)
+        glEnable(GL_LIGHTING)
+        glPopMatrix()
+
+    def _unbind_mesh(self):
+        """Undo _bind_mesh"""
+        glBindBuffer(GL_ELEMENT_ARRAY_BUFFER, 0)
+        glBindBuffer(GL_ARRAY_BUFFER, 0)
+        glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_NORMAL_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
+
+    def _draw_core(self, turn: dict = None):
+        """Fill the gaps between pieces where the culled interior faces were,
+        with the cubie mesh scaled onto each core box (the instanced path
+        draws it as instances instead)"""
+        if self.use_buffers:
+            self._bind_mesh()
+        for matrix, turning in core_matrices(turn['axis'] if turn else None):
+            if turning:
+                matrix = rotation_matrix(turn['axis'], -turn['angle']) @ matrix
+            gl_matrix = np.ascontiguousarray(matrix.T, dtype=np.float32)
+            if self.use_buffers:
+                self._draw_buffered(CORE_COLORS, None, gl_matrix, _CORE_TIER)
+            else:
+                positions, normals, colors = self._core_arrays
+                glPushMatrix()
+                glMultMatrixf(gl_matrix)
+                self._draw_arrays(positions, normals, colors,
+                                  *cubie_indices(CORE_COLORS, None, _CORE_TIER), _CORE_TIER)
+                glPopMatrix()
+        if self.use_buffers:
+            self._unbind_mesh()
+
+    def _draw_cube_piece(self, piece: CubePiece, faces=None, tier: str = 'full'):
         """
-        Draw a single cube face as a quad with realistic appearance
+        Draw a single cube piece from its cached client-side arrays
+        (fallback when vertex buffers are unavailable)
 
         Args:
-            vertices: 4 vertices of the face
-            color: Hex color string
-            is_sticker: If True, draw as colored sticker on black base
+            piece: CubePiece object to render
+            faces: Visible flag per local face (default: draw all six)
+            tier: Level of detail (see cube_geometry.LOD_TIERS)
         """
-        # Convert color
-        r, g, b = self._hex_to_rgb(color)
-
-        if is_sticker:
-            # Calculate face center and outward-pointing normal
-            center = np.mean(vertices, axis=0)
-
-            # Calculate normal from face vertices (counter-clockwise winding)
-            v1 = vertices[1] - vertices[0]
-            v2 = vertices[2] - vertices[0]
-            normal = np.cross(v1, v2)
-
-            # Normalize
-            normal_length = np.linalg.norm(normal)
-            if normal_length > 0:
-                normal = normal / normal_length
-
-            # Ensure normal points away from cube center (outward)
-            # If dot product with center is negative, flip it
-            if np.dot(center, normal) < 0:
-                normal = -normal
-
-            # Draw black plastic base
-            glColor3f(0.12, 0.12, 0.12)
-            glNormal3fv(normal)  # Set normal for lighting
-            glBegin(GL_QUADS)
-            for vertex in vertices:
-                glVertex3fv(vertex)
-            glEnd()
-
-            # Create inset sticker (92% of face size for visible black border)
-            inset_factor = 0.92
-            inset_vertices = center + (vertices - center) * inset_factor
-
-            # Raise sticker above black plastic surface
-            sticker_raise = 0.025
-            sticker_vertices = inset_vertices + normal * sticker_raise
-
-            # Draw vibrant colored sticker with proper normal
-            glColor3f(r, g, b)
-            glNormal3fv(normal)  # Same normal for consistent lighting
-            glBegin(GL_QUADS)
-            for vertex in sticker_vertices:
-                glVertex3fv(vertex)
-            glEnd()
-
-            # Draw thin black outline around sticker
-            glDisable(GL_LIGHTING)
-            glColor3f(0.0, 0.0, 0.0)
-            glLineWidth(2.0)
-            glBegin(GL_LINE_LOOP)
-            for vertex in sticker_vertices:
-                glVertex3fv(vertex)
-            glEnd()
-            glEnable(GL_LIGHTING)
-        else:
-            # Draw solid black plastic face (internal/hidden faces)
-            glColor3f(0.15, 0.15, 0.15)
-            glBegin(GL_QUADS)
-            for vertex in vertices:
-                glVertex3fv(vertex)
-            glEnd()
-
-            # Subtle edges for black plastic
+        geometry = self._geometry_for(piece, faces)
+        quads = geometry.flat_quads if tier == 'flat' else geometry.quads
+        self._draw_arrays(geometry.positions, geometry.normals, geometry.colors,
+                          quads, geometry.sticker_lines, geometry.plastic_lines, tier)
+
+    def _draw_arrays(self, positions: np.ndarray, normals: np.ndarray, colors: np.ndarray,
+                     quads: np.ndarray, sticker_lines: np.ndarray, plastic_lines: np.ndarray,
+                     tier: str = 'full'):
+        """Draw mesh arrays and index lists (as PieceGeometry holds them)
+        from client-side arrays"""
+        glEnableClientState(GL_VERTEX_ARRAY)
+        glEnableClientState(GL_NORMAL_ARRAY)
+        glEnableClientState(GL_COLOR_ARRAY)
+        raw_gl.glVertexPointer(3, GL_FLOAT, 0, _address(positions))
+        raw_gl.glNormalPointer(GL_FLOAT, 0, _address(normals))
+        raw_gl.glColorPointer(3, GL_FLOAT, 0, _address(colors))
+
+        if len(quads):
+            raw_gl.glDrawElements(GL_QUADS, len(quads), GL_UNSIGNED_SHORT, _address(quads))
+        if tier == 'full':
             glDisable(GL_LIGHTING)
-            glColor3f(0.05, 0.05, 0.05)
-            glLineWidth(1.0)
-            glBegin(GL_LINE_LOOP)
-            for vertex in vertices:
-                glVertex3fv(vertex)
-            glEnd()
+            for indices, width in ((sticker_lines, STICKER_LINE_WIDTH),
+                                   (plastic_lines, PLASTIC_LINE_WIDTH)):
+                if len(indices):
+                    glLineWidth(width)
+                    raw_gl.glDrawElements(GL_LINES, len(indices), GL_UNSIGNED_SHORT,
+                                          _address(indices))
             glEnable(GL_LIGHTING)
 
-    def _draw_cube_piece(self, piece: CubePiece):
-        """
-        Draw a single cube piece with all its faces (realistic solid cube)
+        glDisableClientState(GL_COLOR_ARRAY)
+        glDisableClientState(GL_NORMAL_ARRAY)
+        glDisableClientState(GL_VERTEX_ARRAY)
 
-        Args:
-            piece: CubePiece object to render
-        """
-        vertices = piece.get_vertices()
-
-        # Define faces with vertex indices and color indices
-        # (vertex_indices, color_index)
-        faces = [
-            ([1, 5, 6, 2], 0),  # right (x+)
-            ([4, 0, 3, 7], 1),  # left (x-)
-            ([3, 2, 6, 7], 2),  # up (y+)
-            ([0, 4, 5, 1], 3),  # down (y-)
-            ([5, 4, 7, 6], 4),  # front (z+)
-            ([0, 1, 2, 3], 5)   # back (z-)
-        ]
-
-        # Draw ALL faces to create a solid cube
-        for indices, color_idx in faces:
-            face_vertices = vertices[indices]
-            color = piece.colors[color_idx]
-
-            # Colored faces get sticker treatment, black faces are solid plastic
-            is_sticker = (color != COLORS['BLACK'])
-            self._draw_cube_face(face_vertices, color, is_sticker)
-
-    def render(self, pieces: List[CubePiece], status: dict = None):
+    def render(self, pieces: List[CubePiece], status: dict = None, turn: dict = None):
         """
         Render all cube pieces with the UI overlay
 
         Args:
-            pieces: List of CubePiece objects to render
+            pieces: List of CubePiece objects to render, or a collection of
+                cubes (models, piece lists, facelet dicts, compact states or
+                an (N, 54) array) to show side by side as a wall
             status: Optional dict with live cube state for the status bar
                 ('fps', 'moves', 'last_move', 'solved')
+            turn: Optional in-progress face turn: 'axis' (face normal),
+                'angle' (clockwise degrees) and 'pieces' (ids in the layer)
         """
         status = status or {}
+        self._wall_active = _is_cube_collection(pieces)
+        if self._wall_active:
+            self._render_wall(pieces, status)
+            return
 
         # Clear buffers
         glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
 
         # In edit mode the cube shrinks to a corner so the picker takes focus
         edit_mode = status.get('edit_mode', False)
+        self._cube_viewport = self._pip_rect() if edit_mode else (0, 0, self.width, self.height)
         if edit_mode:
-            vx, vy, vw, vh = self._pip_rect()
+            vx, vy, vw, vh = self._cube_viewport
             glViewport(vx, vy, vw, vh)
             glMatrixMode(GL_PROJECTION)
             glLoadIdentity()
@@ -296,9 +754,27 @@ class OpenGLRenderer:
         glRotatef(self.cube_rotation_x, 1, 0, 0)
         glRotatef(self.cube_rotation_y, 0, 1, 0)
 
-        # Draw all pieces
-        for piece in pieces:
-            self._draw_cube_piece(piece)
+        # Draw all pieces; the layer being turned is drawn at its animated angle
+        # Faces pressed against a neighbor are never submitted
+        visible = self._visibility(pieces, status, turn)
+        tier = self.lod_override or lod_tier(
+            projected_size(CUBE_SIZE, self.camera_distance, self._cube_viewport[3]))
+        self.lod_tier = tier
+        if self.use_instancing:
+            # The core and the turning layer's rotation are folded into
+            # instance rows
+            self._draw_pieces_instanced(pieces, visible, turn, tier)
+        else:
+            self._draw_core(turn)  # also the plastic between flat-tier stickers
+            turning = turn['pieces'] if turn else ()
+            self._draw_pieces([piece for piece in pieces if piece.id not in turning],
+                              visible, tier)
+            if turn:
+                glPushMatrix()
+                glRotatef(-turn['angle'], *turn['axis'])  # clockwise about the normal
+                self._draw_pieces([piece for piece in pieces if piece.id in turning],
+                                  visible, tier)
+                glPopMatrix()
 
         # Restore the full-window viewport for the 2D overlay
         if edit_mode:
@@ -311,6 +787,82 @@ class OpenGLRenderer:
         # Swap buffers
         pygame.display.flip()
 
+    def _wall_states_for(self, cubes) -> np.ndarray:
+        """(N, 54) states of a wall, converted again only when it changes.
+
+        Arrays are used as they are; other collections are re-read when a
+        different collection is passed or one of its models has turned.
+        """
+        if isinstance(cubes, np.ndarray):
+            return np.atleast_2d(cubes)
+        key = (id(cubes), len(cubes), tuple(getattr(cube, 'version', None) for cube in cubes))
+        if key != self._wall_key:
+            self._wall_states = as_states(list(cubes))
+            self._wall_key = key
+        return self._wall_states
+
+    def _wall_layout_for(self, count: int) -> WallLayout:
+        """Tile layout right of the info panel and above the status bar"""
+        left = self._PANEL_X + self._PANEL_W + self._GAP
+        area = (count, left, self._GAP, self.width - left - self._GAP,
+                self.height - self._STATUS_H - 2 * self._GAP)
+        if self._wall_layout is None or self._wall_layout_key != area:
+            self._wall_layout = WallLayout(*area)
+            self._wall_layout_key = area
+        return self._wall_layout
+
+    def _render_wall(self, cubes, status: dict):
+        """Draw many cubes in tiles: only visible tiles, detail by tile size"""
+        states = self._wall_states_for(cubes)
+        layout = self._wall_layout_for(len(states))
+        self.wall_scroll = layout.clamp_scroll(self.wall_scroll)
+        shown = layout.visible(self.wall_scroll)
+        centers = layout.centers(shown, self.wall_scroll)
+        centers[:, 1] = self.height - centers[:, 1]  # GL window coordinates
+        view = (rotation_matrix((1, 0, 0), self.cube_rotation_x)
+                @ rotation_matrix((0, 1, 0), self.cube_rotation_y))
+        tier = self.lod_override or lod_tier(layout.scale() * CUBE_SIZE)
+        if not self.use_instancing:
+            tier = 'flat'
+        self.wall_tier = tier
+
+        glClear(GL_COLOR_BUFFER_BIT | GL_DEPTH_BUFFER_BIT)
+        glMatrixMode(GL_PROJECTION)
+        glLoadIdentity()
+        glOrtho(0, self.width, 0, self.height, -2.0 * layout.tile, 2.0 * layout.tile)
+        glMatrixMode(GL_MODELVIEW)
+        glLoadIdentity()
+        glEnable(GL_SCISSOR_TEST)  # keep partly scrolled-out rows off the HUD
+        glScissor(layout.x, self.height - layout.y - layout.height, layout.width, layout.height)
+
+        if len(shown) and tier != 'flat':
+            # Positional lights would shade every tile differently; light
+            # all cubes from the directions the main cube sees them
+            glPushAttrib(GL_LIGHTING_BIT)
+            glLightfv(GL_LIGHT0, GL_POSITION, [5.0, 5.0, 13.0, 0.0])
+            glLightfv(GL_LIGHT1, GL_POSITION, [-3.0, 2.0, 5.0, 0.0])
+            self._draw_instances(detail_instances(states[shown], centers, layout.scale(), view),
+                                 tier)
+            glPopAttrib()
+        elif len(shown):
+            positions, colors = flat_quads(states[shown], centers, layout.scale(), view)
+            glDisable(GL_LIGHTING)
+            glDisable(GL_DEPTH_TEST)
+            glEnableClientState(GL_VERTEX_ARRAY)
+            glEnableClientState(GL_COLOR_ARRAY)
+            raw_gl.glVertexPointer(2, GL_FLOAT, 0, _address(positions))
+            raw_gl.glColorPointer(3, GL_FLOAT, 0, _address(colors))
+            glDrawArrays(GL_QUADS, 0, len(positions))
+            glDisableClientState(GL_COLOR_ARRAY)
+            glDisableClientState(GL_VERTEX_ARRAY)
+            glEnable(GL_DEPTH_TEST)
+            glEnable(GL_LIGHTING)
+
+        glDisable(GL_SCISSOR_TEST)
+        self._setup_perspective()
+        self._draw_ui_overlay(dict(status, wall=len(states)))
+        pygame.display.flip()
+
     def _pip_rect(self):
         """Bottom-right viewport (GL origin) for the minimized cube"""
         size = min(320, self.width // 3, self.height - self._STATUS_H - 60)
@@ -331,12 +883,17 @@ class OpenGLRenderer:
     _NET_FACE_GAP = 5
     _SWATCH = 24
     _SWATCH_GAP = 7
+    # (face_column, face_row) of each face in the net's cross layout
+    _NET_LAYOUT = {'U': (1, 0), 'L': (0, 1), 'F': (1, 1),
+                   'R': (2, 1), 'B': (3, 1), 'D': (1, 2)}
+    _NET_FACE_AT = {cell: face for face, cell in _NET_LAYOUT.items()}
 
     _CONTROLS = [
         ("Drag", "Rotate view"),
         ("Scroll", "Zoom"),
         ("F B R L U D", "Turn a face"),
         ("S", "Scramble"),
+        ("Enter", "Solve (Bksp stops)"),
         ("Space", "Reset"),
         ("E", "Edit / paint"),
         ("Esc / Q", "Quit"),
@@ -376,14 +933,16 @@ class OpenGLRenderer:
         glDisable(GL_DEPTH_TEST)
         glDisable(GL_LIGHTING)
 
-        # Refresh hit-test rectangles for this frame
-        self._net_cell_rects = {}
-        self._palette_rects = {}
-
+        # The panel comes first: redrawing it flushes queued text into its texture
+        if self.use_panel_cache:
+            self._draw_cached_panel(status)
+        else:
+            self._palette_origin = None
+            self._draw_info_panel(status)
         if status.get('edit_mode'):
             self._draw_pip_frame()
-        self._draw_info_panel(status)
         self._draw_status_bar(status)
+        self.text_cache.flush()  # all labels in one batch, above the panels
 
         glEnable(GL_DEPTH_TEST)
         glEnable(GL_LIGHTING)
@@ -392,6 +951,116 @@ class OpenGLRenderer:
         glMatrixMode(GL_MODELVIEW)
         glPopMatrix()
 
+    def _panel_height(self, edit_mode: bool) -> int:
+        """Height of the info panel for the current mode"""
+        lh = self._LINE_H
+        net_h = 3 * self._NET_CELL * 3 + 2 * self._NET_FACE_GAP
+        edit_h = (self._GAP + self._SWATCH + 2 * lh) if edit_mode else 0
+        return (self._TITLE_H + 10 + self._HEADER_H + len(self._CONTROLS) * lh
+                + 2 * self._GAP + self._HEADER_H + len(self._LEGEND) * lh
+                + 2 * self._GAP + self._HEADER_H + net_h + edit_h + self._PAD)
+
+    def _draw_cached_panel(self, status: dict):
+        """Composite the info panel texture, redrawing it only when it changed"""
+        edit_mode = status.get('edit_mode', False)
+        version = status.get('facelets_version')
+        key = (edit_mode, version, status.get('selected_color') if edit_mode else None,
+               self.width, self.height)
+        if version is None or key != self._panel_key:
+            if not self._render_panel(status):
+                return
+            self._panel_key = key
+
+        # The texture holds premultiplied alpha (see _render_panel)
+        w, h = self._panel_size
+        glEnable(GL_TEXTURE_2D)
+        glBindTexture(GL_TEXTURE_2D, self._panel_texture)
+        glBlendFunc(GL_ONE, GL_ONE_MINUS_SRC_ALPHA)
+        glColor4f(1.0, 1.0, 1.0, 1.0)
+        glBegin(GL_QUADS)
+        glTexCoord2f(0.0, 1.0)
+        glVertex2f(0, 0)
+        glTexCoord2f(1.0, 1.0)
+        glVertex2f(w, 0)
+        glTexCoord2f(1.0, 0.0)
+        glVertex2f(w, h)
+        glTexCoord2f(0.0, 0.0)
+        glVertex2f(0, h)
+        glEnd()
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+        glBindTexture(GL_TEXTURE_2D, 0)
+        glDisable(GL_TEXTURE_2D)
+
+    def _render_panel(self, status: dict) -> bool:
+        """Draw the info panel into its offscreen texture.
+
+        The texture covers the overlay from the window corner to the panel's
+        far corner, so labels overhanging the panel edge are kept. Returns
+        False (after drawing the panel directly) if no framebuffer is usable.
+        """
+        self._palette_origin = None
+        size = (self._PANEL_X + self._PANEL_W,
+                self._PANEL_Y + self._panel_height(status.get('edit_mode', False)))
+        if not self._ensure_panel_target(*size):
+            self.use_panel_cache = False
+            self._draw_info_panel(status)
+            return False
+
+        glBindFramebuffer(GL_FRAMEBUFFER, self._panel_fbo)
+        glViewport(0, 0, *size)
+        glMatrixMode(GL_PROJECTION)
+        glPushMatrix()
+        glLoadIdentity()
+        glOrtho(0, size[0], size[1], 0, -1, 1)
+        glMatrixMode(GL_MODELVIEW)
+
+        clear_color = glGetFloatv(GL_COLOR_CLEAR_VALUE)
+        glClearColor(0.0, 0.0, 0.0, 0.0)
+        glClear(GL_COLOR_BUFFER_BIT)
+        glClearColor(*clear_color)
+
+        # Accumulate alpha separately so the texture ends up premultiplied
+        # and compositing it matches drawing the panel directly
+        glBlendFuncSeparate(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA, GL_ONE, GL_ONE_MINUS_SRC_ALPHA)
+        self._draw_info_panel(status)
+        self.text_cache.flush()
+        glBlendFunc(GL_SRC_ALPHA, GL_ONE_MINUS_SRC_ALPHA)
+
+        glMatrixMode(GL_PROJECTION)
+        glPopMatrix()
+        glMatrixMode(GL_MODELVIEW)
+        glBindFramebuffer(GL_FRAMEBUFFER, 0)
+        glViewport(0, 0, self.width, self.height)
+        return True
+
+    def _ensure_panel_target(self, w: int, h: int) -> bool:
+        """(Re)create the panel texture and framebuffer for a size"""
+        if self._panel_fbo is not None and self._panel_size == (w, h):
+            return True
+        try:
+            if self._panel_fbo is None:
+                self._panel_fbo = glGenFramebuffers(1)
+                self._panel_texture = glGenTextures(1)
+            glBindTexture(GL_TEXTURE_2D, self._panel_texture)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+            glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+            glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA8, w, h, 0, GL_RGBA, GL_UNSIGNED_BYTE, None)
+            glBindTexture(GL_TEXTURE_2D, 0)
+
+            glBindFramebuffer(GL_FRAMEBUFFER, self._panel_fbo)
+            glFramebufferTexture2D(GL_FRAMEBUFFER, GL_COLOR_ATTACHMENT0,
+                                   GL_TEXTURE_2D, self._panel_texture, 0)
+            complete = glCheckFramebufferStatus(GL_FRAMEBUFFER) == GL_FRAMEBUFFER_COMPLETE
+            glBindFramebuffer(GL_FRAMEBUFFER, 0)
+        except Exception as error:  # framebuffer objects missing or unusable
+            print(f"Panel framebuffer unavailable, drawing the panel directly: {error}")
+            return False
+        if not complete:
+            print("Panel framebuffer incomplete, drawing the panel directly")
+            return False
+        self._panel_size = (w, h)
+        return True
+
     def _draw_info_panel(self, status: dict = None):
         """Translucent panel with controls, a color legend and the cube state"""
         status = status or {}
@@ -403,10 +1072,7 @@ class OpenGLRenderer:
         x, y, w, pad, lh = (self._PANEL_X, self._PANEL_Y, self._PANEL_W,
                             self._PAD, self._LINE_H)
         net_h = 3 * self._NET_CELL * 3 + 2 * self._NET_FACE_GAP
-        edit_h = (self._GAP + self._SWATCH + 2 * lh) if edit_mode else 0
-        panel_h = (self._TITLE_H + 10 + self._HEADER_H + len(self._CONTROLS) * lh
-                   + 2 * self._GAP + self._HEADER_H + len(self._LEGEND) * lh
-                   + 2 * self._GAP + self._HEADER_H + net_h + edit_h + pad)
+        panel_h = self._panel_height(edit_mode)
 
         # Panel background and title bar
         self._draw_rect(x, y, w, panel_h, (0.09, 0.09, 0.13, 0.82))
@@ -472,38 +1138,62 @@ class OpenGLRenderer:
     def _draw_palette(self, palette, selected, ox: int, oy: int):
         """Row of clickable color swatches; the selected one is outlined"""
         sw, gap = self._SWATCH, self._SWATCH_GAP
+        self._palette_origin = (ox, oy)
+        self._palette_colors = list(palette)
         for i, color in enumerate(palette):
             px = ox + i * (sw + gap)
             if color == selected:
                 self._draw_rect(px - 2, oy - 2, sw + 4, sw + 4, (1, 1, 1, 0.95))
             r, g, b = self._hex_to_rgb(color)
             self._draw_rect(px, oy, sw, sw, (r, g, b, 1.0))
-            self._palette_rects[color] = (px, oy, sw, sw)
 
     def cell_at(self, pos):
         """Net facelet (face, row, col) under a screen point, or None"""
-        px, py = pos
-        for key, (rx, ry, rw, rh) in self._net_cell_rects.items():
-            if rx <= px < rx + rw and ry <= py < ry + rh:
-                return key
-        return None
+        if self._net_origin is None:
+            return None
+        cell = self._NET_CELL
+        step = 3 * cell + self._NET_FACE_GAP
+        dx, dy = pos[0] - self._net_origin[0], pos[1] - self._net_origin[1]
+        if dx < 0 or dy < 0:
+            return None
+        face = self._NET_FACE_AT.get((dx // step, dy // step))
+        dx, dy = dx % step, dy % step
+        if face is None or dx >= 3 * cell or dy >= 3 * cell:
+            return None  # outside the cross, or in the gap between faces
+        return face, dy // cell, dx // cell
 
     def palette_color_at(self, pos):
         """Palette color (hex) under a screen point, or None"""
-        px, py = pos
-        for color, (rx, ry, rw, rh) in self._palette_rects.items():
-            if rx <= px < rx + rw and ry <= py < ry + rh:
-                return color
-        return None
+        if self._palette_origin is None:
+            return None
+        pitch = self._SWATCH + self._SWATCH_GAP
+        dx, dy = pos[0] - self._palette_origin[0], pos[1] - self._palette_origin[1]
+        index = dx // pitch
+        if (dx < 0 or not 0 <= dy < self._SWATCH or dx % pitch >= self._SWATCH
+                or index >= len(self._palette_colors)):
+            return None
+        return self._palette_colors[index]
+
+    def facelet_at(self, pos):
+        """Sticker (face, row, col) of the 3D cube under a screen point, or None.
+
+        Casts the mouse ray against the cube's face planes as last drawn;
+        an in-progress layer turn is ignored.
+        """
+        vx, vy, vw, vh = self._cube_viewport
+        if not (vx <= pos[0] < vx + vw and vy <= self.height - pos[1] < vy + vh):
+            return None
+        origin, direction = camera_ray(pos, self._cube_viewport, self.height,
+                                       self.cube_rotation_x, self.cube_rotation_y,
+                                       self.camera_distance)
+        return pick_facelet(origin, direction)
 
     def _draw_cube_net(self, facelets: dict, ox: int, oy: int):
         """Draw the six faces as an unfolded cross of 3x3 colored cells"""
         cell, fgap = self._NET_CELL, self._NET_FACE_GAP
         step = 3 * cell + fgap
-        # (face_column, face_row) of each face in the cross layout
-        layout = {'U': (1, 0), 'L': (0, 1), 'F': (1, 1),
-                  'R': (2, 1), 'B': (3, 1), 'D': (1, 2)}
-        for name, (fc, fr) in layout.items():
+        self._net_origin = (ox, oy)
+        for name, (fc, fr) in self._NET_LAYOUT.items():
             grid = facelets.get(name)
             if not grid:
                 continue
@@ -516,10 +1206,12 @@ class OpenGLRenderer:
                     cx, cy = fx + col * cell, fy + row * cell
                     self._draw_rect(cx + 1, cy + 1, cell - 2, cell - 2,
                                     (r, g, b, 1.0))
-                    self._net_cell_rects[(name, row, col)] = (cx, cy, cell, cell)
 
     def _draw_status_bar(self, status: dict):
-        """Bottom bar with live FPS, move count, last move and solved state"""
+        """Bottom bar with live FPS, move count, last move and solved state
+
+        Once only the last layer is left, the state shows its OLL/PLL case.
+        """
         fps = status.get('fps', 0.0)
         moves = status.get('moves', 0)
         last_move = status.get('last_move') or '-'
@@ -532,25 +1224,37 @@ class OpenGLRenderer:
 
         ty = by + 23
         info = f"FPS {fps:3.0f}     Moves {moves}     Last: {last_move}"
-        self._render_text(info, 16, ty, self.font, (210, 210, 210))
+        self._render_text(info, 16, ty, self.font, (210, 210, 210), dynamic=True)
 
-        if status.get('edit_mode'):
+        job = status.get('job')
+        if job is not None:
+            task = f"{job.name} {job.progress:4.0%}  {job.message}"
+            self._render_text(task, 360, ty, self.font, (150, 190, 255), dynamic=True)
+
+        if status.get('wall'):
+            state = f"WALL {status['wall']}"
+            color = (150, 190, 255)
+        elif status.get('edit_mode'):
             valid = status.get('valid', True)
             state = "EDIT - VALID" if valid else "EDIT - INVALID"
             color = (120, 200, 255) if valid else (255, 110, 110)
+        elif not solved and status.get('last_layer') is not None:
+            case = status['last_layer']
+            state = f"{case.step} {case.name}" if case.step != 'AUF' else f"AUF {case.post}"
+            color = (255, 210, 90)
         else:
             state = "SOLVED" if solved else "SCRAMBLED"
             color = (90, 220, 120) if solved else (255, 170, 70)
         self._render_text(state, self.width - 170, ty, self.font, color)
 
-    def _render_text(self, text: str, x: int, y: int, font, color):
-        """Render text using pygame font"""
-        text_surface = font.render(text, True, color)
-        text_data = pygame.image.tostring(text_surface, "RGBA", True)
-        w, h = text_surface.get_size()
+    def _render_text(self, text: str, x: int, y: int, font, color, dynamic: bool = False):
+        """Render text using pygame font (cached as textures, see cube_text)"""
+        self.text_cache.draw(text, x, y, font, color, dynamic)
 
-        glRasterPos2i(x, y)
-        glDrawPixels(w, h, GL_RGBA, GL_UNSIGNED_BYTE, text_data)
+    def view_state(self) -> Tuple:
+        """Camera and window parameters that affect the rendered picture"""
+        return (self.camera_distance, self.cube_rotation_x, self.cube_rotation_y,
+                self.width, self.height, self.wall_scroll)
 
     def handle_mouse_press(self, pos: Tuple[int, int]):
         """Handle mouse button press"""
@@ -580,11 +1284,24 @@ class OpenGLRenderer:
             self.last_mouse_pos = pos
 
     def handle_mouse_wheel(self, direction: int):
-        """Handle mouse wheel for zoom"""
-        if direction > 0:  # Scroll up - zoom in
-            self.camera_distance = max(3.0, self.camera_distance - 0.5)
-        else:  # Scroll down - zoom out
-            self.camera_distance = min(15.0, self.camera_distance + 0.5)
+        """Handle mouse wheel for zoom (a row of tiles per step on the wall)
+
+        Args:
+            direction: Wheel steps, positive up (zoom in); several steps
+                may be passed at once
+        """
+        if self._wall_active and self._wall_layout is not None:
+            layout = self._wall_layout
+            self.wall_scroll = layout.clamp_scroll(self.wall_scroll - direction * layout.tile)
+        else:  # Scroll up - zoom in, scroll down - zoom out
+            self.camera_distance = min(15.0, max(3.0, self.camera_distance - 0.5 * direction))
+
+    def refresh_rate(self) -> float:
+        """Refresh rate of the window's display in Hz, or 0 if unknown"""
+        try:
+            return float(pygame.display.get_current_refresh_rate())
+        except (AttributeError, pygame.error):  # older pygame, no display
+            return 0.0
 
     def resize(self, width: int, height: int):
         """Handle window resize"""
@@ -595,4 +1312,8 @@ class OpenGLRenderer:
 
     def cleanup(self):
         """Cleanup resources"""
+        self.text_cache.clear()
+        if self._panel_fbo is not None:
+            glDeleteFramebuffers(1, [self._panel_fbo])
+            glDeleteTextures([self._panel_texture])
         pygame.quit()
@@ -0,0 +1,173 @@
+"""
+Rubik's Cube Startup - time-to-first-frame profiling and a font cache
+
+The viewer is launched on demand, so the time from launch to the first
+frame on screen is what a user waits through every time. StartupProfile
+records when each startup phase ended, from the import of this module
+(the controller imports it first) to the first frame, and reports or logs
+the result so the number can be tracked from run to run.
+
+pygame.font.SysFont scans the system font database (fc-list on Linux) on
+its first call in every process, which is a large part of startup on
+machines with many fonts. FontCache keeps the outcome of each font lookup
+(the file, or the built-in default font, and any synthesized bold or
+italic) in a small JSON file, so later runs open the file directly and
+never scan. Entries whose file has gone are looked up again; delete the
+cache file to pick up newly installed fonts.
+No GUI dependencies.
+"""
+
+import json
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+_IMPORTED = time.perf_counter()
+
+FONT_CACHE_VERSION = 1
+
+
+def default_font_cache_path() -> str:
+    """fonts.json in the per-user cache directory (XDG_CACHE_HOME)"""
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'rubiks_cube', 'fonts.json')
+
+
+class StartupProfile:
+    """Wall-clock end of each startup phase, up to the first frame"""
+
+    def __init__(self, start: Optional[float] = None):
+        """
+        Args:
+            start: perf_counter() value startup is measured from
+                (default: now)
+        """
+        self.start = time.perf_counter() if start is None else start
+        self.marks: List[Tuple[str, float]] = []
+        self.finished = False
+
+    def mark(self, phase: str):
+        """Record that ``phase`` just ended; ignored after finish()"""
+        if not self.finished:
+            self.marks.append((phase, time.perf_counter()))
+
+    def finish(self, phase: str = 'first frame'):
+        """Record the last phase (the first frame on screen) and stop"""
+        self.mark(phase)
+        self.finished = True
+
+    def phases(self) -> List[Tuple[str, float]]:
+        """(phase, milliseconds it took) in order"""
+        durations, last = [], self.start
+        for phase, when in self.marks:
+            durations.append((phase, 1e3 * (when - last)))
+            last = when
+        return durations
+
+    @property
+    def total_ms(self) -> float:
+        """Milliseconds from the start to the last mark"""
+        return 1e3 * (self.marks[-1][1] - self.start) if self.marks else 0.0
+
+    def report(self) -> str:
+        """Phase-by-phase table, one line per phase"""
+        lines = [f"  {phase:<16} {ms:8.1f} ms" for phase, ms in self.phases()]
+        lines.append(f"  {'total':<16} {self.total_ms:8.1f} ms")
+        return '\n'.join(lines)
+
+    def append_log(self, path: str):
+        """Append this run to a JSON Lines log, for tracking across runs"""
+        entry = {'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                 'total_ms': round(self.total_ms, 1),
+                 'phases': {phase: round(ms, 1) for phase, ms in self.phases()}}
+        with open(path, 'a') as log:
+            log.write(json.dumps(entry) + '\n')
+
+
+_profile = StartupProfile(_IMPORTED)
+
+
+def startup_profile() -> StartupProfile:
+    """The process-wide profile, started when this module was imported"""
+    return _profile
+
+
+def _system_font(name: str, bold: bool, italic: bool) -> Tuple[Optional[str], bool, bool]:
+    """What SysFont would load: (file or None for the default font,
+    synthesize bold, synthesize italic)"""
+    import pygame
+
+    found = []
+
+    def constructor(path, size, set_bold, set_italic):
+        found.append((path, set_bold, set_italic))
+
+    pygame.font.SysFont(name, 1, bold, italic, constructor)
+    return found[0]
+
+
+class FontCache:
+    """
+    pygame fonts by (name, size, style), resolved without a font scan
+
+    Loaded Font objects are kept for the process; font file lookups are
+    kept in the cache file across processes.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Args:
+            path: Cache file (default: default_font_cache_path()); an empty
+                string keeps lookups in memory only
+        """
+        self.path = default_font_cache_path() if path is None else path
+        self.lookups: Dict[str, list] = self._read()
+        self.scans = 0  # lookups that needed the system font database
+        self._fonts = {}
+
+    def _read(self) -> Dict[str, list]:
+        if not self.path or not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path) as cache:
+                data = json.load(cache)
+            if data.get('version') == FONT_CACHE_VERSION:
+                return data['fonts']
+        except (OSError, ValueError, KeyError, AttributeError) as error:
+            print(f"Font cache unreadable, rescanning fonts: {error}")
+        return {}
+
+    def _write(self):
+        if not self.path:
+            return
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            partial = f"{self.path}.{os.getpid()}.tmp"
+            with open(partial, 'w') as cache:
+                json.dump({'version': FONT_CACHE_VERSION, 'fonts': self.lookups}, cache)
+            os.replace(partial, self.path)
+        except OSError as error:
+            print(f"Font cache not saved: {error}")
+
+    def resolve(self, name: str, bold: bool = False,
+                italic: bool = False) -> Tuple[Optional[str], bool, bool]:
+        """Font file and synthesized styles for a system font, as SysFont
+        would choose them, from the cache when possible"""
+        key = f"{name.lower()}|{int(bold)}|{int(italic)}"
+        lookup = self.lookups.get(key)
+        if lookup is None or (lookup[0] is not None and not os.path.exists(lookup[0])):
+            lookup = list(_system_font(name, bold, italic))
+            self.scans += 1
+            self.lookups[key] = lookup
+            self._write()
+        return tuple(lookup)
+
+    def font(self, name: str, size: int, bold: bool = False, italic: bool = False):
+        """The pygame Font SysFont(name, size, bold, italic) would return"""
+        key = (name, size, bold, italic)
+        if key not in self._fonts:
+            from pygame.sysfont import font_constructor
+
+            path, set_bold, set_italic = self.resolve(name, bold, italic)
+            self._fonts[key] = font_constructor(path, size, set_bold, set_italic)
+        return self._fonts[key]
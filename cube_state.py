@@ -0,0 +1,374 @@
+"""
+Rubik's Cube Compact State - flat facelet arrays with table-driven turns
+
+The 3D model in cube_model.py is the reference: it moves piece objects with
+rotation matrices, which is right for rendering but far too slow for bulk
+work (validation, caching, search). This module describes the same cube as
+a flat uint8 array of 54 facelet colors and turns it with precomputed index
+permutations, so a turn is one numpy take and many states can be turned at
+once as an (N, 54) array.
+
+Layout: facelet ``face * 9 + row * 3 + col``, faces in FACE_NAMES order and
+each 3x3 grid oriented exactly like RubiksCubeModel.get_facelets(). A color
+is stored as its FACE_COLORS index, so color ``i`` belongs to face
+``FACE_NAMES[i]``; BLANK marks an unpainted facelet.
+
+The turn permutations are derived from RubiksCubeModel.rotate_face itself,
+so both engines agree by construction; cube_fuzz checks both against turns
+written out by hand. No GUI dependencies.
+"""
+
+import numpy as np
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from cube_model import (
+    COLORS,
+    FACE_COLORS,
+    FACE_NAMES,
+    GRID_SIZE,
+    LOCAL_FACE_NORMALS,
+    NET_FACE_BASIS,
+    FaceletState,
+    RubiksCubeModel,
+)
+
+FACELET_COUNT = 54
+BLANK = len(FACE_COLORS)  # unpainted facelet (COLORS['BLACK'])
+
+SOLVED_STATE = np.repeat(np.arange(len(FACE_NAMES), dtype=np.uint8), 9)
+CENTER_FACELETS = np.arange(len(FACE_NAMES)) * 9 + 4
+
+# Quarter turns as the model defines them, plus their inverses and halves
+MOVE_NAMES = [face + suffix for face in FACE_NAMES for suffix in ('', "'", '2')]
+
+# Corners and edges named by the faces they touch. Corner faces are listed
+# clockwise starting from the U/D face, edges start from the U/D face (or
+# F/B for the middle layer); that first facelet defines orientation 0.
+CORNER_NAMES = ['URF', 'UFL', 'ULB', 'UBR', 'DFR', 'DLF', 'DBL', 'DRB']
+EDGE_NAMES = ['UR', 'UF', 'UL', 'UB', 'DR', 'DF', 'DL', 'DB', 'FR', 'FL', 'BL', 'BR']
+
+
+def _face_vectors(face: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Integer (normal, right, up) basis of a face in the net layout"""
+    normal, right, up = NET_FACE_BASIS[face]
+    return normal.astype(int), right.astype(int), up.astype(int)
+
+
+def _facelet_keys() -> np.ndarray:
+    """Doubled sticker-center coordinates of every facelet, shape (54, 3).
+
+    A sticker sits half a unit outside its piece, so ``2 * piece + normal``
+    is an exact integer point that identifies the facelet in space.
+    """
+    keys = np.zeros((FACELET_COUNT, 3), dtype=int)
+    for face_index, face in enumerate(FACE_NAMES):
+        normal, right, up = _face_vectors(face)
+        for row in range(GRID_SIZE):
+            for col in range(GRID_SIZE):
+                piece = normal + (col - 1) * right + (1 - row) * up
+                keys[face_index * 9 + row * 3 + col] = 2 * piece + normal
+    return keys
+
+
+FACELET_KEYS = _facelet_keys()
+_KEY_INDEX = {tuple(key): index for index, key in enumerate(FACELET_KEYS)}
+
+
+def _piece_center(piece) -> np.ndarray:
+    """Grid position of a piece relative to the cube's center, (3,) int"""
+    grid = piece.grid_position
+    return np.array([grid.x, grid.y, grid.z]) - 1
+
+
+def _sticker_facelets(model: RubiksCubeModel) -> Dict[Tuple[str, int], int]:
+    """Facelet currently occupied by each sticker of the model.
+
+    Stickers are identified by (piece id, local face index), which stays
+    fixed while the piece moves, so two snapshots give a permutation.
+    """
+    result = {}
+    for piece in model.pieces:
+        center = _piece_center(piece)
+        for index, local_normal in enumerate(LOCAL_FACE_NORMALS):
+            if piece.colors[index] == COLORS['BLACK']:
+                continue
+            normal = piece.rotation_matrix @ local_normal
+            key = tuple(int(v) for v in 2 * center + normal)
+            result[(piece.id, index)] = _KEY_INDEX[key]
+    return result
+
+
+def _quarter_turn_permutation(face: str) -> np.ndarray:
+    """Index permutation of one model turn: ``new = old[perm]``"""
+    model = RubiksCubeModel()
+    before = _sticker_facelets(model)
+    model.rotate_face(face)
+    after = _sticker_facelets(model)
+
+    perm = np.empty(FACELET_COUNT, dtype=np.intp)
+    for sticker, index in after.items():
+        perm[index] = before[sticker]
+    return perm
+
+
+def _build_move_permutations() -> np.ndarray:
+    """Permutations for all 18 moves, indexed like MOVE_NAMES"""
+    perms = []
+    for face in FACE_NAMES:
+        quarter = _quarter_turn_permutation(face)
+        half = quarter[quarter]
+        perms.extend([quarter, half[quarter], half])
+    return np.array(perms)
+
+
+MOVE_PERMUTATIONS = _build_move_permutations()
+MOVE_INDEX = {name: index for index, name in enumerate(MOVE_NAMES)}
+
+
+def parse_moves(text: str) -> List[str]:
+    """Split a move string such as "R U R' U2" into validated move names"""
+    moves = text.split()
+    for move in moves:
+        if move not in MOVE_INDEX:
+            raise ValueError(f"Invalid move: {move}")
+    return moves
+
+
+def invert_moves(moves: Sequence[str]) -> List[str]:
+    """Sequence that undoes ``moves``"""
+    inverse = {'': "'", "'": '', '2': '2'}
+    return [move[0] + inverse[move[1:]] for move in reversed(moves)]
+
+
+def simplify_moves(moves: Sequence[str]) -> List[str]:
+    """Merge runs of turns of the same face (R R -> R2, R R' -> nothing)"""
+    quarters = {'': 1, '2': 2, "'": 3}
+    suffixes = {1: '', 2: '2', 3: "'"}
+    merged: List[List] = []  # [face, clockwise quarters]
+    for move in moves:
+        if merged and merged[-1][0] == move[0]:
+            merged[-1][1] = (merged[-1][1] + quarters[move[1:]]) % 4
+            if merged[-1][1] == 0:
+                merged.pop()
+        else:
+            merged.append([move[0], quarters[move[1:]]])
+    return [face + suffixes[count] for face, count in merged]
+
+
+def sequence_permutation(moves: Sequence[str]) -> np.ndarray:
+    """Compose a move sequence into a single facelet permutation"""
+    perm = np.arange(FACELET_COUNT)
+    for move in moves:
+        perm = perm[MOVE_PERMUTATIONS[MOVE_INDEX[move]]]
+    return perm
+
+
+def apply_move(states: np.ndarray, move: str) -> np.ndarray:
+    """Apply one move to a state (54,) or a batch of states (N, 54)"""
+    return states[..., MOVE_PERMUTATIONS[MOVE_INDEX[move]]]
+
+
+def apply_moves(states: np.ndarray, moves: Sequence[str]) -> np.ndarray:
+    """Apply a move sequence with a single gather, however long it is"""
+    return states[..., sequence_permutation(moves)]
+
+
+def state_from_facelets(facelets: Dict[str, List[List[str]]]) -> np.ndarray:
+    """Encode a get_facelets()/FaceletState grid; unknown colors become BLANK"""
+    color_index = {color: index for index, color in enumerate(FACE_COLORS)}
+    state = np.full(FACELET_COUNT, BLANK, dtype=np.uint8)
+    for face_index, face in enumerate(FACE_NAMES):
+        grid = facelets[face]
+        for row in range(GRID_SIZE):
+            for col in range(GRID_SIZE):
+                state[face_index * 9 + row * 3 + col] = color_index.get(
+                    grid[row][col], BLANK)
+    return state
+
+
+def facelets_from_state(state: np.ndarray) -> Dict[str, List[List[str]]]:
+    """Decode a state back to the per-face hex grids of get_facelets()"""
+    palette = FACE_COLORS + [COLORS['BLACK']]
+    return {
+        face: [[palette[state[face_index * 9 + row * 3 + col]]
+                for col in range(GRID_SIZE)]
+               for row in range(GRID_SIZE)]
+        for face_index, face in enumerate(FACE_NAMES)
+    }
+
+
+def state_from_model(model: RubiksCubeModel) -> np.ndarray:
+    """Compact state of the live 3D model"""
+    return state_from_facelets(model.get_facelets())
+
+
+def state_from_cube(cube) -> np.ndarray:
+    """Compact state of a RubiksCubeModel, FaceletState, facelet dict or state"""
+    if isinstance(cube, RubiksCubeModel):
+        return state_from_model(cube)
+    if isinstance(cube, FaceletState):
+        return state_from_facelets(cube.faces)
+    if isinstance(cube, dict):
+        return state_from_facelets(cube)
+    return np.asarray(cube, dtype=np.uint8)
+
+
+def state_from_pieces(pieces: Sequence) -> np.ndarray:
+    """Compact state read straight off CubePiece objects (e.g. model.pieces)"""
+    color_index = {color: index for index, color in enumerate(FACE_COLORS)}
+    state = np.full(FACELET_COUNT, BLANK, dtype=np.uint8)
+    for piece in pieces:
+        center = _piece_center(piece)
+        for index, local_normal in enumerate(LOCAL_FACE_NORMALS):
+            if piece.colors[index] == COLORS['BLACK']:
+                continue
+            normal = piece.rotation_matrix @ local_normal
+            key = tuple(int(v) for v in 2 * center + normal)
+            state[_KEY_INDEX[key]] = color_index.get(piece.colors[index], BLANK)
+    return state
+
+
+def relabel_by_centers(states: np.ndarray) -> np.ndarray:
+    """Rename colors so each face's center carries that face's color index.
+
+    Turns any color scheme (or a user who painted white on the front)
+    into the standard labelling the turn and solver tables assume. States
+    whose centers are not six distinct colors are returned unchanged;
+    validate_states() reports them.
+    """
+    batch = np.atleast_2d(states)
+    centers = batch[:, CENTER_FACELETS]
+    distinct = np.all(np.sort(centers, axis=1) == np.arange(len(FACE_NAMES)), axis=1)
+
+    lut = np.tile(np.arange(BLANK + 1, dtype=np.uint8), (len(batch), 1))
+    rows = np.nonzero(distinct)[0]
+    lut[rows[:, None], centers[rows]] = np.arange(len(FACE_NAMES), dtype=np.uint8)
+    result = np.take_along_axis(lut, batch.astype(np.intp), axis=1)
+    return result if states.ndim == 2 else result[0]
+
+
+def state_key(state: np.ndarray) -> bytes:
+    """Hashable key that is equal for states differing only in color scheme"""
+    return relabel_by_centers(state).astype(np.uint8).tobytes()
+
+
+# --- Packing --------------------------------------------------------------
+# 54 facelets x 3 bits fit three 64-bit words (18 facelets each). Stored big
+# endian and viewed as a 24-byte void scalar, byte order equals facelet
+# order, so numpy sorts, uniques and searchsorted work directly on them.
+
+PACKED_DTYPE = np.dtype('V24')
+_SHIFTS = (3 * np.arange(17, -1, -1)).astype(np.uint64)
+
+
+def pack_words(states: np.ndarray) -> np.ndarray:
+    """Pack states (..., 54) into three uint64 words each, shape (..., 3).
+
+    Comparing the words in order compares the states lexicographically.
+    """
+    batch = np.asarray(states).astype(np.uint64)
+    batch = batch.reshape(batch.shape[:-1] + (3, 18))
+    return np.bitwise_or.reduce(batch << _SHIFTS, axis=-1)
+
+
+def pack_states(states: np.ndarray) -> np.ndarray:
+    """Pack (N, 54) states into an (N,) array of sortable 24-byte records"""
+    words = pack_words(np.atleast_2d(states))
+    return np.ascontiguousarray(words.astype('>u8')).view(PACKED_DTYPE).ravel()
+
+
+def unpack_states(packed: np.ndarray) -> np.ndarray:
+    """Inverse of pack_states: (N,) records back to (N, 54) uint8 states"""
+    words = np.ascontiguousarray(packed).view('>u8').reshape(-1, 3).astype(np.uint64)
+    facelets = (words[:, :, None] >> _SHIFTS) & np.uint64(7)
+    return facelets.reshape(-1, FACELET_COUNT).astype(np.uint8)
+
+
+# --- Pieces ---------------------------------------------------------------
+
+def _piece_facelets(name: str) -> List[int]:
+    """Facelet indices of a corner/edge, in the order its name lists faces"""
+    normals = {face: _face_vectors(face)[0] for face in FACE_NAMES}
+    piece = sum(normals[face] for face in name)
+    return [_KEY_INDEX[tuple(2 * piece + normals[face])] for face in name]
+
+
+CORNER_FACELETS = np.array([_piece_facelets(name) for name in CORNER_NAMES])
+EDGE_FACELETS = np.array([_piece_facelets(name) for name in EDGE_NAMES])
+
+
+def _piece_lookup(names: List[str]) -> np.ndarray:
+    """Map a color bitmask (one bit per color) to the piece with those colors"""
+    lookup = np.full(1 << (BLANK + 1), -1, dtype=np.int8)
+    for index, name in enumerate(names):
+        lookup[sum(1 << FACE_NAMES.index(face) for face in name)] = index
+    return lookup
+
+
+_CORNER_LOOKUP = _piece_lookup(CORNER_NAMES)
+_EDGE_LOOKUP = _piece_lookup(EDGE_NAMES)
+_EDGE_PRIMARY = np.array([FACE_NAMES.index(name[0]) for name in EDGE_NAMES])
+_UD_COLORS = (FACE_NAMES.index('U'), FACE_NAMES.index('D'))
+
+
+def decode_cubies(states: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Identify the piece and orientation at every corner and edge slot.
+
+    Expects center-relabelled states (N, 54). Returns corner permutation
+    (N, 8), corner twist (N, 8), edge permutation (N, 12) and edge flip
+    (N, 12); a slot whose colors form no real piece gets piece -1.
+    """
+    batch = np.atleast_2d(states).astype(np.intp)
+    bit = np.left_shift(1, batch)
+
+    corner_colors = batch[:, CORNER_FACELETS]
+    corner_perm = _CORNER_LOOKUP[np.bitwise_or.reduce(bit[:, CORNER_FACELETS], axis=2)]
+    is_ud = (corner_colors == _UD_COLORS[0]) | (corner_colors == _UD_COLORS[1])
+    corner_twist = np.argmax(is_ud, axis=2)
+
+    edge_colors = batch[:, EDGE_FACELETS]
+    edge_perm = _EDGE_LOOKUP[np.bitwise_or.reduce(bit[:, EDGE_FACELETS], axis=2)]
+    primary = _EDGE_PRIMARY[np.maximum(edge_perm, 0)]
+    edge_flip = (edge_colors[:, :, 0] != primary).astype(np.intp)
+
+    return corner_perm, corner_twist, edge_perm, edge_flip
+
+
+def _permutation_parity(perm: np.ndarray) -> np.ndarray:
+    """Parity (0 even, 1 odd) of each row of an (N, k) permutation array"""
+    i, j = np.triu_indices(perm.shape[1], k=1)
+    return np.sum(perm[:, i] > perm[:, j], axis=1) % 2
+
+
+def validate_states(states: np.ndarray) -> List[Optional[str]]:
+    """Check a batch of states for solvability, all rows at once.
+
+    Returns one entry per state: None if the state can be reached from
+    solved by face turns, otherwise the first reason it cannot.
+    """
+    batch = relabel_by_centers(np.atleast_2d(states))
+    counts = np.stack([np.sum(batch == color, axis=1)
+                       for color in range(BLANK)], axis=1)
+    centers_ok = np.all(batch[:, CENTER_FACELETS] == np.arange(len(FACE_NAMES)), axis=1)
+
+    corner_perm, corner_twist, edge_perm, edge_flip = decode_cubies(batch)
+    corners_ok = np.all(np.sort(corner_perm, axis=1) == np.arange(8), axis=1)
+    edges_ok = np.all(np.sort(edge_perm, axis=1) == np.arange(12), axis=1)
+
+    checks = [
+        (np.all(counts == 9, axis=1), "each color must appear exactly 9 times"),
+        (centers_ok, "the six centers must all differ"),
+        (corners_ok, "corner pieces do not match a real cube"),
+        (edges_ok, "edge pieces do not match a real cube"),
+        (corner_twist.sum(axis=1) % 3 == 0, "a corner is twisted"),
+        (edge_flip.sum(axis=1) % 2 == 0, "an edge is flipped"),
+        (_permutation_parity(corner_perm) == _permutation_parity(edge_perm),
+         "two pieces are swapped (parity)"),
+    ]
+
+    errors: List[Optional[str]] = [None] * len(batch)
+    for passed, message in checks:
+        for row in np.nonzero(~passed)[0]:
+            if errors[row] is None:
+                errors[row] = message
+    return errors
@@ -0,0 +1,147 @@
+"""
+Rubik's Cube Symmetry - canonical representatives under the 48 cube symmetries
+
+Rotating the whole cube or viewing it in a mirror does not change how hard
+a state is or what its solutions look like, only which faces they turn.
+Conjugating a compact state (cube_state) by a symmetry moves every sticker
+and renames every color accordingly, so the centers stay put and the result
+is again a state in the standard labelling. Picking the lexicographically
+smallest of the 48 conjugates gives one representative per class, which
+lets caches and tables store a single entry for up to 48 states.
+
+Symmetry ``0`` is the identity; 1-23 are the proper rotations and 24-47 the
+mirrored ones. No GUI dependencies.
+"""
+
+import itertools
+
+import numpy as np
+from typing import List, Sequence, Tuple
+
+from cube_model import FACE_NAMES
+from cube_state import (
+    BLANK,
+    CENTER_FACELETS,
+    FACELET_KEYS,
+    pack_words,
+    relabel_by_centers,
+)
+
+
+def _symmetry_matrices() -> np.ndarray:
+    """All 48 signed permutation matrices, identity first, rotations before mirrors"""
+    matrices = []
+    for axes in itertools.permutations(range(3)):
+        for signs in itertools.product((1, -1), repeat=3):
+            matrix = np.zeros((3, 3), dtype=int)
+            matrix[range(3), axes] = signs
+            matrices.append(matrix)
+    return np.array(sorted(matrices, key=lambda m: (round(np.linalg.det(m)) < 0,
+                                                    not np.array_equal(m, np.eye(3)))))
+
+
+SYMMETRY_MATRICES = _symmetry_matrices()
+SYMMETRY_COUNT = len(SYMMETRY_MATRICES)
+IS_MIRROR = np.array([round(np.linalg.det(m)) < 0 for m in SYMMETRY_MATRICES])
+
+_KEY_INDEX = {tuple(key): index for index, key in enumerate(FACELET_KEYS)}
+_FACE_NORMALS = FACELET_KEYS[CENTER_FACELETS] // 3
+
+# Facelet gather per symmetry: the sticker that lands on facelet i under
+# matrix M came from M^T applied to i's position (M is orthogonal).
+SYMMETRY_PERMUTATIONS = np.array([
+    [_KEY_INDEX[tuple(matrix.T @ key)] for key in FACELET_KEYS]
+    for matrix in SYMMETRY_MATRICES
+])
+
+# Where each face (and therefore each color) is sent by each symmetry
+SYMMETRY_FACE_MAP = np.array([
+    [int(np.nonzero((_FACE_NORMALS == matrix @ normal).all(axis=1))[0][0])
+     for normal in _FACE_NORMALS]
+    for matrix in SYMMETRY_MATRICES
+])
+
+SYMMETRY_INVERSE = np.array([
+    next(j for j in range(SYMMETRY_COUNT)
+         if np.array_equal(SYMMETRY_MATRICES[i] @ SYMMETRY_MATRICES[j], np.eye(3)))
+    for i in range(SYMMETRY_COUNT)
+])
+
+# Color relabelling per symmetry, extended so BLANK maps to itself
+_COLOR_MAPS = np.concatenate(
+    [SYMMETRY_FACE_MAP, np.full((SYMMETRY_COUNT, 1), BLANK)], axis=1).astype(np.uint8)
+
+
+def conjugate(states: np.ndarray, symmetry: int) -> np.ndarray:
+    """Apply one symmetry to a state (54,) or batch (N, 54)"""
+    return _COLOR_MAPS[symmetry][states[..., SYMMETRY_PERMUTATIONS[symmetry]]]
+
+
+def all_conjugates(states: np.ndarray) -> np.ndarray:
+    """Every symmetric copy of each state, shape (N, 48, 54)"""
+    batch = np.atleast_2d(states)
+    moved = batch[:, SYMMETRY_PERMUTATIONS]  # (N, 48, 54)
+    return _COLOR_MAPS[np.arange(SYMMETRY_COUNT)[None, :, None], moved]
+
+
+def transform_moves(moves: Sequence[str], symmetry: int) -> List[str]:
+    """Rewrite a move sequence as it looks after applying ``symmetry``.
+
+    If ``moves`` takes state A to B, the result takes conjugate(A) to
+    conjugate(B). Mirrors reverse the direction of quarter turns.
+    """
+    flip = {'': "'", "'": '', '2': '2'} if IS_MIRROR[symmetry] else None
+    face_map = SYMMETRY_FACE_MAP[symmetry]
+    result = []
+    for move in moves:
+        face = FACE_NAMES[face_map[FACE_NAMES.index(move[0])]]
+        suffix = move[1:]
+        result.append(face + (flip[suffix] if flip else suffix))
+    return result
+
+
+def canonicalize(states: np.ndarray, colors: bool = False,
+                 symmetries: int = SYMMETRY_COUNT) -> Tuple[np.ndarray, np.ndarray]:
+    """Map each state to the smallest of its symmetric copies.
+
+    Args:
+        states: State (54,) or batch (N, 54) in the standard labelling
+        colors: Also treat states that differ only by a permutation of
+            colors as equal, by relabelling colors from the centers first
+        symmetries: 48 for rotations and mirrors, 24 for rotations only
+
+    Returns:
+        (canonical, symmetry) with ``canonical == conjugate(state, symmetry)``.
+        A solution found for the canonical state solves the original after
+        ``transform_moves(solution, SYMMETRY_INVERSE[symmetry])``.
+    """
+    batch = np.atleast_2d(states)
+    if colors:
+        batch = relabel_by_centers(batch)
+    candidates = all_conjugates(batch)[:, :symmetries]
+    words = pack_words(candidates)  # (N, S, 3)
+
+    # Lexicographic argmin over the packed words, one word at a time
+    best = np.ones(candidates.shape[:2], dtype=bool)
+    sentinel = np.iinfo(np.uint64).max
+    for k in range(words.shape[-1]):
+        word = np.where(best, words[:, :, k], sentinel)
+        best &= word == word.min(axis=1, keepdims=True)
+    chosen = np.argmax(best, axis=1)
+
+    canonical = candidates[np.arange(len(batch)), chosen]
+    if np.ndim(states) == 1:
+        return canonical[0], chosen[0]
+    return canonical, chosen
+
+
+def canonical_key(state: np.ndarray, colors: bool = True) -> bytes:
+    """Hashable key shared by every symmetric (and recolored) copy of a state"""
+    canonical, _ = canonicalize(state, colors=colors)
+    return canonical.astype(np.uint8).tobytes()
+
+
+def symmetry_count(state: np.ndarray) -> int:
+    """Number of symmetries that leave a standard-labelled state unchanged"""
+    copies = all_conjugates(state)[0]
+    return int(np.all(copies == copies[0], axis=1).sum())
@@ -0,0 +1,181 @@
+"""
+Rubik's Cube HUD Text - cached text textures and glyph atlases
+
+Rendering a label with pygame and pushing it through glDrawPixels every
+frame costs a font rasterization plus a full pixel upload per label. Here
+each (text, font, color) is rasterized once into a GL texture and kept in
+an LRU cache, so unchanged labels cost one textured quad per frame.
+Strings that change every frame (FPS, move counters) would churn that
+cache, so they are instead laid out glyph by glyph from a per-(font,
+color) atlas of the printable ASCII characters, built once.
+
+Coordinates follow the HUD overlay: top-left origin, y growing downward,
+and (x, y) is the bottom-left corner of the text as with glRasterPos.
+"""
+
+from collections import OrderedDict
+from typing import Dict, List, Tuple
+
+import pygame
+from OpenGL.GL import *
+
+ATLAS_CHARACTERS = ''.join(chr(code) for code in range(32, 127))
+
+
+def _upload(surface: pygame.Surface) -> int:
+    """Copy an RGBA surface (top row first) into a new texture"""
+    w, h = surface.get_size()
+    texture = glGenTextures(1)
+    glBindTexture(GL_TEXTURE_2D, texture)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MIN_FILTER, GL_NEAREST)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_MAG_FILTER, GL_NEAREST)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_S, GL_CLAMP_TO_EDGE)
+    glTexParameteri(GL_TEXTURE_2D, GL_TEXTURE_WRAP_T, GL_CLAMP_TO_EDGE)
+    glPixelStorei(GL_UNPACK_ALIGNMENT, 1)
+    glTexImage2D(GL_TEXTURE_2D, 0, GL_RGBA, w, h, 0, GL_RGBA, GL_UNSIGNED_BYTE,
+                 pygame.image.tobytes(surface, "RGBA", False))
+    return texture
+
+
+class GlyphAtlas:
+    """One texture holding every ATLAS_CHARACTERS glyph of a font and color"""
+
+    def __init__(self, font, color):
+        glyphs = [font.render(char, True, color) for char in ATLAS_CHARACTERS]
+        self.width = sum(glyph.get_width() for glyph in glyphs)
+        self.height = max(glyph.get_height() for glyph in glyphs)
+
+        sheet = pygame.Surface((max(1, self.width), self.height), pygame.SRCALPHA)
+        sheet.fill((0, 0, 0, 0))
+        # char -> (left pixel, width in pixels)
+        self.glyphs: Dict[str, Tuple[int, int]] = {}
+        left = 0
+        for char, glyph in zip(ATLAS_CHARACTERS, glyphs):
+            sheet.blit(glyph, (left, 0))
+            self.glyphs[char] = (left, glyph.get_width())
+            left += glyph.get_width()
+        self.texture = _upload(sheet)
+
+    def covers(self, text: str) -> bool:
+        return all(char in self.glyphs for char in text)
+
+    def layout(self, text: str, x: int, y: int) -> List[Tuple]:
+        """Glyph quads (left, top, right, bottom, u0, u1) for a string"""
+        quads = []
+        top = y - self.height
+        for char in text:
+            left, w = self.glyphs[char]
+            quads.append((x, top, x + w, y, left / self.width, (left + w) / self.width))
+            x += w
+        return quads
+
+    def delete(self):
+        glDeleteTextures([self.texture])
+
+
+class TextCache:
+    """
+    LRU cache of text textures for the HUD
+
+    ``draw`` + ``flush`` take the place of a per-frame font.render +
+    glDrawPixels per label. Needs a current GL context; textures are freed
+    on eviction and clear().
+    """
+
+    def __init__(self, capacity: int = 256):
+        """
+        Args:
+            capacity: Whole-string textures kept before the oldest is freed
+        """
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._textures: OrderedDict = OrderedDict()  # key -> (texture, w, h)
+        self._atlases: Dict[Tuple, GlyphAtlas] = {}
+        self._queued: Dict[int, List[Tuple]] = {}  # texture -> quads
+
+    def __len__(self) -> int:
+        return len(self._textures)
+
+    def draw(self, text: str, x: int, y: int, font, color, dynamic: bool = False):
+        """
+        Queue text at overlay position (x, y) (bottom-left corner)
+
+        Queued text is drawn by flush(), on top of everything else drawn in
+        between, so the texture state is switched once per frame rather
+        than once per label.
+
+        Args:
+            text: String to draw
+            font: pygame font
+            color: RGB tuple
+            dynamic: Text changes often; lay it out from the glyph atlas
+                instead of caching a texture per distinct string
+        """
+        if not text:
+            return
+        atlas = self._atlas(font, color) if dynamic else None
+        if atlas is not None and atlas.covers(text):
+            self._queued.setdefault(atlas.texture, []).extend(atlas.layout(text, x, y))
+        else:
+            texture, w, h = self._texture(text, font, color)
+            self._queued.setdefault(texture, []).append((x, y - h, x + w, y, 0.0, 1.0))
+
+    def flush(self):
+        """Draw all queued text, one batch of quads per texture"""
+        if not self._queued:
+            return
+        glEnable(GL_TEXTURE_2D)
+        glColor4f(1.0, 1.0, 1.0, 1.0)
+        for texture, quads in self._queued.items():
+            glBindTexture(GL_TEXTURE_2D, texture)
+            glBegin(GL_QUADS)
+            for left, top, right, bottom, u0, u1 in quads:
+                glTexCoord2f(u0, 0.0)
+                glVertex2f(left, top)
+                glTexCoord2f(u1, 0.0)
+                glVertex2f(right, top)
+                glTexCoord2f(u1, 1.0)
+                glVertex2f(right, bottom)
+                glTexCoord2f(u0, 1.0)
+                glVertex2f(left, bottom)
+            glEnd()
+        glBindTexture(GL_TEXTURE_2D, 0)
+        glDisable(GL_TEXTURE_2D)
+        self._queued = {}
+
+        # Evict only once nothing queued can still refer to the textures
+        while len(self._textures) > self.capacity:
+            _, (texture, _, _) = self._textures.popitem(last=False)
+            glDeleteTextures([texture])
+
+    def clear(self):
+        """Free every cached texture and atlas"""
+        if self._textures:
+            glDeleteTextures([texture for texture, _, _ in self._textures.values()])
+        self._textures.clear()
+        self._queued = {}
+        for atlas in self._atlases.values():
+            atlas.delete()
+        self._atlases.clear()
+
+    def _texture(self, text: str, font, color) -> Tuple[int, int, int]:
+        key = (text, font, tuple(color))
+        entry = self._textures.get(key)
+        if entry is not None:
+            self.hits += 1
+            self._textures.move_to_end(key)
+            return entry
+
+        self.misses += 1
+        surface = font.render(text, True, color)
+        entry = (_upload(surface), *surface.get_size())
+        self._textures[key] = entry
+        return entry
+
+    def _atlas(self, font, color) -> GlyphAtlas:
+        key = (font, tuple(color))
+        atlas = self._atlases.get(key)
+        if atlas is None:
+            atlas = self._atlases[key] = GlyphAtlas(font, color)
+        return atlas
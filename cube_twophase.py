@@ -0,0 +1,454 @@
+"""
+Rubik's Cube Two-Phase Solver - anytime search for ever shorter solutions
+
+Kociemba's two-phase algorithm: phase 1 turns the cube into the subgroup
+G1 = <U, D, R2, L2, F2, B2> (no twisted corners, no flipped edges, the four
+middle-layer edges in the middle layer), phase 2 solves it inside G1. Both
+phases are IDA* searches over small coordinates with NumPy-built move and
+pruning tables, so the first solution (typically 20-25 moves) arrives
+within a fraction of a second.
+
+The search is anytime: it keeps deepening phase 1 and yields every solution
+strictly shorter than the last, until a time or node budget runs out or
+phase 1 reaches the length of the best solution, which proves it optimal.
+TwoPhaseSearch is a generator (``for moves in search``) and an async
+iterator (``async for moves in search``, searching in a worker thread),
+and exposes its statistics as attributes while it runs. TwoPhaseSolver is
+the batch backend of solver_service.
+
+Tables take a few seconds to build; they are built once per process on
+first use, or loaded from an .npz file. No GUI dependencies.
+"""
+
+import asyncio
+import itertools
+import os
+import time
+from math import factorial
+from typing import Callable, Iterator, List, Optional
+
+import numpy as np
+
+from cube_state import (
+    MOVE_NAMES,
+    SOLVED_STATE,
+    apply_move,
+    decode_cubies,
+    relabel_by_centers,
+    state_from_cube,
+    validate_states,
+)
+
+DEFAULT_SECONDS = 1.0     # per-state budget of TwoPhaseSolver
+MAX_PHASE2_DEPTH = 18     # phase 2 needs at most 18 moves
+_CHECK_EVERY = 1 << 10    # nodes between budget checks
+PROGRESS_INTERVAL = 0.1   # seconds between progress callbacks
+
+# Cubie-level moves, read off the compact engine: (corner perm, corner
+# twist, edge perm, edge flip) of each of the 18 moves applied to solved
+_MOVES = [tuple(part[0].astype(np.intp) for part in decode_cubies(apply_move(SOLVED_STATE, move)))
+          for move in MOVE_NAMES]
+_FACE = [index // 3 for index in range(len(MOVE_NAMES))]  # FACE_NAMES index
+_G1_MOVES = [index for index, move in enumerate(MOVE_NAMES)
+             if move[0] in 'UD' or move.endswith('2')]
+_IN_G1 = [index in _G1_MOVES for index in range(len(MOVE_NAMES))]
+_SLICE_EDGES = 8  # edges 8-11 (FR, FL, BL, BR) belong to the middle layer
+
+_COMBINATIONS = list(itertools.combinations(range(12), 4))
+_COMBINATION_INDEX = np.full(1 << 12, -1, dtype=np.int32)
+for _index, _slots in enumerate(_COMBINATIONS):
+    _COMBINATION_INDEX[sum(1 << slot for slot in _slots)] = _index
+SLICE_SOLVED = int(_COMBINATION_INDEX[sum(1 << slot for slot in range(8, 12))])
+
+
+# --- Coordinates (vectorized over rows) --------------------------------------
+
+def _twist(twists: np.ndarray) -> np.ndarray:
+    return twists[:, :7] @ (3 ** np.arange(6, -1, -1))
+
+
+def _flip(flips: np.ndarray) -> np.ndarray:
+    return flips[:, :11] @ (2 ** np.arange(10, -1, -1))
+
+
+def _slice(edges: np.ndarray) -> np.ndarray:
+    return _COMBINATION_INDEX[(edges >= _SLICE_EDGES) @ (1 << np.arange(12))]
+
+
+def _rank(perms: np.ndarray) -> np.ndarray:
+    """Lexicographic rank of each row of an (N, k) permutation array"""
+    k = perms.shape[1]
+    rank = np.zeros(len(perms), dtype=np.int64)
+    for i in range(k - 1):
+        smaller = (perms[:, i + 1:] < perms[:, i:i + 1]).sum(axis=1)
+        rank += smaller * factorial(k - 1 - i)
+    return rank
+
+
+def _permutations(k: int) -> np.ndarray:
+    """All permutations of range(k) in rank order"""
+    return np.array(list(itertools.permutations(range(k))), dtype=np.intp)
+
+
+def _digits(values: np.ndarray, base: int, count: int) -> np.ndarray:
+    """Orientation arrays whose _twist/_flip is ``values``; the last digit
+    makes the total a multiple of ``base``"""
+    digits = np.zeros((len(values), count + 1), dtype=np.intp)
+    for i in range(count - 1, -1, -1):
+        digits[:, i] = values % base
+        values = values // base
+    digits[:, count] = -digits[:, :count].sum(axis=1) % base
+    return digits
+
+
+def _move_table(encode, moves) -> np.ndarray:
+    """(values, len(moves)) table: the coordinate after each move, where
+    ``encode(move)`` moves representatives of every value, in order"""
+    return np.stack([encode(move) for move in moves], axis=1).astype(np.int32)
+
+
+def _prune_table(move_a: np.ndarray, move_b: np.ndarray, start: int) -> np.ndarray:
+    """Moves needed to reach ``start`` for every (a, b) coordinate pair, by BFS"""
+    size_b = len(move_b)
+    depth = np.full(len(move_a) * size_b, -1, dtype=np.int8)
+    depth[start] = 0
+    frontier = np.array([start])
+    level = 0
+    while len(frontier):
+        level += 1
+        unseen = depth < 0
+        if len(frontier) < unseen.sum():
+            # Forward: mark the neighbours of the frontier
+            a, b = np.divmod(frontier, size_b)
+            reached = np.zeros(len(depth), dtype=bool)
+            reached[(move_a[a] * size_b + move_b[b]).ravel()] = True
+            frontier = np.nonzero(reached & unseen)[0]
+        else:
+            # Backward: unseen states with a neighbour in the frontier (the
+            # move sets are closed under inverses)
+            candidates = np.nonzero(unseen)[0]
+            a, b = np.divmod(candidates, size_b)
+            neighbours = depth[move_a[a] * size_b + move_b[b]]
+            frontier = candidates[(neighbours == level - 1).any(axis=1)]
+        depth[frontier] = level
+    return depth
+
+
+class TwoPhaseTables:
+    """Move and pruning tables of both phases"""
+
+    ARRAYS = ('twist_move', 'flip_move', 'slice_move', 'corner_move', 'edge_move',
+              'slice_perm_move', 'twist_prune', 'flip_prune', 'corner_prune', 'edge_prune')
+
+    def __init__(self, arrays: dict):
+        for name in self.ARRAYS:
+            setattr(self, name, arrays[name])
+
+    @classmethod
+    def build(cls) -> 'TwoPhaseTables':
+        """Compute every table from the cubie-level moves"""
+        all_moves = range(len(MOVE_NAMES))
+        twists = _digits(np.arange(3 ** 7), 3, 7)
+        flips = _digits(np.arange(2 ** 11), 2, 11)
+        slices = np.zeros((len(_COMBINATIONS), 12), dtype=np.intp)
+        for row, slots in enumerate(_COMBINATIONS):
+            rest = [slot for slot in range(12) if slot not in slots]
+            slices[row, list(slots)] = np.arange(_SLICE_EDGES, 12)
+            slices[row, rest] = np.arange(_SLICE_EDGES)
+        corners = _permutations(8)
+        edges = np.hstack([corners, np.tile(np.arange(8, 12), (len(corners), 1))])
+        slice_perms = np.hstack([np.tile(np.arange(8), (24, 1)), 8 + _permutations(4)])
+
+        # A move m takes state a to a * m: pieces a[m_perm], orientations
+        # a_orient[m_perm] + m_orient
+        arrays = {
+            'twist_move': _move_table(lambda m: _twist(
+                (twists[:, _MOVES[m][0]] + _MOVES[m][1]) % 3), all_moves),
+            'flip_move': _move_table(lambda m: _flip(
+                (flips[:, _MOVES[m][2]] + _MOVES[m][3]) % 2), all_moves),
+            'slice_move': _move_table(lambda m: _slice(
+                slices[:, _MOVES[m][2]]), all_moves),
+            'corner_move': _move_table(lambda m: _rank(
+                corners[:, _MOVES[m][0]]), _G1_MOVES),
+            'edge_move': _move_table(lambda m: _rank(
+                edges[:, _MOVES[m][2]][:, :8]), _G1_MOVES),
+            'slice_perm_move': _move_table(lambda m: _rank(
+                slice_perms[:, _MOVES[m][2]][:, 8:] - 8), _G1_MOVES),
+        }
+        arrays['twist_prune'] = _prune_table(arrays['slice_move'], arrays['twist_move'],
+                                             SLICE_SOLVED * 3 ** 7)
+        arrays['flip_prune'] = _prune_table(arrays['slice_move'], arrays['flip_move'],
+                                            SLICE_SOLVED * 2 ** 11)
+        arrays['corner_prune'] = _prune_table(arrays['slice_perm_move'], arrays['corner_move'], 0)
+        arrays['edge_prune'] = _prune_table(arrays['slice_perm_move'], arrays['edge_move'], 0)
+        return cls(arrays)
+
+    @classmethod
+    def load(cls, path: str) -> 'TwoPhaseTables':
+        with np.load(path) as data:
+            return cls({name: data[name] for name in cls.ARRAYS})
+
+    def save(self, path: str):
+        np.savez_compressed(path, **{name: getattr(self, name) for name in self.ARRAYS})
+
+
+_tables: Optional[TwoPhaseTables] = None
+_search_tables = None
+
+
+def load_tables(path: Optional[str] = None) -> TwoPhaseTables:
+    """The process-wide tables: built on first use, or read from (and
+    written to) an .npz file when a path is given"""
+    global _tables, _search_tables
+    if _tables is None:
+        if path and os.path.exists(path):
+            _tables = TwoPhaseTables.load(path)
+        else:
+            _tables = TwoPhaseTables.build()
+            if path:
+                _tables.save(path)
+        # Plain lists and bytes index far faster than arrays in the search
+        _search_tables = (
+            _tables.twist_move.tolist(), _tables.flip_move.tolist(),
+            _tables.slice_move.tolist(), _tables.corner_move.tolist(),
+            _tables.edge_move.tolist(), _tables.slice_perm_move.tolist(),
+            _tables.twist_prune.tobytes(), _tables.flip_prune.tobytes(),
+            _tables.corner_prune.tobytes(), _tables.edge_prune.tobytes(),
+        )
+    return _tables
+
+
+class _Stop(Exception):
+    """Unwinds the search when its budget runs out"""
+
+
+class TwoPhaseSearch:
+    """
+    Anytime two-phase search on one cube
+
+    Iterating yields move lists, each strictly shorter than the one before.
+    While it runs, ``nodes``, ``phase1_depth``, ``elapsed``, ``best`` and
+    ``solutions`` describe its progress; ``optimal`` becomes True once no
+    solution shorter than the last one (or than ``max_length``) exists,
+    ``exhausted`` once the budget ran out.
+    """
+
+    def __init__(self, cube, seconds: Optional[float] = None, nodes: Optional[int] = None,
+                 max_length: Optional[int] = None, tables: Optional[str] = None,
+                 progress: Optional[Callable[[float, str], None]] = None):
+        """
+        Args:
+            cube: RubiksCubeModel, FaceletState, facelet dict or compact
+                state (any color scheme; relabelled by centers)
+            seconds: Time budget, from the first next() (None: unlimited)
+            nodes: Node budget over both phases (None: unlimited)
+            max_length: Only look for solutions shorter than this (e.g.
+                a solution known already)
+            tables: Optional .npz path for load_tables
+            progress: Called as progress(fraction of the time budget,
+                message) every PROGRESS_INTERVAL; it may raise to abandon
+                the search (e.g. on cancel)
+
+        Raises:
+            ValueError: If the cube cannot be solved
+        """
+        state = relabel_by_centers(state_from_cube(cube))
+        error = validate_states(state)[0]
+        if error is not None:
+            raise ValueError(f"Invalid cube state: {error}")
+        load_tables(tables)
+        corner_perm, corner_twist, edge_perm, edge_flip = (
+            part[0].astype(np.intp) for part in decode_cubies(state))
+        self._solved = bool(np.array_equal(state, SOLVED_STATE))
+        self._corners = corner_perm.tolist()
+        self._edges = edge_perm.tolist()
+        self._start = (int(_twist(corner_twist[None])[0]), int(_flip(edge_flip[None])[0]),
+                       int(_slice(edge_perm[None])[0]))
+
+        self.seconds = seconds
+        self.max_nodes = nodes
+        self.progress = progress
+        self._reported = 0.0
+        self.nodes = 0
+        self.phase1_depth = 0
+        self.elapsed = 0.0
+        self.best: Optional[List[str]] = None
+        self._bound = max_length  # solutions must be shorter than this
+        self.solutions = 0
+        self.optimal = False
+        self.exhausted = False
+        self._started = None
+
+    def __iter__(self) -> Iterator[List[str]]:
+        return self._solutions()
+
+    def __aiter__(self):
+        return self._async_solutions()
+
+    async def _async_solutions(self):
+        """The same solutions, searched in the default executor"""
+        loop = asyncio.get_running_loop()
+        solutions = self._solutions()
+        while True:
+            moves = await loop.run_in_executor(None, next, solutions, None)
+            if moves is None:
+                return
+            yield moves
+
+    def _check(self):
+        self.elapsed = time.perf_counter() - self._started
+        if ((self.seconds is not None and self.elapsed >= self.seconds)
+                or (self.max_nodes is not None and self.nodes >= self.max_nodes)):
+            raise _Stop()
+        if self.progress and self.elapsed - self._reported >= PROGRESS_INTERVAL:
+            self._reported = self.elapsed
+            self.progress(self.elapsed / self.seconds if self.seconds else 0.0,
+                          f"searching phase 1 depth {self.phase1_depth}")
+
+    def _solutions(self) -> Iterator[List[str]]:
+        self._started = time.perf_counter()
+        twist, flip, slice_ = self._start
+        if self._solved:
+            if self._bound is None or self._bound > 0:
+                self.best, self.solutions = [], 1
+                yield []
+            self.optimal = True
+            return
+
+        (twist_move, flip_move, slice_move, _, _, _,
+         twist_prune, flip_prune, _, _) = _search_tables
+        depth = max(twist_prune[slice_ * 2187 + twist], flip_prune[slice_ * 2048 + flip])
+        try:
+            while self._bound is None or depth < self._bound:
+                self.phase1_depth = depth
+                # Iterative depth-first search over phase 1 paths of exactly
+                # ``depth`` moves; stack level i holds the state after i moves
+                path = [0] * depth
+                twists, flips, slices = [twist] * (depth + 1), [flip] * (depth + 1), \
+                    [slice_] * (depth + 1)
+                next_move = [0] * (depth + 1)
+                level = 0
+                while level >= 0:
+                    if level == depth:
+                        level -= 1
+                        if (twists[depth] or flips[depth] or slices[depth] != SLICE_SOLVED
+                                or (depth and _IN_G1[path[-1]])):
+                            continue
+                        moves = self._phase2_start(path)
+                        if moves is not None:
+                            self.best = [MOVE_NAMES[move] for move in path] + moves
+                            self._bound = len(self.best)
+                            self.solutions += 1
+                            self.elapsed = time.perf_counter() - self._started
+                            yield list(self.best)
+                            if len(self.best) <= depth:
+                                break
+                        continue
+                    move = next_move[level]
+                    if move == 18:
+                        level -= 1
+                        continue
+                    next_move[level] = move + 1
+                    if level:
+                        face, last = _FACE[move], _FACE[path[level - 1]]
+                        if face == last or (face ^ 1 == last and face < last):
+                            continue
+                    t = twist_move[twists[level]][move]
+                    f = flip_move[flips[level]][move]
+                    s = slice_move[slices[level]][move]
+                    self.nodes += 1
+                    if not self.nodes % _CHECK_EVERY:
+                        self._check()
+                    if max(twist_prune[s * 2187 + t], flip_prune[s * 2048 + f]) >= depth - level:
+                        continue
+                    path[level] = move
+                    level += 1
+                    twists[level], flips[level], slices[level] = t, f, s
+                    next_move[level] = 0
+                depth += 1
+            self.optimal = True
+        except _Stop:
+            self.exhausted = True
+        self.elapsed = time.perf_counter() - self._started
+
+    def _phase2_start(self, path: List[int]) -> Optional[List[str]]:
+        """Shortest phase 2 finish after a phase 1 path, shorter than needed
+        to beat the best solution, or None"""
+        limit = MAX_PHASE2_DEPTH
+        if self._bound is not None:
+            limit = min(limit, self._bound - len(path) - 1)
+        if limit < 0:
+            return None
+        corners, edges = self._corners, self._edges
+        for move in path:
+            corner_perm, _, edge_perm, _ = _MOVES[move]
+            corners = [corners[i] for i in corner_perm]
+            edges = [edges[i] for i in edge_perm]
+        corner = int(_rank(np.array([corners]))[0])
+        edge = int(_rank(np.array([edges[:8]]))[0])
+        slice_perm = int(_rank(np.array([edges[8:]]) - 8)[0])
+
+        _, _, _, corner_move, edge_move, slice_perm_move, _, _, corner_prune, edge_prune = \
+            _search_tables
+        bound = max(corner_prune[slice_perm * 40320 + corner],
+                    edge_prune[slice_perm * 40320 + edge])
+        last = _FACE[path[-1]] if path else -1
+        moves: List[int] = []
+
+        def search(corner: int, edge: int, slice_perm: int, togo: int, last: int) -> bool:
+            if togo == 0:
+                return corner == 0 and edge == 0 and slice_perm == 0
+            for index, move in enumerate(_G1_MOVES):
+                face = _FACE[move]
+                if face == last or (face ^ 1 == last and face < last):
+                    continue
+                c = corner_move[corner][index]
+                e = edge_move[edge][index]
+                p = slice_perm_move[slice_perm][index]
+                self.nodes += 1
+                if not self.nodes % _CHECK_EVERY:
+                    self._check()
+                if max(corner_prune[p * 40320 + c], edge_prune[p * 40320 + e]) < togo:
+                    moves.append(move)
+                    if search(c, e, p, togo - 1, face):
+                        return True
+                    moves.pop()
+            return False
+
+        for togo in range(bound, limit + 1):
+            if search(corner, edge, slice_perm, togo, last):
+                return [MOVE_NAMES[move] for move in moves]
+        return None
+
+
+def solve(cube, seconds: Optional[float] = DEFAULT_SECONDS,
+          nodes: Optional[int] = None) -> List[str]:
+    """Shortest solution found within the budget (searching on until the
+    first one if the budget ends before it)"""
+    best = None
+    for best in TwoPhaseSearch(cube, seconds, nodes):
+        pass
+    if best is None:
+        best = next(iter(TwoPhaseSearch(cube)))
+    return best
+
+
+class TwoPhaseSolver:
+    """solver_service backend: the best solution per state within a budget"""
+
+    def __init__(self, seconds: Optional[float] = DEFAULT_SECONDS,
+                 nodes: Optional[int] = None, tables: Optional[str] = None):
+        """
+        Args:
+            seconds, nodes: Budget per state, trading time for length
+            tables: Optional .npz path to load the tables from (and save to)
+        """
+        self.seconds = seconds
+        self.nodes = nodes
+        self.tables = tables
+
+    def warm(self):
+        load_tables(self.tables)
+
+    def solve_batch(self, states: np.ndarray) -> List[List[str]]:
+        return [solve(state, self.seconds, self.nodes) for state in states]
@@ -0,0 +1,241 @@
+"""
+Rubik's Cube Wall - many cubes per frame, laid out in tiles
+
+Shows a collection of cube states (a scramble set, every step of a
+solution) as a grid of small cubes sharing the main view's rotation. The
+per-frame data of all visible tiles is built with NumPy in one go, so the
+renderer issues the same few draw calls for five cubes or five hundred.
+The level of detail follows the projected cubie size, as for the main
+cube (cube_geometry.lod_tier):
+
+    full, plain  every piece as an instance of the shared cubie mesh, 28
+                 instances per tile (27 pieces plus a plastic core), for
+                 the instanced shader path
+    flat         one flat quad per visible sticker over one body quad per
+                 visible face, lit per face, for tiles too small to show
+                 bevels and outlines (and when instancing is unavailable)
+
+Tiles scrolled out of the view are dropped before any per-tile work.
+Cubes are drawn orthographically in window pixels (GL origin, y up).
+No GUI dependencies.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+from cube_geometry import (
+    HIDDEN_INDEX,
+    PALETTE,
+    PLASTIC_INDEX,
+    PLASTIC_SHADE,
+    STICKER_INSET,
+    hex_to_rgb,
+)
+from cube_model import (
+    CUBE_GAP,
+    CUBE_SIZE,
+    FACE_NAMES,
+    GRID_SIZE,
+    LOCAL_FACE_NORMALS,
+    NET_FACE_BASIS,
+    RubiksCubeModel,
+)
+from cube_state import FACELET_KEYS
+
+MIN_TILE = 72          # pixels; smaller tiles scroll instead of shrinking
+TILE_FILL = 0.92       # part of the tile the cube's bounding sphere spans
+
+# Lighting of the flat tier, as the fixed-function setup lights a cube
+# seen from the main camera: global plus LIGHT0 ambient, and the two
+# lights as directions from the cube's center in eye space
+FLAT_AMBIENT = 0.55
+FLAT_LIGHTS = [((5.0, 5.0, 13.0), 0.65), ((-3.0, 2.0, 5.0), 0.2)]
+
+PALETTE_RGB = np.array([hex_to_rgb(color) for color in PALETTE], dtype=np.float32)
+
+_PITCH = CUBE_SIZE + CUBE_GAP
+_OUTER = GRID_SIZE / 2 * CUBE_SIZE + (GRID_SIZE - 1) / 2 * CUBE_GAP
+_RADIUS = np.sqrt(3) * _OUTER  # bounding sphere of the whole cube
+_KEY_INDEX = {tuple(key): index for index, key in enumerate(FACELET_KEYS)}
+
+
+def _piece_tables() -> Tuple[np.ndarray, np.ndarray]:
+    """Home matrices (28, 4, 4) of the pieces plus the core, and the
+    facelet under each local face of each piece (27, 6), -1 if inside"""
+    model = RubiksCubeModel()
+    matrices = np.tile(np.eye(4), (len(model.pieces) + 1, 1, 1))
+    facelets = np.full((len(model.pieces), len(LOCAL_FACE_NORMALS)), -1)
+    for row, piece in enumerate(model.pieces):
+        grid = np.array([piece.grid_position.x, piece.grid_position.y,
+                         piece.grid_position.z]) - 1
+        matrices[row, :3, 3] = grid * _PITCH
+        for face, normal in enumerate(LOCAL_FACE_NORMALS):
+            key = tuple(int(v) for v in 2 * grid + normal)
+            facelets[row, face] = _KEY_INDEX.get(key, -1)
+    # The core: one cubie scaled to span the centers of the outer pieces,
+    # closing the gaps between pieces behind the hidden inner faces
+    matrices[-1, :3, :3] *= 2 * _PITCH / CUBE_SIZE
+    return matrices, facelets
+
+
+PIECE_MATRICES, PIECE_FACELETS = _piece_tables()
+INSTANCES_PER_CUBE = len(PIECE_MATRICES)
+
+
+def _quad(center: np.ndarray, right: np.ndarray, up: np.ndarray, half: float) -> np.ndarray:
+    """Corners of a square, clockwise seen from outside like the cubie mesh"""
+    return center + half * np.array([-right - up, -right + up, right + up, right - up])
+
+
+def _flat_tables() -> Tuple[np.ndarray, np.ndarray]:
+    """Body quad per face (6, 4, 3) and sticker quad per facelet (54, 4, 3)"""
+    bodies, stickers = [], []
+    for index, key in enumerate(FACELET_KEYS):
+        normal, right, up = NET_FACE_BASIS[FACE_NAMES[index // 9]]
+        grid = (key - normal) / 2
+        center = grid * _PITCH + normal * CUBE_SIZE / 2
+        stickers.append(_quad(center, right, up, STICKER_INSET * CUBE_SIZE / 2))
+    for face in FACE_NAMES:
+        normal, right, up = NET_FACE_BASIS[face]
+        bodies.append(_quad(normal * _OUTER, right, up, _OUTER))
+    return np.array(bodies), np.array(stickers)
+
+
+FACE_QUADS, STICKER_QUADS = _flat_tables()
+_FACE_NORMALS = np.array([NET_FACE_BASIS[face][0] for face in FACE_NAMES])
+
+
+class WallLayout:
+    """
+    Square tiles in rows, filling a rectangle and scrolling vertically
+
+    Rectangles use the HUD's window coordinates: top-left origin, y down.
+    """
+
+    def __init__(self, count: int, x: int, y: int, width: int, height: int,
+                 min_tile: int = MIN_TILE):
+        """
+        Args:
+            count: Number of cubes
+            x, y, width, height: Area the wall may use
+            min_tile: Smallest tile; below it the rows overflow and scroll
+        """
+        self.count = count
+        self.x, self.y, self.width, self.height = x, y, width, height
+
+        # Largest tile that fits everything, over every column count
+        size, columns = 0.0, 1
+        for candidate in range(1, max(1, count) + 1):
+            rows = -(-count // candidate)
+            fit = min(width / candidate, height / rows)
+            if fit > size:
+                size, columns = fit, candidate
+        if size < min_tile:
+            size, columns = min_tile, max(1, int(width // min_tile))
+        self.tile = int(size)
+        self.columns = columns
+        self.rows = -(-count // columns)
+        self.max_scroll = max(0, self.rows * self.tile - height)
+        self._left = x + (width - columns * self.tile) // 2
+
+    def clamp_scroll(self, scroll: float) -> float:
+        return min(max(0.0, scroll), float(self.max_scroll))
+
+    def visible(self, scroll: float) -> np.ndarray:
+        """Indices of the tiles that intersect the area at this scroll offset"""
+        if self.count == 0:
+            return np.empty(0, dtype=int)
+        first = int(scroll // self.tile)
+        last = min(self.rows - 1, int((scroll + self.height - 1) // self.tile))
+        return np.arange(first * self.columns, min(self.count, (last + 1) * self.columns))
+
+    def centers(self, indices: np.ndarray, scroll: float) -> np.ndarray:
+        """Tile centers (K, 2) in window coordinates"""
+        indices = np.asarray(indices)
+        column, row = indices % self.columns, indices // self.columns
+        return np.stack([self._left + (column + 0.5) * self.tile,
+                         self.y + (row + 0.5) * self.tile - scroll], axis=1)
+
+    def scale(self) -> float:
+        """Pixels per model unit, so a cube fits its tile at any rotation"""
+        return TILE_FILL * self.tile / (2 * _RADIUS)
+
+
+def detail_instances(states: np.ndarray, centers: np.ndarray, scale: float,
+                     view: np.ndarray) -> np.ndarray:
+    """
+    Instance data of the cubie shader for whole cubes, (K * 28, 22) float32
+
+    Args:
+        states: (K, 54) compact states
+        centers: (K, 2) tile centers in GL window coordinates
+        scale: Pixels per model unit
+        view: 4x4 rotation shared by every cube
+
+    Returns:
+        Per instance the column-major model matrix and six palette indices
+    """
+    count = len(states)
+    base = view @ PIECE_MATRICES
+    base[:, :3, :] *= scale
+    matrices = np.broadcast_to(base, (count,) + base.shape).copy()
+    matrices[:, :, 0, 3] += centers[:, 0, None]
+    matrices[:, :, 1, 3] += centers[:, 1, None]
+
+    palettes = np.full((count, INSTANCES_PER_CUBE, 6), PLASTIC_INDEX, dtype=np.float32)
+    colors = np.asarray(states)[:, np.maximum(PIECE_FACELETS, 0)]
+    palettes[:, :-1] = np.where(PIECE_FACELETS >= 0, colors, HIDDEN_INDEX)
+
+    data = np.empty((count, INSTANCES_PER_CUBE, 22), dtype=np.float32)
+    data[..., :16] = matrices.transpose(0, 1, 3, 2).reshape(count, INSTANCES_PER_CUBE, 16)
+    data[..., 16:] = palettes
+    return data.reshape(-1, 22)
+
+
+def face_shades(view: np.ndarray) -> np.ndarray:
+    """Brightness of each face under FLAT_LIGHTS after the view rotation, (6,)"""
+    normals = _FACE_NORMALS @ view[:3, :3].T
+    shade = np.full(len(normals), FLAT_AMBIENT)
+    for direction, diffuse in FLAT_LIGHTS:
+        light = np.asarray(direction) / np.linalg.norm(direction)
+        shade += diffuse * np.maximum(0.0, normals @ light)
+    return shade
+
+
+def flat_quads(states: np.ndarray, centers: np.ndarray, scale: float,
+               view: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Flat-shaded quads of whole cubes: body faces first, then stickers
+
+    Only faces turned toward the viewer are emitted, and cubes are convex
+    and do not overlap, so the quads need no depth test.
+
+    Args:
+        states, centers, scale, view: As for detail_instances
+
+    Returns:
+        Vertex positions (M, 2) and colors (M, 3), float32, four per quad
+    """
+    rotation = view[:3, :3]
+    faces = np.nonzero((_FACE_NORMALS @ rotation.T)[:, 2] > 1e-6)[0]
+    shades = face_shades(view)
+    facelets = (faces[:, None] * 9 + np.arange(9)).ravel()
+
+    body = (FACE_QUADS[faces] @ rotation.T)[..., :2] * scale
+    stickers = (STICKER_QUADS[facelets] @ rotation.T)[..., :2] * scale
+    offsets = centers[:, None, None, :]
+    positions = np.concatenate([
+        (offsets + body).reshape(-1, 2),
+        (offsets + stickers).reshape(-1, 2),
+    ]).astype(np.float32)
+
+    count = len(states)
+    body_colors = np.broadcast_to((PLASTIC_SHADE * shades[faces])[None, :, None, None],
+                                  (count, len(faces), 4, 3))
+    sticker_colors = (PALETTE_RGB[np.asarray(states)[:, facelets]]
+                      * shades[facelets // 9][None, :, None])
+    sticker_colors = np.broadcast_to(sticker_colors[:, :, None, :],
+                                     (count, len(facelets), 4, 3))
+    colors = np.concatenate([body_colors.reshape(-1, 3), sticker_colors.reshape(-1, 3)])
+    return positions, np.minimum(colors, 1.0).astype(np.float32)
@@ -12,21 +12,67 @@ Architecture:
 
 Usage:
     python rubiks_cube.py
+    python rubiks_cube.py --pacing vsync --stats
+    python rubiks_cube.py --pacing uncapped --continuous --stats   # benchmark
+    python rubiks_cube.py --wall 200    # 200 random scrambles side by side
+    python rubiks_cube.py --profile-startup --startup-log startup.jsonl
 """
 
+# First, so startup is timed from before the heavy imports
+from cube_startup import startup_profile
+
+import argparse
+import numpy as np
 import pygame
 from pygame.locals import *
-from cube_model import COLORS, FaceletState, RubiksCubeModel
+from cube_animation import TurnAnimator
+from cube_jobs import JobRunner, solve_job
+from cube_last_layer import recognize
+from cube_model import COLORS, FACE_AXES, FaceletState, RubiksCubeModel
+from cube_pacing import DEFAULT_FPS, PACING_MODES, FramePacer
+from cube_raster import random_states
 from cube_renderer import OpenGLRenderer
+from cube_state import apply_move, state_from_pieces
 import sys
 
+# Longest idle sleep in on-demand mode; a safety net, input wakes it sooner
+IDLE_WAIT_MS = 1000
+
+# Idle sleep while a background job runs, so its progress reaches the HUD
+JOB_POLL_MS = 50
+
+# Clockwise quarter turns of a move suffix (R, R2, R')
+_MOVE_QUARTERS = {'': 1, '2': 2, "'": -1}
+
+# Window events after which the back buffer must be redrawn
+_EXPOSE_EVENTS = (VIDEOEXPOSE, VIDEORESIZE, WINDOWEXPOSED, WINDOWSHOWN,
+                  WINDOWRESTORED, WINDOWSIZECHANGED)
+
+# The only event types queued at all; SDL drops the rest (text input,
+# joystick, touch, MOUSEWHEEL duplicates of buttons 4/5...) at the source
+_INPUT_EVENTS = (QUIT, KEYDOWN, MOUSEBUTTONDOWN, MOUSEBUTTONUP, MOUSEMOTION) + _EXPOSE_EVENTS
+
 
 class RubiksCubeApp:
     """
     Main application using OpenGL for high-performance rendering
     """
 
-    def __init__(self):
+    def __init__(self, on_demand: bool = True, pacing: str = 'fixed',
+                 target_fps: float = None, font_cache: str = None):
+        """
+        Args:
+            on_demand: Render only when something visible changed and sleep
+                until input arrives while idle (False: redraw every frame)
+            pacing: Frame pacing mode, one of cube_pacing.PACING_MODES
+            target_fps: Frame rate cap (default: the display's refresh
+                rate, or 60 Hz if it is unknown)
+            font_cache: Font lookup cache file (default: the per-user
+                cache directory, see cube_startup.FontCache)
+        """
+        if pacing not in PACING_MODES:
+            raise ValueError(f"Invalid pacing mode: {pacing}")
+        startup_profile().mark('imports')
         print("Initializing Rubik's Cube 3D...")
 
         # Initialize Model
@@ -39,14 +85,31 @@ class RubiksCubeApp:
             print("Colors correctly placed on outer faces only")
         else:
             print("WARNING: Color placement validation failed!")
+        startup_profile().mark('model')
 
         # Initialize Renderer
         print("Creating renderer (hardware accelerated)...")
-        self.renderer = OpenGLRenderer(width=1200, height=800)
+        self.renderer = OpenGLRenderer(width=1200, height=800, vsync=pacing == 'vsync',
+                                       font_cache=font_cache)
+        pygame.event.set_blocked(None)
+        pygame.event.set_allowed(list(_INPUT_EVENTS))
+
+        # Frame pacing; without vsync from the driver, hold the rate by timer
+        if pacing == 'vsync' and not self.renderer.vsync:
+            pacing = 'fixed'
+        self.pacer = FramePacer(pacing, target_fps or self.renderer.refresh_rate() or DEFAULT_FPS)
+        print(f"Frame pacing: {self.pacer.mode} at {self.pacer.target_fps:g} Hz")
 
         # Application state
         self.running = True
-        self.clock = pygame.time.Clock()
+        self.on_demand = on_demand
+        self._force_redraw = True
+
+        # Face turns are animated; the model only sees finished turns
+        self.animator = TurnAnimator()
+
+        # Solves run in a worker process on a snapshot of the model
+        self.jobs = JobRunner()
 
         # Color-picker (edit) state
         self.edit_mode = False
@@ -55,6 +118,15 @@ class RubiksCubeApp:
                         ('RED', 'ORANGE', 'BLUE', 'GREEN', 'WHITE', 'YELLOW')]
         self.selected_color = self.palette[0]
 
+        # Multi-cube wall: (N, 54) states shown instead of the cube, or None
+        self.wall = None
+
+        # Facelets of the 3D cube, cached per model version
+        self._facelets = None
+        self._facelets_version = None
+        self._last_layer = None
+
+        startup_profile().mark('controller')
         print("Initialization complete!")
         self._print_instructions()
 
@@ -75,14 +147,37 @@ class RubiksCubeApp:
         print("  • R/L: Rotate Right/Left face")
         print("  • U/D: Rotate Up/Down face")
         print("  • S: Scramble cube")
+        print("  • Enter: Solve by animated moves (Backspace cancels)")
         print("  • Space: Solve (reset)")
-        print("  • E: Edit mode (click a palette color, then paint cells)")
+        print("  • E: Edit mode (click a palette color, then paint cells or stickers)")
+        print("  • W: Wall of every step of the move history (wheel scrolls)")
         print("  • ESC/Q: Quit")
         print("="*60 + "\n")
 
-    def handle_events(self):
-        """Handle all pygame events"""
-        for event in pygame.event.get():
+    def handle_events(self, events=None):
+        """Handle all pygame events (or the given ones).
+
+        High-rate input is coalesced: a run of mouse motion is applied as
+        one move to its last position and a run of wheel steps as one zoom
+        or scroll, so the view is updated a bounded number of times per
+        frame however many events a fast mouse queued. Runs end at the
+        events whose order matters (clicks, keys).
+        """
+        motion, wheel = None, 0
+        for event in pygame.event.get() if events is None else events:
+            if event.type == MOUSEMOTION:
+                motion = event.pos
+                continue
+            if event.type == MOUSEBUTTONDOWN and event.button in (4, 5):
+                wheel += 1 if event.button == 4 else -1  # up zooms in
+                continue
+            if motion is not None or wheel:
+                self._apply_pointer(motion, wheel)
+                motion, wheel = None, 0
+
+            if event.type in _EXPOSE_EVENTS:
+                self._force_redraw = True
+
             if event.type == QUIT:
                 self.running = False
 
@@ -95,36 +190,71 @@ class RubiksCubeApp:
                         self._handle_paint_click(event.pos)
                     else:
                         self.renderer.handle_mouse_press(event.pos)
-                elif event.button == 4:  # Scroll up
-                    self.renderer.handle_mouse_wheel(1)
-                elif event.button == 5:  # Scroll down
-                    self.renderer.handle_mouse_wheel(-1)
 
             elif event.type == MOUSEBUTTONUP:
                 if event.button == 1:
                     self.renderer.handle_mouse_release()
 
-            elif event.type == MOUSEMOTION:
-                self.renderer.handle_mouse_motion(event.pos)
-
             elif event.type == VIDEORESIZE:
                 self.renderer.resize(event.w, event.h)
+        if motion is not None or wheel:
+            self._apply_pointer(motion, wheel)
+
+    def _apply_pointer(self, motion, wheel: int):
+        """Apply a coalesced run of mouse motion (last position) and wheel steps"""
+        if motion is not None:
+            self.renderer.handle_mouse_motion(motion)
+        if wheel:
+            self.renderer.handle_mouse_wheel(wheel)
 
     def _handle_paint_click(self, pos):
-        """In edit mode, a click selects a palette color or paints a cell"""
+        """In edit mode, a click selects a palette color or paints a cell
+        of the net or a sticker of the 3D cube"""
         color = self.renderer.palette_color_at(pos)
         if color is not None:
             self.selected_color = color
             return
         cell = self.renderer.cell_at(pos)
+        if cell is None:
+            cell = self.renderer.facelet_at(pos)
         if cell is not None:
             face, row, col = cell
             self.editor.paint(face, row, col, self.selected_color)
 
+    def _commit_turns(self, turns):
+        """Apply finished (face, clockwise quarter turns) pairs to the model,
+        all of a frame's turns as one model update"""
+        if turns:
+            self.model.apply_turns(turns)
+
+    def _model_facelets(self):
+        """Facelets of the 3D cube, recomputed only when the model changed.
+
+        The last-layer case is looked up along with them.
+        """
+        if self._facelets_version != self.model.version:
+            self._facelets = self.model.get_facelets()
+            self._facelets_version = self.model.version
+            self._last_layer = recognize(self._facelets)
+        return self._facelets
+
+    def _current_turn(self):
+        """The animating layer for the renderer, or None when idle"""
+        current = self.animator.current_turn()
+        if current is None:
+            return None
+        face, angle = current
+        return {
+            'axis': FACE_AXES[face],
+            'angle': angle,
+            'pieces': {piece.id for piece in self.model.get_face_pieces(face)},
+        }
+
     def _toggle_edit_mode(self):
         """Enter/leave the color picker; entering opens a clean net to paint"""
         self.edit_mode = not self.edit_mode
         if self.edit_mode:
+            self._commit_turns(self.animator.flush())
             self.editor = FaceletState(self.model.get_facelets())
             self.editor.clear()
             print("Edit mode ON - click a color then paint cells (C clears)")
@@ -134,9 +264,12 @@ class RubiksCubeApp:
     def _handle_keypress(self, key: int):
         """Handle keyboard input"""
         # Edit mode toggle is always available
-        if key == K_e:
+        if key == K_e and self.wall is None:
             self._toggle_edit_mode()
             return
+        if key == K_w and not self.edit_mode:
+            self.show_wall(None if self.wall is not None else self._history_states())
+            return
 
         # Quit is always available
         if key == K_ESCAPE or key == K_q:
@@ -149,72 +282,173 @@ class RubiksCubeApp:
             if key == K_c:
                 self.editor.clear()
             return
+        if self.wall is not None:
+            return
 
-        # Face rotations
+        # Face rotations (queued and animated, committed when finished)
         if key == K_f:
-            self.model.rotate_face('F')
+            self.animator.enqueue('F')
         elif key == K_b:
-            self.model.rotate_face('B')
+            self.animator.enqueue('B')
         elif key == K_r:
-            self.model.rotate_face('R')
+            self.animator.enqueue('R')
         elif key == K_l:
-            self.model.rotate_face('L')
+            self.animator.enqueue('L')
         elif key == K_u:
-            self.model.rotate_face('U')
+            self.animator.enqueue('U')
         elif key == K_d:
-            self.model.rotate_face('D')
+            self.animator.enqueue('D')
 
         # Actions
         elif key == K_s:
             print("Scrambling cube...")
+            self._commit_turns(self.animator.flush())
             self.model.scramble()
             print("Cube scrambled!")
+        elif key == K_RETURN:
+            self._start_solve()
+        elif key == K_BACKSPACE:
+            if self.jobs.active is not None:
+                self.jobs.cancel()
+                print("Solve cancelled")
         elif key == K_SPACE:
             print("Solving cube...")
+            self.jobs.cancel()
+            self.animator.clear()
             self.model.reset()
             print("Cube solved!")
 
+    def show_wall(self, states):
+        """Show (N, 54) states as a wall of cubes, or the 3D cube for None"""
+        self.wall = states
+        print(f"Wall of {len(states)} cubes" if states is not None else "Wall closed")
+
+    def _history_states(self) -> np.ndarray:
+        """The cube after every move of the history, starting before the first"""
+        self._commit_turns(self.animator.flush())
+        states = [state_from_pieces(self.model.pieces)]
+        for face in reversed(self.model.move_history):
+            states.append(apply_move(states[-1], face + "'"))
+        return np.array(states[::-1])
+
+    def _start_solve(self):
+        """Search for a solution in the background; the cube stays usable"""
+        self._commit_turns(self.animator.flush())  # solve what is on screen
+        if self.model.is_solved():
+            return
+        job = self.jobs.submit('Solving', solve_job, self.model)
+        print(f"Solving in the background (job {job.id})...")
+
+    def _poll_jobs(self):
+        """Collect finished background jobs; play a solution as turns"""
+        for job in self.jobs.poll():
+            if job.status == 'failed':
+                print(f"{job.name} failed: {job.error}")
+            elif job.status == 'done':
+                # A solve starts from a flushed animator, so any turn still
+                # queued or animating was made after the snapshot
+                if job.model_version != self.model.version or self.animator.busy:
+                    print("Cube changed while solving; solution discarded")
+                    continue
+                if not job.result:
+                    print(f"{job.name}: no moves to play")
+                    continue
+                print(f"Solution ({len(job.result)} moves): {' '.join(job.result)}")
+                for move in job.result:
+                    self.animator.enqueue(move[0], _MOVE_QUARTERS[move[1:]])
+
+    def _frame_key(self, turn):
+        """Everything the picture depends on, except the FPS readout"""
+        edit = (self.editor.version, self.selected_color) if self.edit_mode else None
+        angle = (turn['axis'], turn['angle']) if turn else None
+        job = self.jobs.active
+        task = (job.id, job.progress, job.message) if job else None
+        wall = id(self.wall) if self.wall is not None else None
+        return (self.model.version, self.edit_mode, edit, angle, task, wall,
+                self.renderer.view_state())
+
+    def _status(self):
+        """Live state for the HUD. In edit mode the net shows the editable
+        buffer; otherwise it mirrors the 3D cube."""
+        if self.edit_mode:
+            facelets = self.editor.faces
+            version = self.editor.version
+            valid = self.editor.is_valid()
+        else:
+            facelets = self._model_facelets()
+            version = self.model.version
+            valid = True
+        return {
+            'fps': self.pacer.get_fps(),
+            'moves': self.model.move_count,
+            'last_move': self.model.last_move,
+            'solved': self.model.is_solved(),
+            'last_layer': None if self.edit_mode else self._last_layer,
+            'facelets': facelets,
+            'facelets_version': version,
+            'model_version': self.model.version,
+            'edit_mode': self.edit_mode,
+            'palette': self.palette,
+            'selected_color': self.selected_color,
+            'valid': valid,
+            'job': self.jobs.active,
+        }
+
     def run(self):
         """Main application loop"""
         print("Starting main loop...")
 
+        dt = 0.0
+        last_frame = None
         while self.running:
-            # Handle events
-            self.handle_events()
-
-            # Render cube with live status for the HUD. In edit mode the net
-            # shows the editable buffer; otherwise it mirrors the 3D cube.
-            pieces = self.model.get_all_pieces()
-            if self.edit_mode:
-                facelets = self.editor.faces
-                valid = self.editor.is_valid()
+            if self.on_demand and last_frame is not None and not self.animator.busy:
+                # Nothing is moving: sleep until input (or the safety timeout)
+                wait = JOB_POLL_MS if self.jobs.active else IDLE_WAIT_MS
+                events = [pygame.event.wait(wait)] + pygame.event.get()
+                self.pacer.restart()  # restart frame timing after the idle gap
+                self.handle_events(events)
+                dt = 0.0
             else:
-                facelets = self.model.get_facelets()
-                valid = True
-            status = {
-                'fps': self.clock.get_fps(),
-                'moves': self.model.move_count,
-                'last_move': self.model.last_move,
-                'solved': self.model.is_solved(),
-                'facelets': facelets,
-                'edit_mode': self.edit_mode,
-                'palette': self.palette,
-                'selected_color': self.selected_color,
-                'valid': valid,
-            }
-            self.renderer.render(pieces, status)
-
-            # Maintain 60 FPS
-            self.clock.tick(60)
+                self.handle_events()
+
+            # Pick up background job progress and finished solutions
+            self._poll_jobs()
+
+            # Advance the turn animation and commit turns that finished
+            self._commit_turns(self.animator.update(dt))
+
+            # Render only frames that differ from the one on screen
+            turn = self._current_turn()
+            frame = self._frame_key(turn)
+            if not self.on_demand or self._force_redraw or frame != last_frame:
+                cubes = self.wall if self.wall is not None else self.model.get_all_pieces()
+                self.renderer.render(cubes, self._status(), turn)
+                last_frame = frame
+                self._force_redraw = False
+                if not startup_profile().finished:
+                    startup_profile().finish('first frame')
+                    print(f"First frame after {startup_profile().total_ms:.0f} ms")
+
+            # Hold the frame rate while drawing
+            dt = self.pacer.tick()
 
         # Cleanup
+        self.jobs.shutdown()
         self.renderer.cleanup()
         print("\nThanks for playing!")
 
+    def frame_stats(self) -> dict:
+        """Frame-time statistics of the recent frames (see FramePacer.stats)"""
+        return self.pacer.stats()
+
     def print_performance_info(self):
         """Print performance information"""
-        fps = self.clock.get_fps()
-        print(f"\nPerformance: {fps:.1f} FPS")
+        stats = self.frame_stats()
+        print(f"\nPerformance: {stats['fps']:.1f} FPS ({stats['mode']} pacing, "
+              f"target {stats['target_fps']:g} Hz)")
+        print(f"Frame times: p50 {stats['p50_ms']:.2f} ms, p95 {stats['p95_ms']:.2f} ms, "
+              f"p99 {stats['p99_ms']:.2f} ms, max {stats['max_ms']:.2f} ms; "
+              f"{stats['missed']} of {stats['frames']} frames missed their deadline")
         print(f"Camera Distance: {self.renderer.camera_distance:.1f}")
         print(f"Cube Rotation: X={self.renderer.cube_rotation_x:.1f}°, "
               f"Y={self.renderer.cube_rotation_y:.1f}°")
@@ -222,6 +456,25 @@ class RubiksCubeApp:
 
 def main():
     """Main entry point"""
+    parser = argparse.ArgumentParser(description="Interactive 3D Rubik's Cube")
+    parser.add_argument('--pacing', choices=PACING_MODES, default='fixed',
+                        help="vsync, fixed-rate timer, or uncapped (benchmarking)")
+    parser.add_argument('--fps', type=float,
+                        help="frame rate cap (default: the display refresh rate)")
+    parser.add_argument('--continuous', action='store_true',
+                        help="redraw every frame, even when nothing changes")
+    parser.add_argument('--stats', action='store_true',
+                        help="print frame-time statistics on exit")
+    parser.add_argument('--wall', type=int, metavar='N',
+                        help="start with a wall of N random scrambles")
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="print the time of each startup phase on exit")
+    parser.add_argument('--startup-log', metavar='FILE',
+                        help="append the startup times of this run to FILE (JSON Lines)")
+    parser.add_argument('--font-cache', metavar='FILE',
+                        help="font lookup cache (default: ~/.cache/rubiks_cube/fonts.json)")
+    args = parser.parse_args()
+
     print("\n" + "="*60)
     print("RUBIK'S CUBE 3D - INTERACTIVE VISUALIZATION")
     print("="*60)
@@ -234,14 +487,27 @@ def main():
     print("="*60 + "\n")
 
     # Create and run application
-    app = RubiksCubeApp()
+    app = RubiksCubeApp(on_demand=not args.continuous, pacing=args.pacing,
+                        target_fps=args.fps, font_cache=args.font_cache)
+    if args.wall:
+        app.show_wall(random_states(args.wall))
 
     try:
         app.run()
     except KeyboardInterrupt:
         print("\n\nInterrupted by user")
+        app.jobs.shutdown()
         app.renderer.cleanup()
         sys.exit(0)
+    finally:
+        if args.stats:
+            app.print_performance_info()
+        profile = startup_profile()
+        if args.profile_startup and profile.finished:
+            print("\nStartup (time to first frame):")
+            print(profile.report())
+        if args.startup_log and profile.finished:
+            profile.append_log(args.startup_log)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,298 @@
+#!/usr/bin/env python3
+"""
+Rubik's Cube Solver Service - long-running local solve/validate server
+
+Loading solver tables costs far more than answering one request, so this
+process loads them once and keeps them warm. Clients connect over a Unix
+socket or TCP and exchange newline-delimited JSON:
+
+    -> {"id": 1, "op": "solve", "facelets": {"U": [[...], ...], ...}}
+    <- {"id": 1, "ok": true, "valid": true, "moves": ["R", "U'"], "cached": false}
+
+``op`` is "validate", "solve" or "stats"; ``facelets`` is a FaceletState
+grid. Requests from all connections that arrive within a short window are
+micro-batched into one (N, 54) array and validated/solved together in a
+worker thread, the number of requests in flight is capped, and solutions
+are kept in an LRU cache keyed by the symmetry-canonical state, so every
+rotated, mirrored or recolored copy of a scramble shares one entry.
+
+The command line serves the two-phase solver (cube_twophase), which gets a
+time budget per state: more seconds buy shorter solutions.
+
+Usage:
+    python solver_service.py --unix /tmp/rubiks.sock
+    python solver_service.py --port 8765 --seconds 0.2 --tables /tmp/twophase.npz
+"""
+
+import argparse
+import asyncio
+import json
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+from cube_model import FaceletState
+from cube_state import relabel_by_centers, state_from_facelets, validate_states
+from cube_symmetry import SYMMETRY_INVERSE, canonicalize, transform_moves
+from cube_twophase import DEFAULT_SECONDS, TwoPhaseSolver
+
+OPS = ('validate', 'solve', 'stats')
+
+
+class LRUCache:
+    """Fixed-capacity mapping that evicts the least recently used entry"""
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable):
+        """Return the cached value (marking it recent) or None"""
+        if key not in self._entries:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return self._entries[key]
+
+    def put(self, key: Hashable, value):
+        """Insert or refresh an entry, evicting the oldest when full"""
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.capacity:
+            self._entries.popitem(last=False)
+
+
+class SolverService:
+    """
+    Batching front end for a cube solver
+
+    The solver is any object with ``solve_batch(states) -> List[List[str]]``
+    taking center-relabelled (N, 54) states from cube_state and returning
+    one move list per state, plus an optional ``warm()`` that loads its
+    tables. Without a solver the service still validates states.
+    """
+
+    def __init__(self, solver=None, max_batch: int = 64, batch_window: float = 0.002,
+                 max_in_flight: int = 256, cache_size: int = 10000):
+        """
+        Args:
+            solver: Solver backend, or None for a validate-only service
+            max_batch: Largest number of states processed together
+            batch_window: Seconds to wait for more requests before a batch runs
+            max_in_flight: Requests admitted at once; later ones wait
+            cache_size: Number of solutions kept in the LRU cache
+        """
+        self.solver = solver
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self.cache = LRUCache(cache_size)
+        self.batches = 0
+        self.batched_requests = 0
+
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._pending: List[Tuple[str, np.ndarray, bytes, int, asyncio.Future]] = []
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+
+    async def start(self):
+        """Load solver tables before the first request is accepted"""
+        warm = getattr(self.solver, 'warm', None)
+        if warm is not None:
+            await asyncio.get_running_loop().run_in_executor(None, warm)
+
+    async def handle_request(self, message: Dict) -> Dict:
+        """Answer one decoded request dict"""
+        response = {'id': message.get('id')}
+        op = message.get('op')
+        if op not in OPS:
+            response.update(ok=False, error=f"unknown op: {op}")
+            return response
+        if op == 'stats':
+            response.update(ok=True, **self.stats())
+            return response
+
+        try:
+            editor = FaceletState(message['facelets'])
+            state = state_from_facelets(editor.faces)
+        except (KeyError, IndexError, TypeError, AttributeError):
+            response.update(ok=False, error="missing or malformed facelets")
+            return response
+
+        async with self._in_flight:
+            response.update(await self._submit(op, state))
+        return response
+
+    def stats(self) -> Dict:
+        """Counters for monitoring batching and cache effectiveness"""
+        return {
+            'cache_size': len(self.cache),
+            'cache_hits': self.cache.hits,
+            'cache_misses': self.cache.misses,
+            'batches': self.batches,
+            'mean_batch': self.batched_requests / self.batches if self.batches else 0.0,
+        }
+
+    async def _submit(self, op: str, state: np.ndarray) -> Dict:
+        """Answer from the cache or queue the state for the next batch.
+
+        Work is done on the canonical representative; solutions are mapped
+        back to the caller's orientation with the symmetry that produced it.
+        """
+        canonical, symmetry = canonicalize(state, colors=True)
+        key = canonical.tobytes()
+        if op == 'solve':
+            moves = self.cache.get(key)
+            if moves is not None:
+                return {'ok': True, 'valid': True, 'cached': True,
+                        'moves': transform_moves(moves, SYMMETRY_INVERSE[symmetry])}
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((op, canonical, key, int(symmetry), future))
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_timer is None:
+            self._flush_timer = asyncio.get_running_loop().call_later(
+                self.batch_window, self._flush)
+        return await future
+
+    def _flush(self):
+        """Hand everything queued so far to a worker thread as one batch"""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            asyncio.ensure_future(self._run_batch(batch))
+
+    async def _run_batch(self, batch: List[Tuple[str, np.ndarray, bytes, int, asyncio.Future]]):
+        ops = [op for op, _, _, _, _ in batch]
+        states = np.stack([state for _, state, _, _, _ in batch])
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(
+                None, self._process_batch, ops, states)
+        except Exception as error:  # surface solver failures to every caller
+            results = [{'ok': False, 'error': str(error)}] * len(batch)
+
+        self.batches += 1
+        self.batched_requests += len(batch)
+        for (op, _, key, symmetry, future), result in zip(batch, results):
+            if op == 'solve' and 'moves' in result:
+                self.cache.put(key, result['moves'])
+                result = dict(result, moves=transform_moves(
+                    result['moves'], SYMMETRY_INVERSE[symmetry]))
+            if not future.done():
+                future.set_result(result)
+
+    def _process_batch(self, ops: List[str], states: np.ndarray) -> List[Dict]:
+        """Validate every state, then solve the valid ones (worker thread)"""
+        states = relabel_by_centers(states)
+        errors = validate_states(states)
+        results = [{'ok': True, 'valid': error is None, 'error': error} for error in errors]
+
+        # Symmetric copies in one batch share a canonical state, solved once
+        unique: Dict[bytes, List[int]] = {}
+        for index, (op, error) in enumerate(zip(ops, errors)):
+            if op == 'solve' and error is None:
+                unique.setdefault(states[index].tobytes(), []).append(index)
+        if not unique:
+            return results
+        if self.solver is None:
+            for indices in unique.values():
+                for index in indices:
+                    results[index].update(ok=False, error="no solver configured")
+            return results
+
+        groups = list(unique.values())
+        solutions = self.solver.solve_batch(states[[indices[0] for indices in groups]])
+        for indices, moves in zip(groups, solutions):
+            for index in indices:
+                results[index].update(moves=list(moves), cached=False)
+        return results
+
+    async def _handle_connection(self, reader: asyncio.StreamReader,
+                                 writer: asyncio.StreamWriter):
+        """Serve one client; pipelined requests are answered as they finish"""
+        write_lock = asyncio.Lock()
+        tasks = set()
+
+        async def answer(line: bytes):
+            try:
+                response = await self.handle_request(json.loads(line))
+            except (ValueError, AttributeError):
+                response = {'id': None, 'ok': False, 'error': "invalid JSON request"}
+            async with write_lock:
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.strip():
+                    task = asyncio.ensure_future(answer(line))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve_unix(self, path: str):
+        """Serve forever on a Unix domain socket"""
+        await self.start()
+        server = await asyncio.start_unix_server(self._handle_connection, path=path)
+        print(f"Solver service listening on {path}")
+        async with server:
+            await server.serve_forever()
+
+    async def serve_tcp(self, host: str, port: int):
+        """Serve forever on a TCP port"""
+        await self.start()
+        server = await asyncio.start_server(self._handle_connection, host, port)
+        print(f"Solver service listening on {host}:{port}")
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    """Command-line entry point"""
+    parser = argparse.ArgumentParser(description="Local Rubik's Cube solver service")
+    parser.add_argument('--unix', metavar='PATH', help="Unix socket path")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--max-batch', type=int, default=64)
+    parser.add_argument('--max-in-flight', type=int, default=256)
+    parser.add_argument('--cache-size', type=int, default=10000)
+    parser.add_argument('--seconds', type=float, default=DEFAULT_SECONDS,
+                        help="search time per state; longer finds shorter solutions")
+    parser.add_argument('--tables', metavar='PATH',
+                        help=".npz file to load the solver tables from (written if missing)")
+    args = parser.parse_args()
+
+    async def serve():
+        service = SolverService(TwoPhaseSolver(args.seconds, tables=args.tables),
+                                max_batch=args.max_batch,
+                                max_in_flight=args.max_in_flight,
+                                cache_size=args.cache_size)
+        if args.unix:
+            await service.serve_unix(args.unix)
+        else:
+            await service.serve_tcp(args.host, args.port)
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        print("\nSolver service stopped")
+
+
+if __name__ == "__main__":
+    main()
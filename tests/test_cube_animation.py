@@ -0,0 +1,88 @@
+"""
+Tests for the turn animation queue (no rendering involved).
+"""
+
+import pytest
+
+from cube_animation import TurnAnimator
+
+
+def run_until_idle(animator, dt=1 / 60, limit=10000):
+    committed = []
+    for _ in range(limit):
+        if not animator.busy:
+            break
+        committed.extend(animator.update(dt))
+    return committed
+
+
+def test_single_turn_animates_then_commits():
+    animator = TurnAnimator(turn_duration=0.1)
+    animator.enqueue("R")
+    assert animator.update(0.05) == []
+    face, angle = animator.current_turn()
+    assert face == "R" and 0 < angle < 90
+    assert animator.update(0.06) == [("R", 1)]
+    assert animator.current_turn() is None and not animator.busy
+
+
+def test_same_face_turns_merge():
+    animator = TurnAnimator()
+    animator.enqueue("U")
+    animator.enqueue("R")
+    animator.enqueue("R")
+    animator.enqueue("R")
+    assert animator.backlog == 2  # U, then R merged to R'
+    assert run_until_idle(animator) == [("U", 1), ("R", 3)]
+
+
+def test_opposite_turns_cancel():
+    animator = TurnAnimator()
+    animator.enqueue("F")
+    animator.enqueue("U")
+    animator.enqueue("U", -1)
+    assert run_until_idle(animator) == [("F", 1)]
+
+
+def test_turn_in_flight_is_extended():
+    animator = TurnAnimator(turn_duration=0.1)
+    animator.enqueue("L")
+    animator.update(0.05)
+    before = animator.current_angle()
+    animator.enqueue("L")
+    assert animator.current_angle() == pytest.approx(before)
+    assert run_until_idle(animator) == [("L", 2)]
+
+
+def test_backlog_speeds_up_and_skips():
+    animator = TurnAnimator(turn_duration=0.2, max_backlog=4, max_instant_per_frame=100)
+    faces = "RULDFB" * 10
+    for face in faces:
+        animator.enqueue(face)
+    first = animator.update(1 / 60)
+    assert len(first) >= len(faces) - 5  # excess committed without animating
+    committed = first + run_until_idle(animator)
+    assert committed == [(face, 1) for face in faces]
+
+
+def test_instant_commits_are_capped_per_frame():
+    animator = TurnAnimator(max_backlog=0, max_instant_per_frame=3)
+    for face in "RURURURU":
+        animator.enqueue(face)
+    assert len(animator.update(0)) == 3
+
+
+def test_flush_and_clear():
+    animator = TurnAnimator()
+    for face in "RRU":
+        animator.enqueue(face)
+    animator.update(0.01)
+    assert animator.flush() == [("R", 2), ("U", 1)]
+    animator.enqueue("D")
+    animator.clear()
+    assert not animator.busy and animator.flush() == []
+
+
+def test_invalid_face_raises():
+    with pytest.raises(ValueError):
+        TurnAnimator().enqueue("X")
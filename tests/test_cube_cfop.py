@@ -0,0 +1,88 @@
+"""
+Tests for the table-driven CFOP solver.
+"""
+
+import numpy as np
+import pytest
+
+from cube_cfop import SLOTS, solve_batch, solve_cfop
+from cube_last_layer import PLL_ALGORITHMS, expand_algorithm
+from cube_model import RubiksCubeModel
+from cube_state import (
+    MOVE_PERMUTATIONS,
+    SOLVED_STATE,
+    apply_moves,
+    decode_cubies,
+    invert_moves,
+    simplify_moves,
+)
+
+
+def scrambles(count, seed, length=25):
+    rng = np.random.default_rng(seed)
+    states = np.tile(SOLVED_STATE, (count, 1))
+    for move in rng.integers(len(MOVE_PERMUTATIONS), size=(length, count)):
+        states = np.take_along_axis(states, MOVE_PERMUTATIONS[move], axis=1)
+    return states
+
+
+def solved_pieces(state):
+    """Solved cross edges (4,) and solved F2L slots (4,)"""
+    cp, co, ep, eo = (part[0] for part in decode_cubies(state))
+    cross = np.array([ep[edge] == edge and eo[edge] == 0 for edge in range(4, 8)])
+    slots = np.array([cp[corner] == corner and co[corner] == 0
+                      and ep[edge] == edge and eo[edge] == 0 for _, corner, edge in SLOTS])
+    return cross, slots
+
+
+def test_steps_solve_in_cfop_order():
+    states = scrambles(40, seed=3)
+    for state, solution in zip(states, solve_batch(states)):
+        labels = [label for label, _, _ in solution.steps]
+        assert labels[0] == 'Cross' and labels[-2].startswith('OLL')
+        assert labels[-1].startswith(('PLL', 'AUF'))
+
+        state = apply_moves(state, solution.steps[0][1])
+        cross, slots = solved_pieces(state)
+        assert cross.all()
+        for label, moves, notation in solution.steps[1:-2]:
+            assert notation == ' '.join(moves)
+            assert label.startswith('F2L')
+            state = apply_moves(state, moves)
+            cross, now = solved_pieces(state)
+            assert cross.all() and (now >= slots).all() and now.sum() == slots.sum() + 1
+            slots = now
+        assert slots.all()
+        assert np.array_equal(apply_moves(state, solution.steps[-2][1] + solution.steps[-1][1]),
+                              SOLVED_STATE)
+
+
+def test_solver_is_deterministic_and_reads_models():
+    model = RubiksCubeModel()
+    for face in "RUFLDBRU":
+        model.rotate_face(face)
+    first, second = solve_cfop(model), solve_cfop(model.get_facelets())
+    assert first.steps == second.steps
+    assert len(first) == len(first.moves)
+
+
+def test_solved_cube_skips_every_step():
+    assert solve_cfop(SOLVED_STATE).steps == [('Cross', [], ''), ('OLL skip', [], ''),
+                                              ('PLL skip', [], '')]
+
+
+def test_last_layer_steps_keep_the_learned_notation():
+    algorithm = PLL_ALGORITHMS['Z']
+    state = apply_moves(SOLVED_STATE, ['U'] + invert_moves(expand_algorithm(algorithm)) + ["U'"])
+    label, moves, notation = solve_cfop(state).steps[-1]
+    assert label == 'PLL Z' and algorithm in notation
+    assert simplify_moves(expand_algorithm(notation)) == moves
+    assert np.array_equal(apply_moves(state, moves), SOLVED_STATE)
+    assert notation in str(solve_cfop(state))
+
+
+def test_invalid_state_is_rejected():
+    state = SOLVED_STATE.copy()
+    state[[0, 9]] = state[[9, 0]]
+    with pytest.raises(ValueError):
+        solve_cfop(state)
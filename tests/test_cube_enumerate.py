@@ -0,0 +1,59 @@
+"""
+Tests for breadth-first distance enumeration, including the disk spill path.
+"""
+
+import numpy as np
+import pytest
+
+from cube_enumerate import enumerate_distances, parse_generators
+from cube_state import SOLVED_STATE, apply_moves, parse_moves
+
+# Known distance distributions from the literature
+HTM_COUNTS = [1, 18, 243, 3240, 43239]
+QTM_COUNTS = [1, 12, 114, 1068, 10011]
+
+
+def test_parse_generators():
+    assert parse_generators("<R,U>") == ["R", "R'", "R2", "U", "U'", "U2"]
+    assert parse_generators("U,F2", metric="qtm") == ["U", "U'", "F2"]
+    assert len(parse_generators()) == 18
+    with pytest.raises(ValueError):
+        parse_generators("X")
+
+
+def test_full_group_htm_counts():
+    assert enumerate_distances(4).counts == HTM_COUNTS
+
+
+def test_full_group_qtm_counts():
+    result = enumerate_distances(4, parse_generators(metric="qtm"))
+    assert result.counts == QTM_COUNTS
+
+
+def test_spilling_to_disk_gives_the_same_counts(tmp_path):
+    result = enumerate_distances(4, max_states_in_memory=1000, work_dir=str(tmp_path))
+    assert result.counts == HTM_COUNTS
+    assert list(tmp_path.iterdir()) == []  # spill files are cleaned up
+
+
+def test_small_subgroup_is_exhausted():
+    result = enumerate_distances(20, parse_generators("R2,U2"))
+    assert result.complete is True
+    assert result.total == 12  # <R2,U2> is dihedral of order 12
+
+
+def test_distance_table_lookup():
+    result = enumerate_distances(3, keep_table=True, max_states_in_memory=500)
+    table = result.table
+    try:
+        states = np.stack([
+            SOLVED_STATE,
+            apply_moves(SOLVED_STATE, parse_moves("R")),
+            apply_moves(SOLVED_STATE, parse_moves("R L")),  # commuting: still 2
+            apply_moves(SOLVED_STATE, parse_moves("R U F'")),
+            apply_moves(SOLVED_STATE, parse_moves("R U F' D")),
+        ])
+        assert table.lookup(states).tolist() == [0, 1, 2, 3, -1]
+        assert len(table) == sum(HTM_COUNTS[:4])
+    finally:
+        table.close()
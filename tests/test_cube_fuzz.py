@@ -0,0 +1,78 @@
+"""
+Tests for the differential fuzzing harness (compact engine vs 3D model).
+"""
+
+import numpy as np
+import pytest
+
+import cube_fuzz
+from cube_fuzz import (
+    first_mismatch,
+    fuzz,
+    reduce_failure,
+    reference_mismatches,
+    reference_permutation,
+    states_solved,
+    turn_states,
+)
+from cube_model import RubiksCubeModel
+from cube_state import MOVE_INDEX, MOVE_PERMUTATIONS, SOLVED_STATE
+
+
+def test_engines_agree_within_a_time_budget():
+    report = fuzz(sequences=10_000, length=20, seed=1, seconds=1.0)
+    assert report.passed, report.failure
+    assert report.sequences > 0
+    assert report.turns == report.sequences * 20
+    assert report.speedup > 1
+
+
+def _broken_turn(states, moves):
+    """Compact engine that plays U2 as U"""
+    moves = np.where(moves == MOVE_INDEX['U2'], MOVE_INDEX['U'], moves)
+    return turn_states(states, moves)
+
+
+def test_mismatch_is_reduced_to_the_culprit():
+    report = fuzz(sequences=256, length=30, seed=3, fast_turn=_broken_turn)
+    assert not report.passed
+    assert report.failure == ['U2']
+    assert first_mismatch(['R', 'U2'], _broken_turn) == 2
+    assert first_mismatch(['R', 'U2']) is None
+    with pytest.raises(ValueError):
+        reduce_failure(['R', 'U'], _broken_turn)
+
+
+def test_hand_written_turns_match_both_engines():
+    assert reference_mismatches() == []
+    for move in cube_fuzz.REFERENCE_CYCLES:
+        assert np.array_equal(reference_permutation(move), MOVE_PERMUTATIONS[MOVE_INDEX[move]])
+
+
+def _mirrored_turn(states, moves):
+    """Compact engine that plays U as U'"""
+    moves = np.where(moves == MOVE_INDEX['U'], MOVE_INDEX["U'"], moves)
+    return turn_states(states, moves)
+
+
+class _MirroredModel(RubiksCubeModel):
+    """Model that turns R counterclockwise"""
+
+    def rotate_face(self, face_name):
+        for _ in range(3 if face_name == 'R' else 1):
+            super().rotate_face(face_name)
+
+
+def test_engines_are_checked_against_the_hand_written_turns(monkeypatch):
+    report = fuzz(sequences=256, length=30, fast_turn=_mirrored_turn)
+    assert not report.passed and report.reference_failures == ['compact U']
+    assert report.sequences == 0
+
+    # Tables derived from this model would share the bug; the reference does not
+    monkeypatch.setattr(cube_fuzz, 'RubiksCubeModel', _MirroredModel)
+    assert reference_mismatches(fast_turn=turn_states) == ['model R']
+
+
+def test_states_solved():
+    states = np.stack([SOLVED_STATE, turn_states(SOLVED_STATE[None], np.array([0]))[0]])
+    assert states_solved(states).tolist() == [True, False]
@@ -0,0 +1,235 @@
+"""
+Tests for the shared cubie mesh (no OpenGL involved).
+"""
+
+import numpy as np
+import pytest
+
+from cube_geometry import (
+    BASE_SHADE,
+    CORE_COLORS,
+    HIDDEN_INDEX,
+    LOD_FLAT_PX,
+    LOD_PLAIN_PX,
+    PLASTIC_INDEX,
+    PLASTIC_SHADE,
+    STICKER_RAISE,
+    PieceGeometry,
+    VERTS_PER_FACE,
+    camera_ray,
+    core_boxes,
+    core_matrices,
+    cubie_colors,
+    cubie_indices,
+    cubie_mesh,
+    cubie_vertex_info,
+    hex_to_rgb,
+    instance_groups,
+    instance_indices,
+    lod_tier,
+    palette_indices,
+    pick_facelet,
+    piece_matrix,
+    projected_size,
+    rotation_matrix,
+    visible_faces,
+)
+from cube_model import (
+    COLORS, CUBE_GAP, CUBE_SIZE, FACE_AXES, FACE_COLORS, FACE_NAMES, RubiksCubeModel,
+)
+from cube_state import FACELET_KEYS
+
+
+def test_mesh_shapes_and_normals():
+    positions, normals = cubie_mesh()
+    assert positions.shape == normals.shape == (6 * VERTS_PER_FACE, 3)
+    assert positions.dtype == np.float32
+    np.testing.assert_allclose(np.linalg.norm(normals, axis=1), 1.0)
+    # Stickers sit just outside the plastic body
+    assert np.abs(positions).max() == np.float32(CUBE_SIZE / 2 + STICKER_RAISE)
+
+
+def test_corner_piece_indices():
+    corner = next(piece for piece in RubiksCubeModel().pieces
+                  if sum(c != COLORS['BLACK'] for c in piece.colors) == 3)
+    quads, sticker_lines, plastic_lines = cubie_indices(corner.colors)
+    assert len(quads) == 4 * (6 + 3)  # every base quad plus three stickers
+    assert len(sticker_lines) == 3 * 8
+    assert len(plastic_lines) == 3 * 8
+    assert quads.max() < 6 * VERTS_PER_FACE
+
+
+def test_colors_follow_stickers():
+    colors = [COLORS['RED']] + [COLORS['BLACK']] * 5
+    rgb = cubie_colors(colors)
+    np.testing.assert_allclose(rgb[0], BASE_SHADE)
+    np.testing.assert_allclose(rgb[4], hex_to_rgb(COLORS['RED']))
+    np.testing.assert_allclose(rgb[VERTS_PER_FACE], PLASTIC_SHADE)
+
+
+def test_piece_matrix_matches_model_vertices():
+    model = RubiksCubeModel()
+    model.rotate_face('R')
+    positions, _ = cubie_mesh()
+    for piece in model.pieces:
+        matrix = piece_matrix(piece)
+        corners = piece.get_vertices()
+        world = positions[:4] @ matrix[:3, :3].T + matrix[:3, 3]
+        np.testing.assert_allclose(world, corners[[1, 5, 6, 2]], atol=1e-6)
+
+
+def test_piece_geometry_is_world_space():
+    model = RubiksCubeModel()
+    model.rotate_face('U')
+    piece = model.get_face_pieces('U')[0]
+    geometry = PieceGeometry(piece, (True, False, True, True, True, True))
+    assert geometry.positions.dtype == np.float32 and geometry.positions.flags.c_contiguous
+    np.testing.assert_allclose(geometry.positions[:4], piece.get_vertices()[[1, 5, 6, 2]],
+                               atol=1e-6)
+    np.testing.assert_allclose(geometry.gl_matrix, piece_matrix(piece).T, atol=1e-6)
+    np.testing.assert_allclose(np.linalg.norm(geometry.normals, axis=1), 1.0, atol=1e-6)
+    assert geometry.palette[1] == HIDDEN_INDEX
+    assert 1 not in geometry.quads // VERTS_PER_FACE
+
+
+def test_instance_indices_hold_one_face_each():
+    info = cubie_vertex_info()
+    groups = instance_indices()
+    assert len(groups) == 12
+    for (face, sticker), (triangles, lines) in groups.items():
+        assert set(info[triangles, 0]) == set(info[lines, 0]) == {face}
+        assert set(info[triangles, 1]) == ({0, 1} if sticker else {0})
+        assert set(info[lines, 1]) == ({2} if sticker else {3})
+        assert len(lines) == 8
+
+
+def test_instance_groups_leave_out_hidden_faces():
+    palettes = np.array([[0, HIDDEN_INDEX, PLASTIC_INDEX, 3, HIDDEN_INDEX, 5],
+                         [HIDDEN_INDEX] * 6,
+                         [2, PLASTIC_INDEX, HIDDEN_INDEX, 3, 4, HIDDEN_INDEX]])
+    groups = {group: rows.tolist() for group, rows in instance_groups(palettes)}
+    assert groups == {(0, True): [0, 2], (1, False): [2], (2, False): [0],
+                      (3, True): [0, 2], (4, True): [2], (5, True): [0]}
+    assert instance_groups(np.full((4, 6), HIDDEN_INDEX)) == []
+
+
+def test_lod_tier_from_projected_size():
+    # The default camera on an 800 px window shows full detail, the
+    # farthest zoom drops outlines, and the edit-mode corner view goes flat
+    assert lod_tier(projected_size(CUBE_SIZE, 8.0, 800)) == 'full'
+    assert lod_tier(projected_size(CUBE_SIZE, 15.0, 800)) == 'plain'
+    assert lod_tier(projected_size(CUBE_SIZE, 15.0, 320)) == 'flat'
+    assert lod_tier(LOD_PLAIN_PX) == 'full'
+    assert lod_tier(LOD_FLAT_PX) == 'plain'
+    assert projected_size(2.0, 8.0, 800) == 2 * projected_size(1.0, 8.0, 800)
+
+
+def test_lod_indices_drop_detail():
+    corner = next(piece for piece in RubiksCubeModel().pieces
+                  if sum(c != COLORS['BLACK'] for c in piece.colors) == 3)
+    full = cubie_indices(corner.colors)
+    quads, sticker_lines, plastic_lines = cubie_indices(corner.colors, tier='plain')
+    np.testing.assert_array_equal(quads, full[0])
+    assert len(sticker_lines) == len(plastic_lines) == 0
+    quads, sticker_lines, plastic_lines = cubie_indices(corner.colors, tier='flat')
+    assert len(quads) == 4 * 3  # one quad per sticker
+    assert set(cubie_vertex_info()[quads, 1]) == {1}
+    assert len(sticker_lines) == len(plastic_lines) == 0
+
+    for (face, sticker), (triangles, lines) in instance_indices('flat').items():
+        assert len(triangles) == (6 if sticker else 0) and len(lines) == 0
+        assert set(cubie_vertex_info()[triangles, 1]) <= {1}
+    with pytest.raises(ValueError):
+        instance_indices('wireframe')
+
+
+def test_palette_indices():
+    colors = FACE_COLORS[:3] + [COLORS['BLACK'], '#123456', FACE_COLORS[5]]
+    assert palette_indices(colors) == [0, 1, 2, PLASTIC_INDEX, PLASTIC_INDEX, 5]
+
+
+def test_turn_rotation_matches_model():
+    # The renderer turns a layer by rotation_matrix(axis, -angle); a full
+    # quarter turn must land every piece where rotate_face puts it.
+    model = RubiksCubeModel()
+    before = {piece.id: piece_matrix(piece) for piece in model.get_face_pieces('U')}
+    spin = rotation_matrix(FACE_AXES['U'], -90)
+    model.rotate_face('U')
+    for piece in model.pieces:
+        if piece.id in before:
+            np.testing.assert_allclose(spin @ before[piece.id], piece_matrix(piece), atol=1e-9)
+
+
+def test_visible_faces_are_the_stickers():
+    model = RubiksCubeModel()
+    model.rotate_face('R')
+    model.rotate_face('U')
+    visible = visible_faces(model.pieces)
+    assert visible.sum() == 54
+    for piece, row in zip(model.pieces, visible):
+        assert list(row) == [color != COLORS['BLACK'] for color in piece.colors]
+
+
+def test_turn_exposes_both_sides_of_the_cut():
+    model = RubiksCubeModel()
+    visible = visible_faces(model.pieces, FACE_AXES['R'])
+    assert visible.sum() == 54 + 9 + 9
+
+
+def test_core_boxes_split_for_a_turn():
+    extent = CUBE_SIZE + CUBE_GAP
+    (corners, turning), = core_boxes()
+    assert not turning
+    np.testing.assert_allclose(np.abs(corners), extent)
+
+    (static, _), (layer, turning) = core_boxes(FACE_AXES['L'])
+    assert turning
+    assert static[:, 0].min() == 0.0 and static[:, 0].max() == extent
+    assert layer[:, 0].min() == -extent and layer[:, 0].max() == -extent / 2
+
+
+def test_core_is_the_cubie_mesh_scaled_onto_each_box():
+    base = cubie_indices(CORE_COLORS, tier='plain')[0]
+    positions = cubie_mesh()[0][base]
+    for axis in (None, FACE_AXES['U'], FACE_AXES['B']):
+        for (corners, turning), (matrix, matrix_turning) in zip(core_boxes(axis),
+                                                                core_matrices(axis)):
+            assert turning == matrix_turning
+            box = positions @ matrix[:3, :3].T + matrix[:3, 3]
+            np.testing.assert_allclose(box.min(axis=0), corners.min(axis=0), atol=1e-6)
+            np.testing.assert_allclose(box.max(axis=0), corners.max(axis=0), atol=1e-6)
+    assert palette_indices(CORE_COLORS) == [PLASTIC_INDEX] * 6
+
+
+def project(point, viewport, window_height, rotation_x, rotation_y, distance):
+    """Screen position of a cube-frame point, as gluLookAt/gluPerspective map it"""
+    rotation = (rotation_matrix((1, 0, 0), rotation_x) @ rotation_matrix((0, 1, 0), rotation_y))
+    eye = rotation[:3, :3] @ point - np.array([0.0, 0.0, distance])
+    vx, vy, vw, vh = viewport
+    f = 1 / np.tan(np.radians(45) / 2)
+    ndc = np.array([f * vh / vw * eye[0], f * eye[1]]) / -eye[2]
+    return vx + (ndc[0] + 1) / 2 * vw, window_height - (vy + (ndc[1] + 1) / 2 * vh)
+
+
+def test_picking_finds_every_facing_sticker():
+    pitch = CUBE_SIZE + CUBE_GAP
+    for viewport, rx, ry, distance in (((0, 0, 1200, 800), 20.0, 45.0, 8.0),
+                                       ((862, 52, 320, 320), 200.0, 310.0, 5.0)):
+        rotation = (rotation_matrix((1, 0, 0), rx) @ rotation_matrix((0, 1, 0), ry))[:3, :3]
+        eye = rotation.T @ np.array([0.0, 0.0, distance])
+        picked = 0
+        for index, key in enumerate(FACELET_KEYS):
+            normal = key % 2 * np.sign(key)
+            center = (key - normal) / 2 * pitch + normal * CUBE_SIZE / 2
+            if (eye - center) @ normal < 0.2:
+                continue  # facing away, or too edge-on to click reliably
+            pos = project(center, viewport, 800, rx, ry, distance)
+            hit = pick_facelet(*camera_ray(pos, viewport, 800, rx, ry, distance))
+            assert hit == (FACE_NAMES[index // 9], index % 9 // 3, index % 3)
+            picked += 1
+        assert picked >= 27
+
+
+def test_picking_misses_beside_the_cube():
+    origin, direction = camera_ray((5, 5), (0, 0, 1200, 800), 800, 20.0, 45.0, 8.0)
+    assert pick_facelet(origin, direction) is None
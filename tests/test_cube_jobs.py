@@ -0,0 +1,134 @@
+"""
+Tests for the background job runner, mostly in thread mode (no spawn cost).
+"""
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from cube_jobs import JobRunner, scramble_job, solve_job
+from cube_model import RubiksCubeModel
+from cube_state import SOLVED_STATE, apply_moves, state_from_model
+
+
+def wait_for(runner, timeout=30.0):
+    """Poll like the render loop until a job finishes"""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        finished = runner.poll()
+        if finished:
+            return finished
+        time.sleep(0.005)
+    raise AssertionError("job did not finish")
+
+
+def gated_job(model, context, gate):
+    context.report(0.5, "waiting", partial=['R'])
+    while True:
+        gate.wait(0.01)
+        context.report()
+        if gate.is_set():
+            return model.move_count
+
+
+def failing_job(model, context):
+    raise ValueError("no luck")
+
+
+def turned_model(faces):
+    model = RubiksCubeModel()
+    for face in faces:
+        model.rotate_face(face)
+    return model
+
+
+@pytest.fixture
+def runner():
+    runner = JobRunner(processes=False)
+    yield runner
+    runner.shutdown()
+
+
+def test_solve_job_solves_its_snapshot(runner):
+    model = turned_model("RUFRDL")
+    state = state_from_model(model)
+    job = runner.submit('Solving', solve_job, model)
+    model.reset()  # the job must not see later changes
+
+    assert wait_for(runner) == [job]
+    assert job.status == 'done' and job.progress == 1.0
+    assert job.model_version != model.version
+    assert np.array_equal(apply_moves(state, job.result), SOLVED_STATE)
+    assert len(job.result) <= 6
+
+
+def test_solve_job_without_history_searches(runner):
+    model = turned_model("RUF")
+    model.move_history = []
+    job = runner.submit('Solving', solve_job, model)
+    wait_for(runner)
+    assert job.result == ["F'", "U'", "R'"]
+
+
+def test_solve_job_falls_back_to_the_optimal_search(runner):
+    model = RubiksCubeModel()
+    model.apply_turns([('R', 1), ('U', 1), ('F', 1)])
+    model.move_history = []
+    job = runner.submit('Solving', solve_job, model, None, 1e-9)
+    wait_for(runner)
+    assert job.status == 'done' and job.result == ["F'", "U'", "R'"]
+
+    job = runner.submit('Solving', solve_job, model, 2, 1e-9)
+    wait_for(runner)
+    assert job.status == 'failed' and 'no solution' in job.error
+
+
+def test_progress_and_partial_results_reach_poll(runner):
+    gate = threading.Event()
+    job = runner.submit('Waiting', gated_job, RubiksCubeModel(), gate)
+    deadline = time.monotonic() + 5
+    while job.message != "waiting" and time.monotonic() < deadline:
+        assert runner.poll() == []
+        time.sleep(0.005)
+    assert (job.progress, job.partial, runner.active) == (0.5, ['R'], job)
+
+    gate.set()
+    wait_for(runner)
+    assert (job.status, job.result, runner.active) == ('done', 0, None)
+
+
+def test_cancel_and_supersede(runner):
+    gate = threading.Event()
+    first = runner.submit('First', gated_job, RubiksCubeModel(), gate)
+    second = runner.submit('Second', gated_job, turned_model("R"), gate)
+    assert first.status == 'running'  # known only after the next poll
+    runner.cancel()
+
+    finished = []
+    while len(finished) < 2:
+        finished += wait_for(runner)
+    assert {job.status for job in (first, second)} == {'cancelled'}
+
+
+def test_failures_are_reported(runner):
+    job = runner.submit('Broken', failing_job, RubiksCubeModel())
+    wait_for(runner)
+    assert (job.status, job.error) == ('failed', "no luck")
+
+
+def test_scramble_job_in_a_worker_process():
+    runner = JobRunner()
+    try:
+        # Nothing is started before the first job
+        runner.cancel()
+        assert runner.poll() == [] and runner._executor is None
+        job = runner.submit('Scrambling', scramble_job, RubiksCubeModel(), 5000, 20, 1)
+        wait_for(runner, timeout=60)
+        assert job.status == 'done' and job.result.shape == (5000, 54)
+        assert not np.array_equal(job.result[0], SOLVED_STATE)
+        assert np.all(np.sort(job.result, axis=1) == np.sort(SOLVED_STATE))
+    finally:
+        runner.shutdown()
+
@@ -0,0 +1,82 @@
+"""
+Tests for last-layer (OLL/PLL) case recognition.
+"""
+
+import numpy as np
+import pytest
+
+from cube_last_layer import (
+    OLL_ALGORITHMS,
+    PLL_ALGORITHMS,
+    U_FACELETS,
+    expand_algorithm,
+    f2l_solved,
+    last_layer_index,
+    recognize,
+)
+from cube_model import RubiksCubeModel
+from cube_state import SOLVED_STATE, apply_moves, invert_moves, parse_moves
+
+AUF = ['', 'U', 'U2', "U'"]
+
+
+def case_state(algorithm, pre=0, post=0):
+    """State the algorithm solves once turned by AUF[pre] first, AUF[post] after"""
+    moves = [AUF[-post]] if post else []
+    moves += invert_moves(expand_algorithm(algorithm))
+    moves += [AUF[-pre]] if pre else []
+    return apply_moves(SOLVED_STATE, moves)
+
+
+def test_expand_algorithm_folds_rotations_into_face_turns():
+    assert expand_algorithm("y R y'") == ['B']
+    assert expand_algorithm("x U x'") == ['F']
+    assert expand_algorithm("Rw U") == expand_algorithm("r U") == ['L', 'F']
+    assert expand_algorithm("(R U R' U')") == parse_moves("R U R' U'")
+    assert expand_algorithm("M2") == ['R2', 'L2']
+    with pytest.raises(ValueError):
+        expand_algorithm("R Q")
+
+
+def test_index_covers_every_last_layer():
+    index = last_layer_index()
+    assert len(OLL_ALGORITHMS) == 57 and len(PLL_ALGORITHMS) == 21
+    # 3^4 / 3 twists x 2^4 / 2 flips, and 4! x 4! / 2 permutations, less solved
+    assert len(index.oll) == 27 * 8 - 1
+    assert len(index.pll) == 24 * 24 // 2 - 1
+    assert {number for number, _ in index.oll.values()} == set(OLL_ALGORITHMS)
+
+
+def test_every_oll_case_is_recognized_and_oriented():
+    rng = np.random.default_rng(0)
+    for number, algorithm in OLL_ALGORITHMS.items():
+        state = case_state(algorithm, int(rng.integers(4)), int(rng.integers(4)))
+        case = recognize(state)
+        assert (case.step, case.name) == ('OLL', str(number))
+        after = apply_moves(state, case.moves)
+        assert f2l_solved(after) and np.array_equal(after[U_FACELETS], SOLVED_STATE[U_FACELETS])
+
+
+def test_every_pll_case_is_recognized_and_solved():
+    rng = np.random.default_rng(1)
+    for name, algorithm in PLL_ALGORITHMS.items():
+        state = case_state(algorithm, int(rng.integers(4)), int(rng.integers(4)))
+        case = recognize(state)
+        assert (case.step, case.name) == ('PLL', name)
+        assert np.array_equal(apply_moves(state, case.moves), SOLVED_STATE)
+
+    case = recognize(apply_moves(SOLVED_STATE, ['U2']))
+    assert (case.step, case.post, case.moves) == ('AUF', 'U2', ['U2'])
+
+
+def test_recognize_needs_solved_first_two_layers():
+    model = RubiksCubeModel()
+    assert recognize(model) is None
+    model.rotate_face('R')
+    assert recognize(model) is None
+
+    model = RubiksCubeModel()
+    for move in invert_moves(expand_algorithm(PLL_ALGORITHMS['T'])):
+        model.apply_turns([(move[0], {'': 1, '2': 2, "'": 3}[move[1:]])])
+    assert recognize(model).name == 'T'
+    assert recognize(model.get_facelets()).name == 'T'
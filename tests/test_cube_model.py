@@ -6,6 +6,9 @@ travel with their piece. A position-derived color scheme makes the cube
 appear solved after every turn; these tests fail loudly if that returns.
 """
 
+import pickle
+import random
+
 import numpy as np
 import pytest
 
@@ -13,8 +16,14 @@ from cube_model import (
     COLORS,
     FACE_COLORS,
     FACE_NAMES,
+    FACE_TURNS,
+    ROTATION_PRODUCTS,
+    ROTATIONS,
     FaceletState,
+    GridPosition,
     RubiksCubeModel,
+    Vector3,
+    rotation_index,
 )
 
 # Local outward normals for each face index in CubePiece.colors:
@@ -225,3 +234,149 @@ def test_facelet_editor_is_independent_of_model():
     # Neither the source dict nor the model are mutated by editing.
     assert facelets["U"][1][1] == COLORS["WHITE"]
     assert model.get_facelets()["U"][1][1] == COLORS["WHITE"]
+
+
+def test_versions_change_only_on_edits():
+    model = RubiksCubeModel()
+    start = model.version
+    model.rotate_face("R")
+    assert model.version == start + 1
+    model.reset()
+    assert model.version == start + 2
+
+    editor = FaceletState(model.get_facelets())
+    assert editor.paint("F", 0, 0, COLORS["BLUE"]) is False  # rejected
+    assert editor.paint("F", 0, 0, COLORS["RED"]) is True    # no-op
+    assert editor.version == 0
+    editor.clear()
+    editor.paint("U", 1, 1, COLORS["RED"])
+    assert editor.version == 2
+
+
+def test_piece_vertices_cached_until_the_piece_moves():
+    model = RubiksCubeModel()
+    right = set(piece.id for piece in model.get_face_pieces("R"))
+    before = {piece.id: piece.get_vertices() for piece in model.pieces}
+    assert all(piece.get_vertices() is before[piece.id] for piece in model.pieces)
+
+    model.rotate_face("R")
+    for piece in model.pieces:
+        moved = piece.id in right
+        assert piece.version == int(moved)
+        assert (piece.get_vertices() is before[piece.id]) is not moved
+
+
+def test_writes_through_piece_views_refresh_the_vertices():
+    model = RubiksCubeModel()
+    piece = model.pieces[0]
+    writes = [("grid_position", GridPosition(1, 1, 1)), ("orientation", 5),
+              ("rotation_matrix", ROTATIONS[9])]
+    for name, value in writes + [("position", Vector3(0.0, 0.0, -1.0))]:
+        before, version = piece.get_vertices(), piece.version
+        setattr(piece, name, value)
+        assert piece.version == version + 1
+        assert not np.array_equal(piece.get_vertices(), before)
+
+    # Colors do not move vertices, but geometry cached on the version
+    # (renderer buffers) carries them
+    version = piece.version
+    piece.colors = list(reversed(piece.colors))
+    assert piece.version == version + 1
+
+
+def test_in_place_writes_reach_the_piece_or_fail():
+    model = RubiksCubeModel()
+    piece = model.pieces[0]
+    version = piece.version
+    piece.colors[1] = COLORS['RED']
+    assert piece.colors[1] == COLORS['RED'] and piece.version == version + 1
+    assert model.pieces[0].colors == [COLORS['BLACK'], COLORS['RED']] + list(piece.colors[2:])
+    with pytest.raises(ValueError):
+        piece.colors[0] = 'X'
+    assert piece.colors[0] == COLORS['BLACK']
+
+    # The grid position read from a piece is a copy, so writing to it raises
+    grid = piece.grid_position
+    with pytest.raises(AttributeError):
+        grid.x = 2
+    model.rotate_face('L')
+    assert (grid.x, grid.y, grid.z) == (0, 0, 0)
+    moved = grid.copy()
+    moved.x = 2
+    piece.grid_position = moved
+    assert piece.grid_position.x == 2
+
+
+def test_piece_position_snaps_to_grid_cells():
+    piece = RubiksCubeModel().pieces[0]
+    piece.position = Vector3(1.0, 0.0, -1.0)
+    grid = piece.grid_position
+    assert (grid.x, grid.y, grid.z) == (2, 1, 0)
+    assert np.array_equal(piece.position.to_array(), [1.0, 0.0, -1.0])
+    for position in (Vector3(0.5, 0.0, 0.0), Vector3(2.0, 0.0, 0.0)):
+        with pytest.raises(ValueError):
+            piece.position = position
+    assert piece.position.to_array().tolist() == [1.0, 0.0, -1.0]
+
+
+def test_apply_turns_matches_quarter_turns_in_one_update():
+    turns = [("R", 1), ("U", 2), ("F", 3), ("L", 0)]
+    single, batch = RubiksCubeModel(), RubiksCubeModel()
+    for face, quarters in turns:
+        for _ in range(quarters):
+            single.rotate_face(face)
+    start = batch.version
+    batch.apply_turns(turns)
+    assert batch.version == start + 1
+    assert batch.move_history == single.move_history == ["R", "U", "U", "F", "F", "F"]
+    assert batch.get_facelets() == single.get_facelets()
+
+    with pytest.raises(ValueError):
+        batch.apply_turns([("R", 1), ("X", 1)])
+    assert batch.move_count == 6  # nothing applied from a bad batch
+
+
+def test_pieces_are_views_of_the_piece_arrays():
+    model = RubiksCubeModel()
+    model.rotate_face("R")
+    for row, piece in enumerate(model.pieces):
+        grid = piece.grid_position
+        assert (grid.x, grid.y, grid.z) == tuple(model.arrays.grid[row])
+        assert np.array_equal(piece.position.to_array(), model.arrays.positions[row])
+        assert np.array_equal(piece.rotation_matrix, model.arrays.rotations[row])
+    assert all(isinstance(color, str) for color in model.pieces[0].colors)
+
+
+def test_snapshot_is_independent_of_the_model():
+    model = RubiksCubeModel()
+    model.rotate_face("U")
+    for snapshot in (model.copy(), pickle.loads(pickle.dumps(model))):
+        model_facelets = model.get_facelets()
+        snapshot.rotate_face("F")
+        assert model.get_facelets() == model_facelets
+        assert snapshot.move_history == ["U", "F"]
+        assert [p.id for p in snapshot.pieces] == [p.id for p in model.pieces]
+        assert not np.shares_memory(snapshot.arrays.orientations, model.arrays.orientations)
+
+
+def test_rotation_group_tables_are_exact():
+    assert len(ROTATIONS) == 24 and len({m.tobytes() for m in ROTATIONS}) == 24
+    for a in range(24):
+        for b in range(24):
+            assert np.array_equal(ROTATIONS[ROTATION_PRODUCTS[a, b]], ROTATIONS[a] @ ROTATIONS[b])
+    for face in FACE_NAMES:
+        assert FACE_TURNS[face][0] == 0
+        assert ROTATION_PRODUCTS[FACE_TURNS[face][1], FACE_TURNS[face][3]] == 0
+    with pytest.raises(ValueError):
+        rotation_index(np.eye(3) * 0.999)
+
+
+def test_long_sessions_do_not_drift():
+    model = RubiksCubeModel()
+    random.seed(3)
+    model.scramble(20000)
+    model.apply_turns([(face, 3) for face in reversed(model.move_history)])
+    fresh = RubiksCubeModel()
+    assert model.is_solved()
+    assert np.array_equal(model.arrays.grid, fresh.arrays.grid)
+    assert np.array_equal(model.arrays.orientations, fresh.arrays.orientations)
@@ -0,0 +1,98 @@
+"""
+Tests for the frame pacer, on a simulated clock.
+"""
+
+import pytest
+
+from cube_pacing import MAX_SPIN, FramePacer
+
+
+class FakeClock:
+    """Simulated time: sleeps overshoot by ``oversleep``, reads cost ``read_cost``"""
+
+    def __init__(self, oversleep=0.0, read_cost=1e-5):
+        self.now = 0.0
+        self.oversleep = oversleep
+        self.read_cost = read_cost
+        self.slept = 0.0
+        self.reads = 0
+
+    def clock(self):
+        self.reads += 1
+        self.now += self.read_cost
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept += seconds
+        self.now += seconds + self.oversleep
+
+    def work(self, seconds):
+        self.now += seconds
+
+
+def test_fixed_mode_holds_the_rate_mostly_asleep():
+    fake = FakeClock(oversleep=0.0008)
+    pacer = FramePacer('fixed', 144, clock=fake.clock, sleep=fake.sleep)
+    pacer.tick()
+    for _ in range(200):
+        fake.work(0.002)
+        pacer.tick()
+    stats = pacer.stats()
+    assert stats['missed'] == 0
+    assert stats['p50_ms'] == pytest.approx(1000 / 144, abs=0.05)
+    assert stats['p99_ms'] == pytest.approx(1000 / 144, abs=0.05)
+    assert stats['fps'] == pytest.approx(144, rel=0.01)
+    # Most of the wait is spent asleep: spinning (clock reads) is a small tail
+    waiting = 200 * (1 / 144 - 0.002)
+    assert fake.reads * fake.read_cost < 0.15 * waiting
+    assert pacer._spin <= MAX_SPIN
+
+
+def test_slow_frames_are_missed_without_a_catch_up_burst():
+    fake = FakeClock()
+    pacer = FramePacer('fixed', 100, clock=fake.clock, sleep=fake.sleep)
+    pacer.tick()
+    fake.work(0.035)  # one long frame
+    pacer.tick()
+    for _ in range(5):
+        fake.work(0.001)
+        pacer.tick()
+    times = pacer.frame_times()
+    assert pacer.missed == 1
+    assert times[0] == pytest.approx(0.035, abs=1e-3)
+    assert all(t == pytest.approx(0.01, abs=1e-4) for t in times[1:])
+
+
+def test_uncapped_and_vsync_only_measure():
+    for mode in ('uncapped', 'vsync'):
+        fake = FakeClock()
+        pacer = FramePacer(mode, 60, clock=fake.clock, sleep=fake.sleep)
+        pacer.tick()
+        for work in (0.004, 0.004, 0.03, 0.004):
+            fake.work(work)
+            pacer.tick()
+        assert fake.slept == 0.0
+        assert pacer.missed == (1 if mode == 'vsync' else 0)  # 30 ms > 1.5 refreshes
+        assert pacer.stats()['max_ms'] == pytest.approx(30, abs=0.1)
+
+
+def test_restart_skips_the_idle_gap_and_history_wraps():
+    fake = FakeClock()
+    pacer = FramePacer('uncapped', history=4, clock=fake.clock, sleep=fake.sleep)
+    pacer.tick()
+    for work in (0.001, 0.002, 0.003, 0.004, 0.005):
+        fake.work(work)
+        pacer.tick()
+    fake.work(5.0)  # idle
+    pacer.restart()
+    fake.work(0.006)
+    pacer.tick()
+    assert pacer.frames == 6
+    assert pacer.frame_times() == pytest.approx([0.003, 0.004, 0.005, 0.006], abs=1e-4)
+
+
+def test_invalid_settings():
+    with pytest.raises(ValueError):
+        FramePacer('adaptive')
+    with pytest.raises(ValueError):
+        FramePacer('fixed', 0)
@@ -0,0 +1,94 @@
+"""
+Tests for the NumPy software rasterizer.
+"""
+
+import struct
+import zlib
+
+import numpy as np
+
+from cube_model import RubiksCubeModel
+from cube_raster import (
+    PALETTE_RGB,
+    SoftwareRenderer,
+    as_states,
+    encode_png,
+    random_states,
+    rasterize,
+)
+from cube_state import BLANK, FACELET_KEYS, SOLVED_STATE, facelets_from_state, state_from_model
+
+
+def square(x, y, size, depth):
+    return np.array([[x, y, depth], [x + size, y, depth],
+                     [x + size, y + size, depth], [x, y + size, depth]], dtype=float)
+
+
+def test_rasterize_keeps_the_nearest_quad():
+    ids = rasterize([square(0, 0, 8, 1.0), square(4, 4, 8, 2.0), square(2, 2, 4, 0.0)], 16, 16)
+    assert ids[1, 1] == 0
+    assert ids[5, 5] == 1   # nearer quad drawn later wins
+    assert ids[3, 3] == 0   # farther quad drawn later loses
+    assert ids[15, 15] == -1
+    assert (ids == 1).sum() == 64
+
+
+def test_every_input_renders_alike():
+    model = RubiksCubeModel()
+    for face in "RUFDLB":
+        model.rotate_face(face)
+    state = state_from_model(model)
+    renderer = SoftwareRenderer(size=48, supersample=2)
+    expected = renderer.render(state)
+    for cube in (model, model.pieces, facelets_from_state(state), [state]):
+        assert np.array_equal(renderer.render(cube), expected)
+    assert as_states([model, model]).shape == (2, 54)
+
+
+def test_iso_view_shows_up_front_right():
+    # Blank everything but the U facelet at the U-F-R corner: it sits
+    # just above the image center, where that corner is drawn
+    facelet = next(i for i, key in enumerate(FACELET_KEYS) if tuple(key) == (2, 3, 2))
+    state = np.full(54, BLANK, dtype=np.uint8)
+    state[facelet] = 0
+    image = SoftwareRenderer(size=96).render(state)[0].astype(int)
+    red = (image[..., 0] > 120) & (image[..., 1] < 60)
+    ys, xs = np.nonzero(red)
+    assert len(ys) > 20
+    assert abs(xs.mean() - 48) < 4 and 30 < ys.mean() < 48
+
+
+def test_net_cells_match_facelets():
+    state = random_states(1, seed=3)[0]
+    renderer = SoftwareRenderer('net', size=160, supersample=1)
+    image = renderer.render(state)[0]
+    assert image.shape == (120, 160, 3)
+    # The center of every F sticker has its exact palette color
+    cell = 160 / (4 * 3 + 3 * 0.15 + 1)
+    left = (160 - (12 + 0.45) * cell) / 2 + 3.15 * cell
+    top = (120 - (9 + 0.3) * cell) / 2 + 3.15 * cell
+    for row in range(3):
+        for col in range(3):
+            pixel = image[int(top + (row + 0.5) * cell), int(left + (col + 0.5) * cell)]
+            expected = np.rint(PALETTE_RGB[state[row * 3 + col]] * 255)
+            assert np.array_equal(pixel, expected)
+
+
+def test_batches_match_single_renders():
+    states = random_states(70, seed=1)
+    renderer = SoftwareRenderer(size=32, supersample=2)
+    batch = renderer.render(states)
+    assert batch.shape == (70, 32, 32, 3)
+    assert np.array_equal(batch[69], renderer.render(states[69])[0])
+    assert not np.array_equal(batch[0], renderer.render(SOLVED_STATE)[0])
+
+
+def test_png_encoding():
+    image = np.random.default_rng(0).integers(0, 256, (5, 7, 3), dtype=np.uint8)
+    data = encode_png(image)
+    assert data[:8] == b'\x89PNG\r\n\x1a\n'
+    width, height = struct.unpack('>II', data[16:24])
+    assert (width, height) == (7, 5)
+    length = struct.unpack('>I', data[33:37])[0]
+    rows = np.frombuffer(zlib.decompress(data[41:41 + length]), dtype=np.uint8)
+    assert np.array_equal(rows.reshape(5, 22)[:, 1:].reshape(5, 7, 3), image)
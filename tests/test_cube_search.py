@@ -0,0 +1,63 @@
+"""
+Tests for the bidirectional optimal search.
+"""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from cube_state import MOVE_NAMES, SOLVED_STATE, apply_moves, parse_moves
+from cube_search import solve_optimal
+
+
+def solves(state, moves):
+    return np.array_equal(apply_moves(state, moves), SOLVED_STATE)
+
+
+def test_solved_state_needs_no_moves():
+    assert solve_optimal(SOLVED_STATE) == []
+
+
+def test_short_scrambles_are_solved_optimally():
+    # Every 2-move state is at distance 1 or 2; brute force gives the truth
+    for scramble in [("R",), ("U2",), ("F", "B"), ("R", "U'"), ("D2", "L")]:
+        state = apply_moves(SOLVED_STATE, scramble)
+        moves = solve_optimal(state)
+        assert solves(state, moves)
+        shortest = next(length for length in range(3)
+                        for candidate in itertools.product(MOVE_NAMES, repeat=length)
+                        if solves(state, candidate))
+        assert len(moves) == shortest
+
+
+def test_deeper_scramble_meets_in_the_middle():
+    state = apply_moves(SOLVED_STATE, parse_moves("R U F' L2 D B'"))
+    moves = solve_optimal(state)
+    assert solves(state, moves) and len(moves) == 6
+
+
+def test_gives_up_beyond_max_depth():
+    state = apply_moves(SOLVED_STATE, parse_moves("R U F' L2"))
+    assert solve_optimal(state, max_depth=3) is None
+
+
+def test_progress_can_abort_the_search():
+    state = apply_moves(SOLVED_STATE, parse_moves("R U F' L2 D B'"))
+    reports = []
+
+    def progress(fraction, message):
+        reports.append(fraction)
+        if fraction > 0.3:
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        solve_optimal(state, progress=progress)
+    assert reports == sorted(reports)
+
+
+def test_rejects_unsolvable_states():
+    state = SOLVED_STATE.copy()
+    state[0] = state[9]  # ten stickers of one color
+    with pytest.raises(ValueError):
+        solve_optimal(state)
@@ -0,0 +1,73 @@
+"""
+Tests for startup profiling and the persistent font cache.
+"""
+
+import json
+
+import pytest
+
+import cube_startup
+from cube_startup import FontCache, StartupProfile
+
+
+@pytest.fixture
+def lookups(monkeypatch):
+    """Record system font lookups instead of scanning"""
+    calls = []
+
+    def system_font(name, bold, italic):
+        calls.append((name, bold, italic))
+        return (None, bold, italic)
+
+    monkeypatch.setattr(cube_startup, '_system_font', system_font)
+    return calls
+
+
+def test_profile_phases_add_up_and_stop_at_finish(tmp_path):
+    profile = StartupProfile()
+    profile.mark('imports')
+    profile.mark('window')
+    profile.finish()
+    profile.mark('later')
+    assert [phase for phase, _ in profile.phases()] == ['imports', 'window', 'first frame']
+    assert sum(ms for _, ms in profile.phases()) == pytest.approx(profile.total_ms)
+    assert profile.report().splitlines()[-1].split()[0] == 'total'
+
+    log = tmp_path / 'startup.jsonl'
+    profile.append_log(str(log))
+    profile.append_log(str(log))
+    entries = [json.loads(line) for line in log.read_text().splitlines()]
+    assert len(entries) == 2 and list(entries[0]['phases']) == ['imports', 'window', 'first frame']
+
+
+def test_font_lookups_persist_between_runs(tmp_path, lookups):
+    path = str(tmp_path / 'cache' / 'fonts.json')
+    assert FontCache(path).resolve('Arial', bold=True) == (None, True, False)
+    assert FontCache(path).resolve('arial', bold=True) == (None, True, False)
+    assert FontCache(path).resolve('Arial') == (None, False, False)
+    assert lookups == [('Arial', True, False), ('Arial', False, False)]
+
+
+def test_missing_font_files_and_bad_caches_are_looked_up_again(tmp_path, lookups):
+    path = tmp_path / 'fonts.json'
+    gone = str(tmp_path / 'gone.ttf')
+    path.write_text(json.dumps({'version': cube_startup.FONT_CACHE_VERSION,
+                                'fonts': {'arial|0|0': [gone, False, False]}}))
+    cache = FontCache(str(path))
+    assert cache.resolve('Arial') == (None, False, False) and cache.scans == 1
+
+    path.write_text('{not json')
+    cache = FontCache(str(path))
+    assert cache.lookups == {}
+    cache.resolve('Arial')
+    assert json.loads(path.read_text())['fonts'] == {'arial|0|0': [None, False, False]}
+
+
+def test_fonts_are_opened_once(tmp_path):
+    pygame = pytest.importorskip('pygame')
+    pygame.font.init()
+    cache = FontCache(str(tmp_path / 'fonts.json'))
+    font = cache.font('Arial', 14)
+    assert cache.font('Arial', 14) is font and font.get_height() > 0
+    # Bold is synthesized exactly when no bold face was found
+    assert cache.font('Arial', 16, bold=True).get_bold() == cache.lookups['arial|1|0'][1]
@@ -0,0 +1,149 @@
+"""
+Tests for the compact facelet state.
+
+The turn tables are derived from the 3D model, so the key guarantee is
+that both engines agree on every facelet after any sequence of turns.
+"""
+
+import random
+
+import numpy as np
+
+from cube_model import COLORS, FACE_NAMES, RubiksCubeModel
+from cube_state import (
+    BLANK,
+    CORNER_FACELETS,
+    EDGE_FACELETS,
+    SOLVED_STATE,
+    apply_move,
+    apply_moves,
+    decode_cubies,
+    facelets_from_state,
+    invert_moves,
+    pack_states,
+    parse_moves,
+    relabel_by_centers,
+    simplify_moves,
+    state_from_facelets,
+    state_from_model,
+    state_from_pieces,
+    state_key,
+    unpack_states,
+    validate_states,
+)
+
+
+def scrambled_state(seed, moves=25):
+    rng = random.Random(seed)
+    return apply_moves(SOLVED_STATE, [rng.choice(FACE_NAMES) for _ in range(moves)])
+
+
+def test_solved_model_encodes_to_solved_state():
+    assert np.array_equal(state_from_model(RubiksCubeModel()), SOLVED_STATE)
+
+
+def test_turns_match_the_model():
+    rng = random.Random(7)
+    model = RubiksCubeModel()
+    state = SOLVED_STATE.copy()
+    for _ in range(60):
+        face = rng.choice(FACE_NAMES)
+        model.rotate_face(face)
+        state = apply_move(state, face)
+        assert np.array_equal(state_from_model(model), state)
+
+
+def test_pieces_encode_like_the_facelets():
+    model = RubiksCubeModel()
+    model.scramble(30)
+    assert np.array_equal(state_from_pieces(model.pieces), state_from_model(model))
+
+
+def test_prime_and_double_moves():
+    for face in FACE_NAMES:
+        once = apply_move(SOLVED_STATE, face)
+        assert np.array_equal(apply_move(once, face + "'"), SOLVED_STATE)
+        assert np.array_equal(apply_move(once, face), apply_move(SOLVED_STATE, face + "2"))
+
+
+def test_sequence_and_its_inverse_cancel():
+    moves = parse_moves("R U R' U' F2 D L' B")
+    state = apply_moves(SOLVED_STATE, moves)
+    assert np.array_equal(apply_moves(state, invert_moves(moves)), SOLVED_STATE)
+
+
+def test_simplify_merges_same_face_runs():
+    assert simplify_moves(parse_moves("R R U U' F F F L2 L2 D")) == ["R2", "F'", "D"]
+    moves = parse_moves("R R R U R' R' F")
+    state = apply_moves(SOLVED_STATE, moves)
+    assert np.array_equal(apply_moves(SOLVED_STATE, simplify_moves(moves)), state)
+
+
+def test_batch_turns_match_single_turns():
+    batch = np.stack([scrambled_state(seed) for seed in range(5)])
+    turned = apply_moves(batch, ["R", "U2"])
+    for row, state in zip(turned, batch):
+        assert np.array_equal(row, apply_moves(state, ["R", "U2"]))
+
+
+def test_facelet_round_trip():
+    state = scrambled_state(3)
+    assert np.array_equal(state_from_facelets(facelets_from_state(state)), state)
+
+
+def test_unknown_colors_become_blank():
+    facelets = facelets_from_state(SOLVED_STATE)
+    facelets["F"][0][0] = COLORS["BLACK"]
+    assert state_from_facelets(facelets)[0] == BLANK
+
+
+def test_pack_round_trip_and_sort_order():
+    states = np.stack([scrambled_state(seed) for seed in range(50)])
+    packed = pack_states(states)
+    assert np.array_equal(unpack_states(packed), states)
+    order = np.argsort(packed)
+    as_tuples = [tuple(row) for row in states[order]]
+    assert as_tuples == sorted(as_tuples)
+
+
+def test_relabel_by_centers_undoes_a_color_swap():
+    state = scrambled_state(11)
+    swapped = state.copy()
+    swapped[state == 0], swapped[state == 4] = 4, 0
+    assert np.array_equal(relabel_by_centers(swapped), state)
+    assert state_key(swapped) == state_key(state)
+
+
+def test_decode_solved_cubies():
+    corner_perm, corner_twist, edge_perm, edge_flip = decode_cubies(SOLVED_STATE)
+    assert corner_perm.tolist() == [list(range(8))]
+    assert edge_perm.tolist() == [list(range(12))]
+    assert not corner_twist.any() and not edge_flip.any()
+
+
+def test_scrambles_validate():
+    batch = np.stack([scrambled_state(seed) for seed in range(20)])
+    assert validate_states(batch) == [None] * 20
+
+
+def test_validate_rejects_unsolvable_states():
+    state = scrambled_state(5)
+    twisted = state.copy()
+    corner = CORNER_FACELETS[0]
+    twisted[corner] = state[np.roll(corner, 1)]
+    flipped = state.copy()
+    edge = EDGE_FACELETS[0]
+    flipped[edge] = state[edge[::-1]]
+    swapped = state.copy()
+    a, b = EDGE_FACELETS[0], EDGE_FACELETS[1]
+    swapped[a], swapped[b] = state[b], state[a]
+    miscounted = state.copy()
+    miscounted[0] = BLANK
+
+    errors = validate_states(np.stack([twisted, flipped, swapped, miscounted]))
+    assert errors == [
+        "a corner is twisted",
+        "an edge is flipped",
+        "two pieces are swapped (parity)",
+        "each color must appear exactly 9 times",
+    ]
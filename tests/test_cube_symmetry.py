@@ -0,0 +1,75 @@
+"""
+Tests for symmetry canonicalization of compact states.
+"""
+
+import random
+
+import numpy as np
+
+from cube_state import MOVE_NAMES, SOLVED_STATE, apply_moves, invert_moves
+from cube_symmetry import (
+    IS_MIRROR,
+    SYMMETRY_COUNT,
+    SYMMETRY_INVERSE,
+    canonical_key,
+    canonicalize,
+    conjugate,
+    symmetry_count,
+    transform_moves,
+)
+
+
+def random_moves(seed, length=15):
+    rng = random.Random(seed)
+    return [rng.choice(MOVE_NAMES) for _ in range(length)]
+
+
+def test_group_shape():
+    assert SYMMETRY_COUNT == 48
+    assert IS_MIRROR.sum() == 24 and not IS_MIRROR[0]
+    for symmetry in range(SYMMETRY_COUNT):
+        inverse = SYMMETRY_INVERSE[symmetry]
+        state = apply_moves(SOLVED_STATE, random_moves(symmetry))
+        assert np.array_equal(conjugate(conjugate(state, symmetry), inverse), state)
+
+
+def test_conjugation_commutes_with_moves():
+    for symmetry in range(SYMMETRY_COUNT):
+        moves = random_moves(symmetry)
+        state = apply_moves(SOLVED_STATE, moves)
+        mapped = apply_moves(SOLVED_STATE, transform_moves(moves, symmetry))
+        assert np.array_equal(conjugate(state, symmetry), mapped)
+
+
+def test_all_symmetric_copies_share_a_canonical_form():
+    moves = random_moves(1)
+    state = apply_moves(SOLVED_STATE, moves)
+    canonical, _ = canonicalize(state)
+    for symmetry in range(SYMMETRY_COUNT):
+        copy = apply_moves(SOLVED_STATE, transform_moves(moves, symmetry))
+        assert np.array_equal(canonicalize(copy)[0], canonical)
+
+
+def test_batch_matches_single_and_symmetry_maps_back():
+    states = np.stack([apply_moves(SOLVED_STATE, random_moves(seed)) for seed in range(8)])
+    canonical, symmetries = canonicalize(states)
+    for seed, (state, form, symmetry) in enumerate(zip(states, canonical, symmetries)):
+        assert np.array_equal(conjugate(state, symmetry), form)
+        solution = invert_moves(transform_moves(random_moves(seed), symmetry))
+        assert np.array_equal(apply_moves(form, solution), SOLVED_STATE)
+        back = transform_moves(solution, SYMMETRY_INVERSE[symmetry])
+        assert np.array_equal(apply_moves(state, back), SOLVED_STATE)
+
+
+def test_color_option_ignores_color_scheme():
+    state = apply_moves(SOLVED_STATE, random_moves(2))
+    recolored = (state + 1) % 6
+    assert canonical_key(recolored) == canonical_key(state)
+    assert canonical_key(recolored, colors=False) != canonical_key(state, colors=False)
+
+
+def test_symmetry_count_of_special_states():
+    assert symmetry_count(SOLVED_STATE) == 48
+    checkerboard = apply_moves(SOLVED_STATE, ["R2", "L2", "U2", "D2", "F2", "B2"])
+    assert symmetry_count(checkerboard) == 48
+    assert symmetry_count(apply_moves(SOLVED_STATE, ["R"])) < 48
@@ -0,0 +1,89 @@
+"""
+Tests for the anytime two-phase solver.
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from cube_model import FaceletState, RubiksCubeModel
+from cube_search import solve_optimal
+from cube_state import MOVE_NAMES, SOLVED_STATE, apply_moves, facelets_from_state
+from cube_twophase import TwoPhaseSearch, TwoPhaseSolver, load_tables, solve
+
+
+def scramble(seed, length=25):
+    rng = np.random.default_rng(seed)
+    return apply_moves(SOLVED_STATE, [MOVE_NAMES[i] for i in rng.integers(18, size=length)])
+
+
+def solves(state, moves):
+    return np.array_equal(apply_moves(state, moves), SOLVED_STATE)
+
+
+def test_pruning_tables_cover_every_coordinate():
+    tables = load_tables()
+    for name in ('twist_prune', 'flip_prune', 'corner_prune', 'edge_prune'):
+        table = getattr(tables, name)
+        assert table.min() == 0 and np.count_nonzero(table == 0) == 1
+    assert tables.twist_prune.max() == 9 and tables.corner_prune.max() == 14
+
+
+def test_solutions_get_strictly_shorter():
+    state = scramble(1)
+    search = TwoPhaseSearch(state, seconds=1.0)
+    lengths = []
+    for moves in search:
+        assert solves(state, moves)
+        assert search.best == moves and search.nodes > 0
+        lengths.append(len(moves))
+    assert lengths and lengths == sorted(set(lengths), reverse=True)
+    assert lengths[0] <= 30
+    assert search.exhausted != search.optimal
+
+
+def test_short_scramble_is_proven_optimal():
+    state = apply_moves(SOLVED_STATE, "R U2 F' L D B2 R'".split())
+    search = TwoPhaseSearch(state)
+    best = list(search)[-1]
+    assert search.optimal and not search.exhausted
+    assert len(best) == len(solve_optimal(state, 7)) == 7
+
+
+def test_budgets_and_bounds():
+    state = scramble(2)
+    search = TwoPhaseSearch(state, nodes=2000)
+    list(search)
+    assert search.exhausted and search.nodes < 3000
+
+    known = solve(state, seconds=0.2)
+    shorter = list(TwoPhaseSearch(state, seconds=0.2, max_length=len(known)))
+    assert all(len(moves) < len(known) for moves in shorter)
+
+    assert list(TwoPhaseSearch(SOLVED_STATE)) == [[]]
+    with pytest.raises(ValueError):
+        TwoPhaseSearch(np.zeros(54, dtype=np.uint8))
+
+
+def test_cube_objects_and_async_iteration():
+    model = RubiksCubeModel()
+    for face in "RUF":
+        model.rotate_face(face)
+    assert list(TwoPhaseSearch(model))[-1] == ["F'", "U'", "R'"]
+
+    editor = FaceletState(facelets_from_state(scramble(3, 6)))
+
+    async def collect():
+        return [moves async for moves in TwoPhaseSearch(editor, seconds=1.0)]
+
+    found = asyncio.run(collect())
+    assert found and solves(scramble(3, 6), found[-1])
+
+
+def test_solver_backend():
+    solver = TwoPhaseSolver(seconds=0.05)
+    solver.warm()
+    states = np.stack([scramble(4), scramble(5)])
+    for state, moves in zip(states, solver.solve_batch(states)):
+        assert solves(state, moves)
@@ -0,0 +1,80 @@
+"""
+Tests for the multi-cube wall: layout, culling and batched tile geometry.
+"""
+
+import numpy as np
+
+from cube_geometry import HIDDEN_INDEX, PLASTIC_INDEX, rotation_matrix
+from cube_raster import random_states
+from cube_state import SOLVED_STATE
+from cube_wall import (
+    INSTANCES_PER_CUBE,
+    PALETTE_RGB,
+    PIECE_FACELETS,
+    WallLayout,
+    detail_instances,
+    flat_quads,
+    face_shades,
+)
+
+VIEW = rotation_matrix((1, 0, 0), 20.0) @ rotation_matrix((0, 1, 0), 45.0)
+
+
+def test_layout_fits_everything_when_tiles_are_large_enough():
+    layout = WallLayout(6, 0, 0, 900, 600)
+    assert (layout.columns, layout.rows, layout.tile) == (3, 2, 300)
+    assert layout.max_scroll == 0
+    assert list(layout.visible(0)) == list(range(6))
+
+
+def test_layout_scrolls_and_culls_rows_out_of_view():
+    layout = WallLayout(500, 10, 20, 800, 400, min_tile=80)
+    assert (layout.columns, layout.tile) == (10, 80)
+    assert layout.max_scroll == 50 * 80 - 400
+    assert list(layout.visible(0)) == list(range(50))
+    # Half a row scrolled: rows 1-6 are (partly) visible
+    shown = layout.visible(120)
+    assert (shown[0], shown[-1]) == (10, 69)
+    centers = layout.centers(shown, 120)
+    assert np.allclose(centers[0], (10 + 40, 20 + 80 + 40 - 120))
+    assert layout.clamp_scroll(1e9) == layout.max_scroll
+
+
+def test_every_facelet_is_drawn_once_in_detail():
+    assert sorted(PIECE_FACELETS[PIECE_FACELETS >= 0]) == list(range(54))
+    states = random_states(3, seed=7)
+    centers = np.array([[100.0, 100.0], [300.0, 100.0], [500.0, 100.0]])
+    data = detail_instances(states, centers, 20.0, VIEW)
+    assert data.shape == (3 * INSTANCES_PER_CUBE, 22) and data.dtype == np.float32
+
+    per_cube = data.reshape(3, INSTANCES_PER_CUBE, 22)
+    for state, instances, center in zip(states, per_cube, centers):
+        palettes = instances[:-1, 16:]
+        drawn = palettes[palettes != HIDDEN_INDEX]
+        assert np.array_equal(np.sort(drawn), np.sort(state))
+        assert np.all(instances[-1, 16:] == PLASTIC_INDEX)  # the core
+        # Column-major matrices: translation in elements 12-14
+        assert np.allclose(instances[:, 12:14].mean(axis=0), center, atol=1e-3)
+
+
+def test_flat_quads_show_three_faces_with_state_colors():
+    states = np.stack([SOLVED_STATE, random_states(1, seed=3)[0]])
+    centers = np.array([[50.0, 50.0], [150.0, 50.0]])
+    positions, colors = flat_quads(states, centers, 10.0, VIEW)
+    # From this corner view three faces show: 3 body + 27 sticker quads each
+    assert positions.shape == (2 * 30 * 4, 2) and colors.shape == (2 * 30 * 4, 3)
+    stickers = colors[2 * 3 * 4:].reshape(2, 27, 4, 3)
+    assert np.all(stickers == stickers[:, :, :1])  # flat: one color per quad
+    assert len(np.unique(stickers[0, :9, 0], axis=0)) == 1  # a solved face
+    # Every quad stays inside its own tile
+    bodies = positions[:2 * 3 * 4].reshape(2, 12, 2)
+    quads = positions[2 * 3 * 4:].reshape(2, 27 * 4, 2)
+    for tile, center in enumerate(centers):
+        corners = np.concatenate([bodies[tile], quads[tile]])
+        assert np.all(np.abs(corners - center) < 50)
+
+def test_faces_facing_the_light_are_brighter():
+    shades = face_shades(np.eye(4))
+    front, back = shades[0], shades[1]  # F faces the camera and LIGHT0
+    assert front > back and np.all(shades >= 0.55)
+    assert np.all(PALETTE_RGB <= 1.0)
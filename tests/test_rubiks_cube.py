@@ -0,0 +1,62 @@
+"""
+Tests for the controller's handling of background solves (no window).
+"""
+
+import time
+
+import pytest
+
+pytest.importorskip('pygame')
+pytest.importorskip('OpenGL')
+
+from cube_animation import TurnAnimator
+from cube_jobs import JobRunner
+from cube_model import RubiksCubeModel
+from rubiks_cube import RubiksCubeApp
+
+
+def undo_r(model, context):
+    return ["R'"]
+
+
+@pytest.fixture
+def app():
+    """Controller with its model, animator and jobs but no renderer"""
+    app = RubiksCubeApp.__new__(RubiksCubeApp)
+    app.model = RubiksCubeModel()
+    app.model.rotate_face('R')
+    app.animator = TurnAnimator()
+    app.jobs = JobRunner(processes=False)
+    yield app
+    app.jobs.shutdown()
+
+
+def finish(app, job, timeout=10.0):
+    """Poll like the render loop until the job is handled"""
+    deadline = time.monotonic() + timeout
+    while job.status == 'running':
+        assert time.monotonic() < deadline, "job did not finish"
+        app._poll_jobs()
+        time.sleep(0.005)
+
+
+def test_solution_is_played_on_an_unchanged_cube(app):
+    finish(app, app.jobs.submit('Solving', undo_r, app.model))
+    app._commit_turns(app.animator.flush())
+    assert app.model.is_solved()
+
+
+def test_solution_is_discarded_while_user_turns_are_pending(app):
+    job = app.jobs.submit('Solving', undo_r, app.model)
+    app.animator.enqueue('U')  # not yet committed to the model
+    finish(app, job)
+    assert app.animator.flush() == [('U', 1)]
+
+
+def no_moves(model, context):
+    return []
+
+
+def test_empty_solution_plays_nothing(app):
+    finish(app, app.jobs.submit('Solving', no_moves, app.model))
+    assert app.animator.flush() == []
@@ -0,0 +1,167 @@
+"""
+Tests for the batching solver service, driven without sockets.
+"""
+
+import asyncio
+import itertools
+import json
+
+import numpy as np
+
+from cube_model import COLORS
+from cube_state import MOVE_NAMES, SOLVED_STATE, apply_moves, facelets_from_state
+from solver_service import LRUCache, SolverService
+
+
+class RecordingSolver:
+    """Stand-in backend: brute-force search to depth 2, recording batches"""
+
+    def __init__(self):
+        self.batches = []
+        self.warmed = False
+
+    def warm(self):
+        self.warmed = True
+
+    def solve_batch(self, states):
+        self.batches.append(len(states))
+        return [self._solve(state) for state in states]
+
+    def _solve(self, state):
+        for length in range(3):
+            for moves in itertools.product(MOVE_NAMES, repeat=length):
+                if np.array_equal(apply_moves(state, moves), SOLVED_STATE):
+                    return list(moves)
+        raise ValueError("too deep for the test solver")
+
+
+def solves(state, moves):
+    return np.array_equal(apply_moves(state, moves), SOLVED_STATE)
+
+
+def request(op, state=SOLVED_STATE, request_id=1):
+    return {"id": request_id, "op": op, "facelets": facelets_from_state(state)}
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+def test_lru_cache_evicts_oldest():
+    cache = LRUCache(2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1 and cache.get("c") == 3
+
+
+def test_validate_reports_errors():
+    async def scenario():
+        service = SolverService()
+        good = await service.handle_request(request("validate"))
+        broken = facelets_from_state(SOLVED_STATE)
+        broken["U"][0][0] = COLORS["BLACK"]
+        bad = await service.handle_request({"id": 2, "op": "validate", "facelets": broken})
+        return good, bad
+
+    good, bad = run(scenario())
+    assert good == {"id": 1, "ok": True, "valid": True, "error": None}
+    assert bad["valid"] is False and "9 times" in bad["error"]
+
+
+def test_concurrent_requests_share_one_batch():
+    solver = RecordingSolver()
+    states = [apply_moves(SOLVED_STATE, moves)
+              for moves in (["R"], ["U", "F"], ["F"], ["R"])]
+
+    async def scenario():
+        service = SolverService(solver=solver, batch_window=0.05)
+        await service.start()
+        return await asyncio.gather(*(
+            service.handle_request(request("solve", state, i))
+            for i, state in enumerate(states)))
+
+    responses = run(scenario())
+    assert solver.warmed
+    # One batch; R, F and the repeated R are symmetric copies, solved once
+    assert solver.batches == [2]
+    assert [r["id"] for r in responses] == [0, 1, 2, 3]
+    for state, response in zip(states, responses):
+        assert solves(state, response["moves"])
+
+
+def test_repeated_solve_is_served_from_cache():
+    solver = RecordingSolver()
+    state = apply_moves(SOLVED_STATE, ["F", "U"])
+
+    async def scenario():
+        service = SolverService(solver=solver, batch_window=0)
+        first = await service.handle_request(request("solve", state))
+        second = await service.handle_request(request("solve", state))
+        return first, second, service.stats()
+
+    first, second, stats = run(scenario())
+    assert first["cached"] is False and second["cached"] is True
+    assert solver.batches == [1]
+    assert stats["cache_hits"] == 1
+
+
+def test_rotated_and_mirrored_copies_hit_the_cache():
+    solver = RecordingSolver()
+    original = apply_moves(SOLVED_STATE, ["R", "U'"])
+    copies = [apply_moves(SOLVED_STATE, moves)
+              for moves in (["F", "U'"], ["L'", "U"], ["D", "B'"])]
+
+    async def scenario():
+        service = SolverService(solver=solver, batch_window=0)
+        await service.handle_request(request("solve", original))
+        return [await service.handle_request(request("solve", state))
+                for state in copies]
+
+    responses = run(scenario())
+    assert solver.batches == [1]
+    for state, response in zip(copies, responses):
+        assert response["cached"] is True
+        assert solves(state, response["moves"])
+
+
+def test_solve_without_solver_is_an_error():
+    async def scenario():
+        service = SolverService(batch_window=0)
+        return await service.handle_request(request("solve"))
+
+    response = run(scenario())
+    assert response["ok"] is False and response["error"] == "no solver configured"
+
+
+def test_malformed_requests():
+    async def scenario():
+        service = SolverService()
+        unknown = await service.handle_request({"id": 1, "op": "dance"})
+        missing = await service.handle_request({"id": 2, "op": "solve"})
+        return unknown, missing
+
+    unknown, missing = run(scenario())
+    assert unknown["ok"] is False and missing["ok"] is False
+
+
+def test_unix_socket_round_trip(tmp_path):
+    path = str(tmp_path / "cube.sock")
+    state = apply_moves(SOLVED_STATE, ["R", "U"])
+
+    async def scenario():
+        service = SolverService(solver=RecordingSolver(), batch_window=0)
+        server = await asyncio.start_unix_server(service._handle_connection, path=path)
+        reader, writer = await asyncio.open_unix_connection(path)
+        writer.write(json.dumps(request("solve", state, 9)).encode() + b"\n")
+        await writer.drain()
+        response = json.loads(await reader.readline())
+        writer.close()
+        server.close()
+        await server.wait_closed()
+        return response
+
+    response = run(scenario())
+    assert response["id"] == 9 and solves(state, response["moves"])